@@ -0,0 +1,69 @@
+"""
+Benchmark: startup memory and time versus the size of the tournament history.
+
+Completed tournaments are only listed by their summary, so the startup peak memory
+stays flat while the history grows; opening every tournament shows the former cost.
+
+    python -m benchmarks.archive --history 10 100 500
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.corpus import write_clubs, write_tournaments
+from models import ClubManager, TournamentManager
+
+
+def folder_size(folder, pattern):
+    return sum(path.stat().st_size for path in Path(folder).glob(pattern))
+
+
+def measure(clubs_folder, tournaments_folder, open_all):
+    tracemalloc.start()
+    start = time.perf_counter()
+    cm = ClubManager(data_folder=clubs_folder)
+    tm = TournamentManager(club_manager=cm, data_folder=tournaments_folder)
+    if open_all:
+        for summary in tm.completed:
+            tm.open_tournament(summary)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lazy archive of completed tournaments.")
+    parser.add_argument(
+        "--history", type=int, nargs="+", default=[10, 100, 300], help="number of completed tournaments"
+    )
+    parser.add_argument("--players", type=int, default=64, help="players per tournament")
+    parser.add_argument("--rounds", type=int, default=7, help="rounds per tournament")
+    parser.add_argument("--members", type=int, default=5000, help="club members")
+    args = parser.parse_args()
+
+    print(f"{'history':>8} {'archive':>10} {'startup':>9} {'peak':>9} {'open all':>9} {'peak':>9}")
+    for history in args.history:
+        with tempfile.TemporaryDirectory() as tmp:
+            rng = random.Random(history)
+            clubs_folder = Path(tmp) / "clubs"
+            tournaments_folder = Path(tmp) / "tournaments"
+            players = write_clubs(clubs_folder, max(1, args.members // 100), 100, rng)
+            write_tournaments(
+                tournaments_folder, players, history + 2, args.players, args.rounds, rng, in_progress_count=2
+            )
+            archive = folder_size(tournaments_folder / "completed", "*.json.gz")
+
+            lazy_time, lazy_peak = measure(clubs_folder, tournaments_folder, open_all=False)
+            full_time, full_peak = measure(clubs_folder, tournaments_folder, open_all=True)
+            print(
+                f"{history:>8} {archive / 1024:>8.0f}kB {lazy_time:>8.3f}s {lazy_peak / 2**20:>7.1f}MB "
+                f"{full_time:>8.3f}s {full_peak / 2**20:>7.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
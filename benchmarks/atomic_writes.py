@@ -0,0 +1,66 @@
+"""
+Benchmark: write throughput of the JSON storage in each durability mode.
+
+- in place: the former open("w") + dump (not crash-safe, nothing is synced)
+- atomic: one temporary file, fsync, rename and directory fsync per file
+- group commit: the files of a batch are written, then fsynced, before any rename (one directory fsync)
+
+    python -m benchmarks.atomic_writes --files 50 200 --batch 20
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import make_players
+from storage import JsonStorage
+
+
+class InPlaceStorage(JsonStorage):
+    """The writes as they were before the atomic helper: truncate and dump in place"""
+
+    def _write_file(self, path, data):
+        with open(path, "wb") as fp:
+            fp.write(data)
+
+
+def time_writes(storage, clubs, batch_size):
+    """Writes the clubs, by batches of batch_size files (one at a time if batch_size is 0)"""
+    start = time.perf_counter()
+    if not batch_size:
+        for key, players in clubs:
+            storage.write_club(key, "Club", players)
+    for first in range(0, len(clubs) if batch_size else 0, batch_size or 1):
+        with storage.batch():
+            for key, players in clubs[first:first + batch_size]:
+                storage.write_club(key, "Club", players)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the atomic writes and the group commit.")
+    parser.add_argument("--files", type=int, nargs="+", default=[50, 200], help="number of club files written")
+    parser.add_argument("--members", type=int, default=100, help="members per club")
+    parser.add_argument("--batch", type=int, default=20, help="files per group commit")
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'mode':>13} {'time (s)':>9} {'files/s':>9}")
+    for count in args.files:
+        rng = random.Random(count)
+        players = make_players(args.members, rng)
+        for mode, storage_class, batch_size in (
+            ("in place", InPlaceStorage, 0),
+            ("atomic", JsonStorage, 0),
+            ("group commit", JsonStorage, args.batch),
+        ):
+            # In the current folder: /tmp is often a tmpfs, where fsync costs nothing
+            with tempfile.TemporaryDirectory(dir=".") as tmp:
+                storage = storage_class(clubs_folder=tmp)
+                clubs = [(Path(tmp) / f"club{idx:05d}.json", players) for idx in range(count)]
+                elapsed = time_writes(storage, clubs, batch_size)
+            print(f"{count:>6} {mode:>13} {elapsed:>9.3f} {count / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: startup time (ClubManager + TournamentManager) versus roster size.
+
+Compares the chess_id index against the former nested linear scan.
+
+    python -m benchmarks.club_index --sizes 1000 10000 50000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import write_clubs, write_tournaments
+from models import ClubManager, TournamentManager
+
+
+class LinearScanClubManager(ClubManager):
+    """The lookup as it was before the index: walk every club and every player"""
+
+    def get_player_by_chess_id(self, chess_id):
+        for club in self.clubs:
+            for player in club.players:
+                if player.chess_id == chess_id:
+                    return player
+        return None
+
+    def get_players_by_chess_ids(self, chess_ids):
+        return [self.get_player_by_chess_id(cid) for cid in chess_ids]
+
+
+def time_load(manager_class, clubs_folder, tournaments_folder):
+    start = time.perf_counter()
+    cm = manager_class(data_folder=clubs_folder)
+    TournamentManager(club_manager=cm, data_folder=tournaments_folder)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chess_id index against the linear scan.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000], help="total members")
+    parser.add_argument("--members", type=int, default=100, help="members per club")
+    parser.add_argument("--tournaments", type=int, default=20, help="number of tournaments")
+    parser.add_argument("--players", type=int, default=64, help="players per tournament")
+    args = parser.parse_args()
+
+    print(f"{'members':>10} {'clubs':>6} {'index (s)':>10} {'scan (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            rng = random.Random(size)
+            clubs_folder = Path(tmp) / "clubs"
+            tournaments_folder = Path(tmp) / "tournaments"
+            club_count = max(1, size // args.members)
+            players = write_clubs(clubs_folder, club_count, args.members, rng)
+            write_tournaments(tournaments_folder, players, args.tournaments, args.players, rng=rng)
+
+            indexed = time_load(ClubManager, clubs_folder, tournaments_folder)
+            scanned = time_load(LinearScanClubManager, clubs_folder, tournaments_folder)
+            print(f"{size:>10} {club_count:>6} {indexed:>10.3f} {scanned:>10.3f} {scanned / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
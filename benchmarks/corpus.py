@@ -0,0 +1,108 @@
+"""
+Synthetic data used by the benchmarks.
+
+The generated clubs follow the same JSON layout as data/make-club.py
+(name, email, chess_id, birthday) but only use the standard library,
+so the benchmarks can run without Faker.
+"""
+import json
+import random
+import string
+from datetime import date, timedelta
+from pathlib import Path
+
+from storage import JsonStorage, new_tournament_id
+
+FIRST_NAMES = (
+    "Alice", "Bob", "Carla", "David", "Emma", "Farid", "Grace", "Hugo", "Ines", "Jack",
+    "Kira", "Liam", "Maya", "Noah", "Olga", "Pablo", "Quinn", "Rosa", "Sam", "Tara",
+)
+LAST_NAMES = (
+    "Anderson", "Brown", "Carter", "Dubois", "Evans", "Fischer", "Garcia", "Hughes", "Ivanov", "Jones",
+    "Kowalski", "Lopez", "Martin", "Nguyen", "Olsen", "Petrov", "Quinn", "Rossi", "Smith", "Tanaka",
+)
+
+
+def chess_ids(count, rng):
+    """Returns count unique Chess IDs (two letters + 5 numbers)"""
+    ids = set()
+    while len(ids) < count:
+        letters = "".join(rng.choice(string.ascii_uppercase) for _ in range(2))
+        ids.add(letters + "%05d" % rng.randint(0, 99999))
+    return sorted(ids, key=lambda _: rng.random())
+
+
+def make_players(count, rng=None):
+    """Returns a list of player dicts, as found in a club JSON file"""
+    rng = rng or random.Random(0)
+    players = []
+    for chess_id in chess_ids(count, rng):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        birthdate = date(1940, 1, 1) + timedelta(days=rng.randint(0, 24000))
+        players.append({
+            "name": name,
+            "email": name.lower().replace(" ", ".") + "@example.com",
+            "chess_id": chess_id,
+            "birthday": birthdate.strftime("%d-%m-%Y"),
+        })
+    return players
+
+
+def write_clubs(folder, club_count, members, rng=None):
+    """Writes club_count club files of `members` players each, returns every player dict"""
+    rng = rng or random.Random(0)
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    players = make_players(club_count * members, rng)
+    for idx in range(club_count):
+        club_players = players[idx * members:(idx + 1) * members]
+        with open(folder / f"club{idx:05d}.json", "w") as fp:
+            json.dump({"name": f"Club {idx}", "players": club_players}, fp)
+    return players
+
+
+def make_tournament(name, chess_id_list, number_of_rounds, rounds_played, rng=None):
+    """Returns a tournament dict (as serialized by Tournaments) with random results for the rounds played"""
+    rng = rng or random.Random(0)
+    rounds = []
+    for _ in range(rounds_played):
+        ids = list(chess_id_list)
+        rng.shuffle(ids)
+        matches = []
+        for id1, id2 in zip(ids[::2], ids[1::2]):
+            winner = rng.choice((id1, id2, None))
+            matches.append({"players": [id1, id2], "completed": True, "winner": winner})
+        rounds.append({"matches": matches})
+    return {
+        "tournament_id": new_tournament_id(name),
+        "name": name,
+        "venue": "Benchmark Hall",
+        "dates": {"from": "01-01-2030", "to": "31-12-2030"},
+        "number_of_rounds": number_of_rounds,
+        "current_round": rounds_played,
+        "completed": rounds_played >= number_of_rounds,
+        "players": list(chess_id_list),
+        "rounds": rounds,
+    }
+
+
+def write_tournaments(folder, players, tournament_count, size, number_of_rounds=5, rng=None, in_progress_count=None):
+    """Writes tournaments drawn from the players to the tournaments folder.
+
+    in_progress_count tournaments are half-played, the others are completed (by default, one in two).
+    """
+    rng = rng or random.Random(0)
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    in_progress, completed = [], []
+    ids = [p["chess_id"] for p in players]
+    for idx in range(tournament_count):
+        entrants = rng.sample(ids, min(size, len(ids)) // 2 * 2)
+        if in_progress_count is None:
+            played = number_of_rounds if idx % 2 else number_of_rounds // 2
+        else:
+            played = number_of_rounds if idx >= in_progress_count else number_of_rounds // 2
+        tournament = make_tournament(f"Tournament {idx}", entrants, number_of_rounds, played, rng)
+        (completed if tournament["completed"] else in_progress).append(tournament)
+
+    JsonStorage(tournaments_folder=folder).write_tournaments(in_progress, completed)
@@ -0,0 +1,72 @@
+"""
+Benchmark: quality and speed of the pairing engines on simulated Swiss tournaments.
+
+For each field size, the same tournament (same random results, driven by hidden player strengths)
+is played with the greedy pairer and the blossom-based SwissPairer. The report compares the rematches,
+the score gaps between opponents (in half points), the colour conflicts and the time spent pairing.
+
+    python -m benchmarks.pairing --players 64 256 1000 --rounds 9
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import make_players
+from models import GreedyPairer, Player, SwissPairer
+from models.tournaments import Tournaments
+
+
+def simulate(pairer, player_dicts, rounds, seed):
+    """Plays a tournament and returns (rematches, score gap, colour conflicts, slowest round time)"""
+    rng = random.Random(seed)
+    players = [Player(**data) for data in player_dicts]
+    strength = {p.chess_id: rng.random() for p in players}
+    tournament = Tournaments(
+        "Benchmark", "Hall", {"from": "01-01-2030", "to": "31-12-2030"},
+        number_of_rounds=rounds, players=players, pairer=pairer,
+    )
+    met = set()
+    colours = {p.chess_id: [] for p in players}
+    rematches = gap = conflicts = 0
+    slowest = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        next_round = tournament.generate_next_round()
+        slowest = max(slowest, time.perf_counter() - start)
+        for match in next_round.matches:
+            if match.is_bye:
+                continue
+            white, black = match.player1, match.player2
+            pair = frozenset({white.chess_id, black.chess_id})
+            rematches += pair in met
+            met.add(pair)
+            gap += round(abs(tournament.standings.points(white) - tournament.standings.points(black)) * 2)
+            # Three times the same colour in a row
+            colours[white.chess_id].append(1)
+            colours[black.chess_id].append(-1)
+            for chess_id in (white.chess_id, black.chess_id):
+                conflicts += len(colours[chess_id]) >= 3 and abs(sum(colours[chess_id][-3:])) == 3
+
+            a, b = strength[white.chess_id], strength[black.chess_id]
+            draw = rng.random() < 0.2
+            match.set_result(2 if draw else (0 if rng.random() < a / (a + b) else 1))
+    return rematches, gap, conflicts, slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the greedy pairer against the SwissPairer.")
+    parser.add_argument("--players", type=int, nargs="+", default=[64, 256, 1000], help="field sizes")
+    parser.add_argument("--rounds", type=int, default=9, help="rounds per tournament")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'players':>8} {'pairer':>7} {'rematches':>10} {'score gap':>10} {'colours':>8} {'round (s)':>10}")
+    for count in args.players:
+        player_dicts = make_players(count, random.Random(count))
+        for label, pairer in (("greedy", GreedyPairer()), ("swiss", SwissPairer())):
+            rematches, gap, conflicts, slowest = simulate(pairer, player_dicts, args.rounds, args.seed)
+            print(f"{count:>8} {label:>7} {rematches:>10} {gap:>10} {conflicts:>8} {slowest:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
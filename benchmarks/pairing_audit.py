@@ -0,0 +1,178 @@
+"""
+Pairing audit: speed and quality of the pairing engines, as a machine-readable report.
+
+Full tournaments are played on synthetic fields (see benchmarks.corpus), with random results or
+results drawn from the players' ratings. For each field size and pairing engine, the report holds
+the latency of every round, the rematches, the score gaps between opponents (in half points), the
+colour conflicts (three times the same colour in a row), the byes and the peak memory.
+
+Given a previous report (--baseline), the runs are compared and any regression (worse quality, or
+slower by more than --tolerance) is listed; the exit status is then 1.
+
+    python -m benchmarks.pairing_audit --players 15 64 255 1000 --output pairing.json
+    python -m benchmarks.pairing_audit --players 15 64 255 1000 --baseline pairing.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.corpus import make_players
+from models import GreedyPairer, Player, Ratings, SwissPairer
+from models.simulation import play_result
+from models.tournaments import Tournaments
+
+PAIRERS = {"greedy": GreedyPairer, "swiss": SwissPairer}
+# Metrics which must not increase between two reports
+QUALITY = ("rematches", "score_gap", "colour_conflicts", "repeat_byes")
+
+
+def play(pairer, player_dicts, rounds, results, seed):
+    """Plays a tournament: returns the metrics of the run (see the module docstring)"""
+    rng = random.Random(seed)
+    players = [Player(**data) for data in player_dicts]
+    tournament = Tournaments(
+        "Audit", "Hall", {"from": "01-01-2030", "to": "31-12-2030"},
+        number_of_rounds=rounds, players=players, pairer=pairer,
+    )
+    if results == "rating":
+        tournament.ratings = Ratings({"players": {p.chess_id: [rng.gauss(1600, 250), 0] for p in players}})
+
+    met = set()
+    colours = {p.chess_id: [] for p in players}
+    byes = Counter()
+    report = {"latency_ms": [], "rematches": [], "score_gap": [], "colour_conflicts": [], "bye_ranks": []}
+    for _ in range(rounds):
+        ranking = [p.chess_id for p in tournament.get_sorted_players_by_points()]
+        start = time.perf_counter()
+        next_round = tournament.generate_next_round()
+        report["latency_ms"].append(round((time.perf_counter() - start) * 1000, 3))
+
+        rematches = gap = conflicts = 0
+        for match in next_round.matches:
+            if match.is_bye:
+                # The receiver of the bye, as a rank from the bottom of the standings (0 = last)
+                byes[match.player1.chess_id] += 1
+                report["bye_ranks"].append(len(ranking) - 1 - ranking.index(match.player1.chess_id))
+                continue
+            white, black = match.player1.chess_id, match.player2.chess_id
+            rematches += frozenset((white, black)) in met
+            met.add(frozenset((white, black)))
+            points = tournament.standings.points
+            gap += round(abs(points(match.player1) - points(match.player2)) * 2)
+            colours[white].append(1)
+            colours[black].append(-1)
+            conflicts += sum(len(colours[c]) >= 3 and abs(sum(colours[c][-3:])) == 3 for c in (white, black))
+        report["rematches"].append(rematches)
+        report["score_gap"].append(gap)
+        report["colour_conflicts"].append(conflicts)
+
+        for match in next_round.matches:
+            if match.completed:
+                continue
+            if results == "rating":
+                play_result(match, tournament.ratings, rng, draw_rate=0.3)
+            else:
+                match.set_result(rng.choice((0, 1, 2)))
+
+    return {
+        "latency_ms": {
+            "rounds": report["latency_ms"],
+            "total": round(sum(report["latency_ms"]), 3),
+            "max": max(report["latency_ms"], default=0),
+        },
+        "rematches": sum(report["rematches"]),
+        "rematches_per_round": report["rematches"],
+        "score_gap": sum(report["score_gap"]),
+        "score_gap_per_round": report["score_gap"],
+        "colour_conflicts": sum(report["colour_conflicts"]),
+        "byes": sum(byes.values()),
+        "repeat_byes": sum(count - 1 for count in byes.values()),
+        "bye_ranks": report["bye_ranks"],
+    }
+
+
+def peak_memory(pairer, player_dicts, rounds, results, seed):
+    """Replays the same tournament under tracemalloc (slower): returns its peak memory in KiB"""
+    tracemalloc.start()
+    play(pairer, player_dicts, rounds, results, seed)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def regressions(report, baseline, tolerance):
+    """Lists the differences between two reports which are regressions"""
+    previous = {(run["players"], run["pairer"]): run for run in baseline["runs"]}
+    found = []
+    for run in report["runs"]:
+        old = previous.get((run["players"], run["pairer"]))
+        if old is None:
+            continue
+        label = f"{run['pairer']} with {run['players']} players"
+        for metric in QUALITY:
+            if run[metric] > old[metric]:
+                found.append(f"{label}: {metric} {old[metric]} -> {run[metric]}")
+        if run["latency_ms"]["total"] > old["latency_ms"]["total"] * (1 + tolerance):
+            found.append(
+                f"{label}: pairing time {old['latency_ms']['total']:.1f} -> {run['latency_ms']['total']:.1f} ms"
+            )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit the speed and quality of the pairing engines.")
+    parser.add_argument("--players", type=int, nargs="+", default=[15, 64, 255, 1000], help="field sizes")
+    parser.add_argument("--rounds", type=int, default=9, help="rounds per tournament")
+    parser.add_argument("--pairers", nargs="+", choices=sorted(PAIRERS), default=sorted(PAIRERS))
+    parser.add_argument("--results", choices=("random", "rating"), default="rating")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slower) peak memory measurement")
+    parser.add_argument("--output", help="file to write the JSON report to (default: standard output)")
+    parser.add_argument("--baseline", help="previous JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown versus the baseline")
+    args = parser.parse_args()
+
+    report = {
+        "settings": {
+            "rounds": args.rounds, "results": args.results, "seed": args.seed,
+            "python": platform.python_version(), "machine": platform.machine(),
+        },
+        "runs": [],
+    }
+    for count in args.players:
+        player_dicts = make_players(count, random.Random(count))
+        for name in args.pairers:
+            run = {"players": count, "pairer": name}
+            run.update(play(PAIRERS[name](), player_dicts, args.rounds, args.results, args.seed))
+            if not args.no_memory:
+                run["peak_memory_kib"] = peak_memory(
+                    PAIRERS[name](), player_dicts, args.rounds, args.results, args.seed
+                )
+            report["runs"].append(run)
+            print(f"{count:>6} {name:>7}: {run['latency_ms']['total']:9.1f} ms, {run['rematches']} rematches, "
+                  f"score gap {run['score_gap']}, {run['colour_conflicts']} colour conflicts, "
+                  f"{run['byes']} byes ({run['repeat_byes']} repeated)", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            found = regressions(report, json.load(fp), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
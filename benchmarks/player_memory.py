@@ -0,0 +1,101 @@
+"""
+Benchmark: memory per Player and cost of the common operations, compact Player versus the former one.
+
+The players are read from club files generated by data/make-club.py (cycled to reach --count):
+
+    python -m benchmarks.player_memory --count 100000 data/clubs/*.json
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import cycle, islice
+
+from models import Player
+
+
+class DictPlayer:
+    """The Player as it was before __slots__: __dict__, datetime birthdate and 4-field hash"""
+
+    DATE_FORMAT = "%d-%m-%Y"
+
+    def __init__(self, name, email, chess_id, birthday):
+        self.name = name
+        self.email = email
+        self.chess_id = chess_id
+        self._birthdate = None
+        self.birthday = birthday
+        self.points = 0
+
+    def __hash__(self):
+        return hash((self.name, self.email, self.chess_id, self.birthdate))
+
+    def __eq__(self, other):
+        return (self.name, self.email, self.chess_id, self.birthdate) == (
+            other.name,
+            other.email,
+            other.chess_id,
+            other.birthdate,
+        )
+
+    @property
+    def birthday(self):
+        return self.birthdate.strftime(self.DATE_FORMAT)
+
+    @birthday.setter
+    def birthday(self, value):
+        self.birthdate = datetime.strptime(value, self.DATE_FORMAT)
+
+    def serialize(self):
+        data = {attr: getattr(self, attr) for attr in ("name", "email", "chess_id")}
+        data["birthday"] = self.birthday
+        data["points"] = self.points
+        return data
+
+
+def read_players(paths, count):
+    players = []
+    for path in paths:
+        with open(path) as fp:
+            players.extend(json.load(fp)["players"])
+    for data in players:
+        data.pop("points", None)
+    # Distinct string objects for each player, as when the club files are parsed
+    return [json.loads(json.dumps(data)) for data in islice(cycle(players), count)]
+
+
+def measure(player_class, dicts):
+    tracemalloc.start()
+    start = time.perf_counter()
+    players = [player_class(**data) for data in dicts]
+    build = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    set(players)
+    hashing = time.perf_counter() - start
+    start = time.perf_counter()
+    for player in players:
+        player.serialize()
+    serialize = time.perf_counter() - start
+    return memory / len(players), build, hashing, serialize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory footprint of the Player instances.")
+    parser.add_argument("clubs", nargs="+", help="club JSON files (e.g. generated by data/make-club.py)")
+    parser.add_argument("--count", type=int, default=100000, help="number of players")
+    args = parser.parse_args()
+
+    dicts = read_players(args.clubs, args.count)
+    print(f"{args.count} players from {len(args.clubs)} club file(s)")
+    print(f"{'player':>8} {'bytes/player':>13} {'build (s)':>10} {'set (s)':>8} {'serialize (s)':>14}")
+    for label, player_class in (("former", DictPlayer), ("compact", Player)):
+        memory, build, hashing, serialize = measure(player_class, dicts)
+        print(f"{label:>8} {memory:>13.0f} {build:>10.3f} {hashing:>8.3f} {serialize:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
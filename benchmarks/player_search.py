@@ -0,0 +1,67 @@
+"""
+Benchmark: player search latency, PlayerIndex versus the former linear scan of the registration screen.
+
+The scan filters the available players (not registered yet) then keeps the names containing the
+keyword; the index ranks the matches (chess ID, prefix, word prefix, substring, typos) and only
+returns the first results.
+
+    python -m benchmarks.player_search --members 1000 10000 50000 --registered 200
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.corpus import make_players
+from models import Player, PlayerIndex
+
+QUERIES = ("a", "sm", "ali", "rossi", "maya ng", "Alcie Smtih", "petorv", "Émma")
+
+
+def linear_scan(players, registered, keyword):
+    """The search as it was: list the available players, then keep the matching names"""
+    available = [p for p in players if p not in registered]
+    keyword = keyword.strip().lower()
+    return [p for p in available if keyword in p.name.lower()]
+
+
+def latency(function, repeat):
+    """Median and worst latency of function() in ms"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the player search index against the linear scan.")
+    parser.add_argument("--members", type=int, nargs="+", default=[1000, 10000, 50000], help="total members")
+    parser.add_argument("--registered", type=int, default=200, help="players already registered")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    args = parser.parse_args()
+
+    for count in args.members:
+        rng = random.Random(count)
+        players = [Player(**data) for data in make_players(count, rng)]
+        registered = players[:args.registered]
+        excluded = {p.chess_id for p in registered}
+
+        start = time.perf_counter()
+        index = PlayerIndex(players)
+        build = (time.perf_counter() - start) * 1000
+        print(f"{count} members, {len(registered)} registered: index built in {build:.1f} ms")
+        print(f"  {'query':>14} {'index p50/max (ms)':>20} {'scan p50/max (ms)':>20} {'results':>8}")
+
+        queries = QUERIES + (players[-1].chess_id.lower(),)
+        for query in queries:
+            found = index.search(query, exclude=excluded)
+            indexed = latency(lambda: index.search(query, exclude=excluded), args.repeat)
+            scanned = latency(lambda: linear_scan(players, registered, query), args.repeat)
+            print(f"  {query!r:>14} {indexed[0]:>9.2f} / {indexed[1]:<8.2f} {scanned[0]:>9.2f} / {scanned[1]:<8.2f}"
+                  f" {len(found):>8}" + (f"  top: {found[0].name}" if found else ""))
+
+
+if __name__ == "__main__":
+    main()
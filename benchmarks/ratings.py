@@ -0,0 +1,92 @@
+"""
+Benchmark: recomputation of the Elo ratings from the whole tournament history.
+
+Compares the batched NumPy engine (see models.ratings) with a game-by-game pure-Python Elo
+on the same history, then times the incremental update made when a single tournament completes.
+
+    python -m benchmarks.ratings --games 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.corpus import chess_ids, make_tournament
+from models.ratings import Ratings
+
+
+def make_history(game_count, player_count, size, rounds, rng):
+    """Returns completed tournament dicts (spread over 20 years) holding about game_count games"""
+    ids = chess_ids(player_count, rng)
+    tournaments = []
+    for idx in range(max(1, game_count // (size // 2 * rounds))):
+        tournament = make_tournament(f"History {idx}", rng.sample(ids, size), rounds, rounds, rng)
+        end = date(2000, 1, 1) + timedelta(days=rng.randrange(365 * 20))
+        tournament["dates"] = {"from": end.strftime("%d-%m-%Y"), "to": end.strftime("%d-%m-%Y")}
+        tournaments.append(tournament)
+    return tournaments
+
+
+def naive_elo(tournaments, k_factor=20, provisional_k=40, provisional_games=30):
+    """The same batches (rating period, round), computed game by game with dicts"""
+    batches = {}
+    for data in sorted(tournaments, key=Ratings.end_ordinal):
+        period = Ratings.period(data)
+        for round_index, white, black, score in Ratings.tournament_games(data):
+            batches.setdefault((period, round_index), []).append((white, black, score))
+
+    ratings, games = {}, {}
+    for key in sorted(batches):
+        changes = []
+        for white, black, score in batches[key]:
+            r_white, r_black = ratings.get(white, Ratings.DEFAULT), ratings.get(black, Ratings.DEFAULT)
+            delta = score - 1 / (1 + 10 ** ((r_black - r_white) / 400))
+            k_white = provisional_k if games.get(white, 0) < provisional_games else k_factor
+            k_black = provisional_k if games.get(black, 0) < provisional_games else k_factor
+            changes.append((white, k_white * delta))
+            changes.append((black, -k_black * delta))
+        for chess_id, change in changes:
+            ratings[chess_id] = ratings.get(chess_id, Ratings.DEFAULT) + change
+            games[chess_id] = games.get(chess_id, 0) + 1
+    return ratings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rating engine.")
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=60, help="players per tournament")
+    parser.add_argument("--rounds", type=int, default=9)
+    args = parser.parse_args()
+
+    rng = random.Random(args.games)
+    start = time.perf_counter()
+    tournaments = make_history(args.games, args.players, args.size, args.rounds, rng)
+    generation = time.perf_counter() - start
+    game_count = sum(1 for data in tournaments for _ in Ratings.tournament_games(data))
+
+    ratings = Ratings()
+    start = time.perf_counter()
+    ratings.recompute(tournaments)
+    recompute = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = naive_elo(tournaments)
+    naive = time.perf_counter() - start
+    drift = max(abs(ratings.rating(chess_id) - rating) for chess_id, rating in expected.items())
+    assert drift < 1e-6, f"The engine does not match the game-by-game computation ({drift})"
+
+    new = make_history(args.size // 2 * args.rounds, args.players, args.size, args.rounds, rng)
+    start = time.perf_counter()
+    changed = ratings.apply_tournaments(new)
+    incremental = time.perf_counter() - start
+
+    print(f"{game_count} games, {len(tournaments)} tournaments, {len(ratings)} players "
+          f"(history generated in {generation:.1f} s)")
+    print(f"  batched recomputation      : {recompute:8.2f} s")
+    print(f"  game-by-game recomputation : {naive:8.2f} s")
+    print(f"  one completed tournament   : {incremental * 1000:8.2f} ms ({len(changed)} players updated)")
+
+
+if __name__ == "__main__":
+    main()
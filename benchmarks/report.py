@@ -0,0 +1,67 @@
+"""
+Benchmark: tournament report generation, for every output format.
+
+A synthetic Swiss event is played, then its full report (standings, crosstable and every round)
+is streamed to a null sink in each format. The peak memory of the streamed report is compared
+with the same report built as a single string (as a non-streaming generator would).
+
+    python -m benchmarks.report --players 1000 --rounds 9
+"""
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+from benchmarks.tiebreaks import play
+from reports import WRITERS, write_report
+
+
+class NullSink:
+    """Text file object counting what is written to it"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+        return len(text)
+
+
+def measure(function):
+    """Returns (seconds, peak traced KiB) of function()"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak // 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tournament report generator.")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=9)
+    args = parser.parse_args()
+
+    tournament = play(args.players, args.rounds, random.Random(args.players))
+    # The tie-breaks are computed once (and cached): only the report itself is measured
+    tournament.tiebreaks.ranking()
+
+    print(f"{args.players} players, {args.rounds} rounds")
+    print(f"  {'format':>6} {'time (ms)':>10} {'size (KiB)':>11} "
+          f"{'streamed peak (KiB)':>20} {'in-memory peak (KiB)':>21}")
+    for fmt in WRITERS:
+        sink = NullSink()
+        start = time.perf_counter()
+        write_report(tournament, sink, fmt)
+        elapsed = time.perf_counter() - start
+
+        _, streamed = measure(lambda: write_report(tournament, NullSink(), fmt))
+        _, in_memory = measure(lambda: write_report(tournament, io.StringIO(), fmt))
+        print(f"  {fmt:>6} {elapsed * 1000:>10.1f} {sink.size // 1024:>11} {streamed:>20} {in_memory:>21}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: throughput of the Monte Carlo simulator versus the number of worker processes.
+
+Each run simulates the same rated field (same seed, so the same distributions): the speedup
+over a single process should stay close to the number of workers, up to the number of CPUs.
+
+    python -m benchmarks.simulation --players 32 --rounds 7 --simulations 2000 --workers 1 2 4
+"""
+import argparse
+import os
+import random
+import time
+
+from models.simulation import simulate, synthetic_tournament
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tournament simulator.")
+    parser.add_argument("--players", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--simulations", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = random.Random(args.players)
+    ratings = [rng.gauss(1600, 250) for _ in range(args.players)]
+    tournament = synthetic_tournament(args.players, args.rounds, ratings)
+
+    print(f"{args.players} players, {args.rounds} rounds, {args.simulations} simulations ({os.cpu_count()} CPUs)")
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = simulate(tournament, simulations=args.simulations, workers=workers, seed=1)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = (elapsed, result.positions)
+        assert (result.positions == reference[1]).all(), "The result depends on the number of workers"
+        print(f"  {workers:3d} worker(s): {args.simulations / elapsed:8.1f} simulations/s "
+              f"(x{reference[0] / elapsed:.2f})")
+
+    favourite = max(result.players, key=lambda p: result.finish_probability(1)[p.chess_id])
+    print(f"favourite: {favourite.name}, {result.finish_probability(1)[favourite.chess_id]:.1%} to win, "
+          f"{result.finish_probability(3)[favourite.chess_id]:.1%} top 3; "
+          f"single leader after {result.expected_rounds():.2f} rounds on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: tie-break computation on a synthetic Swiss event.
+
+Compares a naive pure-Python computation (each player scans every match of every round)
+with the NumPy engine: a full build from the rounds, and the refresh after a single new result.
+
+    python -m benchmarks.tiebreaks --players 2000 --rounds 11
+"""
+import argparse
+import random
+import time
+
+from benchmarks.corpus import make_players
+from models import GreedyPairer, Player
+from models.pairing_history import PairingHistory
+from models.tiebreaks import TieBreaks
+from models.tournaments import Tournaments
+
+
+def naive_tiebreaks(players, rounds):
+    """Buchholz and Sonneborn-Berger, the quadratic way (byes only count in the scores)"""
+    def games(player):
+        for rnd in rounds:
+            for match in rnd.matches:
+                if match.completed and not match.is_bye and player in (match.player1, match.player2):
+                    opponent = match.player2 if match.player1 == player else match.player1
+                    points = 0.5 if match.winner is None else float(match.winner == player)
+                    yield opponent, points
+
+    byes = {p.chess_id: sum(m.is_bye and m.player1 == p for rnd in rounds for m in rnd.matches) for p in players}
+    scores = {p.chess_id: byes[p.chess_id] + sum(points for _, points in games(p)) for p in players}
+    return {
+        p.chess_id: (
+            sum(scores[o.chess_id] for o, _ in games(p)),
+            sum(points * scores[o.chess_id] for o, points in games(p)),
+        )
+        for p in players
+    }
+
+
+def play(player_count, rounds, rng):
+    """Plays a tournament, keeping the result of the last match of the last round unset"""
+    players = [Player(**data) for data in make_players(player_count, rng)]
+    tournament = Tournaments(
+        "Benchmark", "Hall", {"from": "01-01-2030", "to": "31-12-2030"},
+        number_of_rounds=rounds, players=players, pairer=GreedyPairer(),
+    )
+    for round_number in range(rounds):
+        next_round = tournament.generate_next_round()
+        matches = [match for match in next_round.matches if not match.completed]
+        for match in matches[:-1] if round_number == rounds - 1 else matches:
+            match.set_result(rng.choice((0, 1, 2)))
+    return tournament
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tie-break engine.")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=11)
+    parser.add_argument("--naive-players", type=int, default=500, help="field size for the naive computation")
+    args = parser.parse_args()
+
+    rng = random.Random(args.players)
+    tournament = play(args.players, args.rounds, rng)
+
+    start = time.perf_counter()
+    tiebreaks = TieBreaks(PairingHistory(tournament.players, tournament.rounds), tournament.players, tournament.rounds)
+    tiebreaks.compute()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tiebreaks.ranking()
+    ranking = time.perf_counter() - start
+
+    last_match = next(match for match in tournament.rounds[-1].matches if not match.completed)
+    start = time.perf_counter()
+    last_match.set_result(0)
+    tiebreaks.set_result(len(tournament.rounds) - 1, last_match)
+    tiebreaks.compute()
+    refresh = time.perf_counter() - start
+
+    # The naive computation is quadratic: measured on a smaller field, then checked against the engine
+    small = play(args.naive_players, args.rounds, random.Random(args.naive_players))
+    start = time.perf_counter()
+    expected = naive_tiebreaks(small.players, small.rounds)
+    naive = time.perf_counter() - start
+    engine = TieBreaks(PairingHistory(small.players, small.rounds), small.players, small.rounds)
+    assert all(
+        (values["buchholz"], values["sonneborn_berger"]) == expected[p.chess_id]
+        for p in small.players
+        for values in [engine.values(p)]
+    ), "The engine does not match the naive computation"
+
+    print(f"{args.players} players, {args.rounds} rounds")
+    print(f"  engine build + all tie-breaks : {build * 1000:8.1f} ms")
+    print(f"  ranking                       : {ranking * 1000:8.1f} ms")
+    print(f"  refresh after one result      : {refresh * 1000:8.1f} ms")
+    # Quadratic: the naive time scaled to the benchmarked field size
+    scaled = naive * (args.players / args.naive_players) ** 2
+    print(f"naive Buchholz + SB, {args.naive_players} players: {naive * 1000:8.1f} ms "
+          f"(about {scaled * 1000:.1f} ms for {args.players} players)")
+
+
+if __name__ == "__main__":
+    main()
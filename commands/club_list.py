@@ -1,6 +1,5 @@
 from commands.context import Context
-from models import ClubManager
-from models import TournamentManager
+from models import DataSession
 
 from .base import BaseCommand
 
@@ -9,6 +8,13 @@ class ClubListCmd(BaseCommand):
     """Command to get the list of clubs"""
 
     def execute(self):
-        cm = ClubManager()
-        tm = TournamentManager(club_manager=cm)
-        return Context("main-menu", club_manager=cm, tournament_manager=tm)
+        """Reuses the shared data session, reloading only the files changed on disk"""
+        session = DataSession.shared()
+        stats = session.refresh()
+        if stats.files_reparsed:
+            print(f"Reloaded {stats.files_reparsed} changed file(s) in {stats.elapsed * 1000:.1f} ms")
+        return Context(
+            "main-menu",
+            club_manager=session.club_manager,
+            tournament_manager=session.tournament_manager,
+        )
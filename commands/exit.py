@@ -1,4 +1,5 @@
 from commands.context import Context
+from models import DataSession
 
 from .base import BaseCommand
 
@@ -7,4 +8,6 @@ class ExitCmd(BaseCommand):
     """Special command: it stops the application from running"""
 
     def execute(self):
+        """Writes the pending (debounced) saves before stopping"""
+        DataSession.shared().flush()
         return Context(run=False)
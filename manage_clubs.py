@@ -1,4 +1,8 @@
+import argparse
+
 from commands import ClubListCmd
+from models import DataSession
+from storage import SqliteStorage
 from screens import ClubCreate, ClubView, MainMenu, PlayerEdit, PlayerView, TournamentView, \
     RegisterPlayer, RoundView, CreateTournamentView
 
@@ -26,20 +30,30 @@ class App:
         self.context = command()
 
     def run(self):
-        while self.context.run:
-            # Get the screen class from the mapping
-            screen = self.SCREENS[self.context.screen]
-            try:
-                # Run the screen and get the command
-                command = screen(**self.context.kwargs).run()
-                # Run the command and get a context back
-                self.context = command()
-            except KeyboardInterrupt:
-                # Ctrl-C
-                print("Bye!")
-                self.context.run = False
+        try:
+            while self.context.run:
+                # Get the screen class from the mapping
+                screen = self.SCREENS[self.context.screen]
+                try:
+                    # Run the screen and get the command
+                    command = screen(**self.context.kwargs).run()
+                    # Run the command and get a context back
+                    self.context = command()
+                except KeyboardInterrupt:
+                    # Ctrl-C
+                    print("Bye!")
+                    self.context.run = False
+        finally:
+            # Write the pending autosaves before exiting, even when a screen or command failed
+            DataSession.shared().close()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage chess clubs and tournaments.")
+    parser.add_argument("--db", help="use this SQLite database instead of the JSON files of the data folder")
+    args = parser.parse_args()
+    if args.db:
+        DataSession.configure(storage=SqliteStorage(args.db))
+
     app = App()
     app.run()
@@ -0,0 +1,239 @@
+"""Non-interactive tournament operations, for scripts and load tests.
+
+Each subcommand works on the model layer directly (no screens, no prompts):
+
+    python manage_tournaments.py create "Spring Open" --venue Hall --from 01-04-2031 --to 02-04-2031 --rounds 7
+    python manage_tournaments.py register spring-open --file signup.csv
+    python manage_tournaments.py pair spring-open
+    python manage_tournaments.py results spring-open results.csv
+    python manage_tournaments.py standings spring-open
+
+Tournaments are designated by their ID, a unique prefix of it, or their exact name. The batch
+subcommand runs a file of such commands (one per line) in a single process, so thousands of
+operations can be scripted and timed (--timing prints the duration of each command).
+"""
+import argparse
+import shlex
+import sys
+import time
+from datetime import datetime
+
+from models import DataSession, ResultImportError, import_results, read_chess_ids, read_results
+from models.pairing import PAIRING_SYSTEMS
+from reports import SECTIONS, WRITERS, format_for, write_report
+from storage import SqliteStorage
+
+
+class CommandError(Exception):
+    """A command which cannot be carried out (reported without traceback)"""
+
+
+def date_argument(value):
+    """argparse type: a dd-mm-yyyy date (kept as a string)"""
+    try:
+        datetime.strptime(value, "%d-%m-%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r} (dd-mm-yyyy expected)")
+    return value
+
+
+def find_tournament(session, key):
+    """Returns the tournament with this ID, unique ID prefix or exact name (completed ones are opened)"""
+    tm = session.tournament_manager
+    candidates = [(t.tournament_id, t.name, t) for t in tm.in_progress]
+    candidates += [(s.tournament_id, s.name, s) for s in tm.completed]
+    for matches in (
+        [c for c in candidates if c[0] == key],
+        [c for c in candidates if c[1] == key],
+        [c for c in candidates if c[0].startswith(key)],
+    ):
+        if len(matches) > 1:
+            raise CommandError(f"{key!r} matches several tournaments: {', '.join(c[0] for c in matches)}")
+        if matches:
+            tournament = matches[0][2]
+            return tournament if tournament in tm.in_progress else tm.open_tournament(tournament)
+    raise CommandError(f"No tournament {key!r}")
+
+
+def in_progress(session, key):
+    tournament = find_tournament(session, key)
+    if tournament.completed:
+        raise CommandError(f"{tournament.name} is completed")
+    return tournament
+
+
+def cmd_list(session, args):
+    tm = session.tournament_manager
+    for t in tm.in_progress:
+        print(f"{t.tournament_id}\t{t.name}\tround {t.current_round}/{t.number_of_rounds}\t{len(t.players)} players")
+    if args.all:
+        for summary in tm.completed:
+            print(f"{summary.tournament_id}\t{summary.name}\tcompleted\t{summary.player_count} players")
+
+
+def cmd_create(session, args):
+    if datetime.strptime(args.end, "%d-%m-%Y") < datetime.strptime(args.start, "%d-%m-%Y"):
+        raise CommandError("The end date must be on or after the start date")
+    tournament = session.tournament_manager.create(
+        name=args.name, venue=args.venue, dates={"from": args.start, "to": args.end},
+        number_of_rounds=args.rounds, pairing_system=args.pairing,
+    )
+    print(tournament.tournament_id)
+
+
+def cmd_register(session, args):
+    tournament = in_progress(session, args.tournament)
+    chess_ids = list(args.chess_ids)
+    if args.file:
+        with open(args.file, newline="") as fp:
+            chess_ids += read_chess_ids(fp)
+    if args.club:
+        clubs = [club for club in session.club_manager.clubs if args.club in (club.name, str(club.key))]
+        if not clubs:
+            raise CommandError(f"No club {args.club!r}")
+        chess_ids += [player.chess_id for player in clubs[0].players]
+    report = session.tournament_manager.register_players(tournament, chess_ids)
+    print(report.summary())
+
+
+def cmd_pair(session, args):
+    tournament = in_progress(session, args.tournament)
+    for _ in range(args.count):
+        try:
+            rnd = tournament.generate_next_round()
+        except ValueError as e:
+            raise CommandError(str(e))
+        if rnd is None:
+            if tournament.rounds and not tournament.rounds[-1].is_complete():
+                raise CommandError(f"round {len(tournament.rounds)} has unfinished games")
+            session.tournament_manager.complete_tournament(tournament)
+            print(f"{tournament.name} is completed")
+            return
+        print(f"Round {tournament.current_round} of {tournament.number_of_rounds}")
+        for board, match in enumerate(rnd.matches, 1):
+            black = "bye" if match.is_bye else match.player2.chess_id
+            print(f"{board}\t{match.player1.chess_id}\t{black}")
+
+
+def cmd_results(session, args):
+    """Results of the current round, all or nothing (see models.results.import_results)"""
+    tournament = in_progress(session, args.tournament)
+    try:
+        recorded = import_results(tournament, read_results(args.file))
+    except ResultImportError as e:
+        raise CommandError("\n".join([f"no result recorded from {args.file}:"] + e.errors))
+    print(f"{recorded} result(s) recorded")
+
+
+def cmd_standings(session, args):
+    tournament = find_tournament(session, args.tournament)
+    tiebreaks = tournament.tiebreaks
+    for rank, player in enumerate(tiebreaks.ranking(), 1):
+        values = tiebreaks.values(player)
+        print(f"{rank}\t{player.chess_id}\t{player.name}\t{values['score']:g}\t"
+              f"{values['buchholz']:g}\t{values['sonneborn_berger']:g}")
+
+
+def cmd_report(session, args):
+    tournament = find_tournament(session, args.tournament)
+    sections = args.sections or SECTIONS
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as fp:
+            write_report(tournament, fp, args.format or format_for(args.output), sections)
+    else:
+        write_report(tournament, sys.stdout, args.format or "text", sections)
+
+
+def cmd_batch(session, args):
+    """Runs the commands of a file (one per line, as on the command line) in this process"""
+    parser = build_parser()
+    with open(args.file) as fp:
+        for number, line in enumerate(fp, 1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            if words[0] == "batch":
+                raise CommandError(f"{args.file}:{number}: batch files cannot be nested")
+            try:
+                run(session, parser.parse_args(words), timing=args.timing)
+            except SystemExit:
+                raise CommandError(f"{args.file}:{number}: invalid command")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run tournament operations without the interactive screens.")
+    parser.add_argument("--db", help="use this SQLite database instead of the JSON files of the data folder")
+    parser.add_argument("--data", default="data", help="data folder (clubs and tournaments subfolders)")
+    parser.add_argument("--timing", action="store_true", help="print the duration of each command to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sub = commands.add_parser("list", help="list the tournaments in progress")
+    sub.add_argument("--all", action="store_true", help="also list the completed tournaments")
+    sub.set_defaults(handler=cmd_list)
+
+    sub = commands.add_parser("create", help="create a tournament (prints its ID)")
+    sub.add_argument("name")
+    sub.add_argument("--venue", required=True)
+    sub.add_argument("--from", dest="start", type=date_argument, required=True, help="start date (dd-mm-yyyy)")
+    sub.add_argument("--to", dest="end", type=date_argument, required=True, help="end date (dd-mm-yyyy)")
+    sub.add_argument("--rounds", type=int, required=True)
+    sub.add_argument("--pairing", choices=list(PAIRING_SYSTEMS), default="swiss")
+    sub.set_defaults(handler=cmd_create)
+
+    sub = commands.add_parser("register", help="register players (chess IDs, a file or a whole club)")
+    sub.add_argument("tournament")
+    sub.add_argument("chess_ids", nargs="*")
+    sub.add_argument("--file", help="signup CSV export or one chess ID per line")
+    sub.add_argument("--club", help="register every member of this club (name or key)")
+    sub.set_defaults(handler=cmd_register)
+
+    sub = commands.add_parser("pair", help="generate the next round (completes the tournament after the last one)")
+    sub.add_argument("tournament")
+    sub.add_argument("--count", type=int, default=1, help="number of rounds to generate")
+    sub.set_defaults(handler=cmd_pair)
+
+    sub = commands.add_parser("results", help="record the results of the current round from a file")
+    sub.add_argument("tournament")
+    sub.add_argument("file", help="CSV (white,black,result rows) or JSON file, results as 1-0, 0-1 or 1/2-1/2")
+    sub.set_defaults(handler=cmd_results)
+
+    sub = commands.add_parser("standings", help="print the standings (rank, chess ID, name, points, tie-breaks)")
+    sub.add_argument("tournament")
+    sub.set_defaults(handler=cmd_standings)
+
+    sub = commands.add_parser("report", help="write the report: standings, crosstable and every round")
+    sub.add_argument("tournament")
+    sub.add_argument("--format", choices=sorted(WRITERS), help="default: from the output extension, else text")
+    sub.add_argument("--output", help="file to write the report to (default: standard output)")
+    sub.add_argument("--sections", nargs="+", choices=SECTIONS, help="sections to include (default: all)")
+    sub.set_defaults(handler=cmd_report)
+
+    sub = commands.add_parser("batch", help="run the commands of a file, one per line")
+    sub.add_argument("file")
+    sub.set_defaults(handler=cmd_batch)
+    return parser
+
+
+def run(session, args, timing=False):
+    start = time.perf_counter()
+    args.handler(session, args)
+    if timing:
+        print(f"[{args.command}] {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    storage = SqliteStorage(args.db) if args.db else None
+    session = DataSession(f"{args.data}/clubs", f"{args.data}/tournaments", storage=storage)
+    try:
+        run(session, args, timing=args.timing)
+    except (CommandError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,40 @@
 from .club import ChessClub
 from .club_manager import ClubManager
+from .data_session import DataSession
+from .pairing import BasePairer, GreedyPairer, RoundRobinPairer, ScheduledPairer, ScheveningenPairer, SwissPairer
+from .pairing_history import PairingHistory
 from .player import Player
+from .player_index import PlayerIndex
+from .ratings import Ratings
+from .registration import RegistrationReport, read_chess_ids, register_chess_ids
+from .results import ResultImportError, import_results, read_results
+from .standings import Standings
+from .tiebreaks import TieBreaks
 from .tournament_manager import TournamentManager
+from .tournament_summary import TournamentSummary
 
-__all__ = ["Player", "ChessClub", "ClubManager", "TournamentManager"]
+__all__ = [
+    "Player",
+    "PlayerIndex",
+    "ChessClub",
+    "ClubManager",
+    "DataSession",
+    "TournamentManager",
+    "TournamentSummary",
+    "BasePairer",
+    "GreedyPairer",
+    "SwissPairer",
+    "ScheduledPairer",
+    "RoundRobinPairer",
+    "ScheveningenPairer",
+    "PairingHistory",
+    "Standings",
+    "TieBreaks",
+    "Ratings",
+    "RegistrationReport",
+    "ResultImportError",
+    "import_results",
+    "read_results",
+    "read_chess_ids",
+    "register_chess_ids",
+]
@@ -1,4 +1,4 @@
-import json
+from storage import JsonStorage
 
 from .player import Player
 
@@ -7,47 +7,130 @@ class ChessClub:
     """
     A local chess club.
 
-    Data is loaded from a JSON file (provided as argument).
-    The class creates Player instances based on JSON data.
+    Data is loaded from a storage backend (JSON files by default).
+    The class creates Player instances based on the stored data.
     """
 
-    def __init__(self, filepath=None, name=None):
-        """The constructor works in two ways:
-        - if the filepath is provided, it loads data from JSON
-        - if it is not but a name is provided, it creates a new club (and a new JSON file)
+    def __init__(self, filepath=None, name=None, lazy=False, member_count=0, storage=None):
+        """The constructor works in three ways:
+        - if the filepath (the key of the club in the storage) is provided, it loads the data
+        - if lazy is True, only the name is kept: the players are loaded when first accessed
+        - if it is not but a name is provided, it creates a new club (and saves it)
         """
 
         self.name = name
-        self.filepath = filepath
-        self.players = []
-
-        if filepath and not name:
-            # Load data from the JSON file
-            with open(filepath) as fp:
-                data = json.load(fp)
-                self.name = data["name"]
-                self.players = [
-                    Player(**player_dict) for player_dict in data["players"]
-                ]
-        elif not filepath:
-            # We did not have a file, so we are going to create it by running the save method
+        self.storage = storage or JsonStorage()
+        self.key = filepath
+        self._players = []
+        # Set by the ClubManager, which indexes the players by chess_id
+        self.manager = None
+        # True when the players changed since the last save
+        self.dirty = False
+
+        if lazy and filepath is not None:
+            # Players are loaded on first access (see the players property)
+            self._players = None
+            self._member_count = member_count
+        elif filepath is not None and not name:
+            # Load data from the storage
+            self.load()
+        elif filepath is None:
+            # We did not have a key, so we are going to create the club by running the save method
+            self.key = self.storage.create_club(name)
             self.save()
 
+    @property
+    def filepath(self):
+        """The key of the club in the storage (a file path for the JSON storage)"""
+        return self.key
+
+    @property
+    def players(self):
+        """The list of players, loaded from the storage on first access in lazy mode"""
+        if self._players is None:
+            self.load()
+        return self._players
+
+    @players.setter
+    def players(self, value):
+        self._players = value
+
+    @property
+    def is_loaded(self):
+        """bool: False while a lazy club has not loaded its player list yet"""
+        return self._players is not None
+
+    @property
+    def member_count(self):
+        """Number of members, without loading the players of a lazy club"""
+        if self._players is None:
+            return self._member_count
+        return len(self._players)
+
+    def load(self, data=None):
+        """Loads (or reloads) the club info and the players from the storage (or from the data provided).
+
+        On a reload, players are updated in place (matched by chess_id), so the
+        tournaments referencing them keep valid objects.
+        """
+
+        if data is None:
+            data = self.storage.load_club(self.key)
+
+        previous = self._players or []
+        current = {p.chess_id: p for p in previous}
+        players = []
+        for player_dict in data["players"]:
+            # Points belong to tournaments: they are rebuilt from the results
+            player_dict = {key: value for key, value in player_dict.items() if key != "points"}
+            player = current.get(player_dict["chess_id"])
+            if player is None:
+                player = Player(**player_dict)
+            else:
+                for key, value in player_dict.items():
+                    setattr(player, key, value)
+            players.append(player)
+
+        self.name = data["name"]
+        self._players = players
+
+        if self.manager:
+            self.manager.club_loaded(self, previous=previous)
+
     def save(self):
-        """Serializes the players and saves the club info to the JSON file"""
+        """Saves the club info and all the players to the storage"""
 
-        with open(self.filepath, "w") as fp:
-            json.dump(
-                {"name": self.name, "players": [p.serialize() for p in self.players]},
-                fp,
-            )
+        self.dirty = False
+        self.storage.save_club(self)
+        if self.manager:
+            self.manager.club_saved(self)
+
+    def mark_dirty(self, player=None, old_chess_id=None):
+        """Flags the club as modified and saves it.
+
+        With an autosave writer, the save is deferred (and merged with the next changes);
+        otherwise the changed player (or the whole club) is saved right away.
+        """
+        self.dirty = True
+        autosave = self.manager.autosave if self.manager else None
+        if autosave:
+            autosave.schedule(("club", self.key), self.save)
+        elif player is None:
+            self.save()
+        else:
+            self.dirty = False
+            self.storage.save_player(self, player, old_chess_id=old_chess_id)
+            if self.manager:
+                self.manager.club_saved(self)
 
     def create_player(self, **kwargs):
         """Utility method to create a new player instance and add it to the club"""
 
         player = Player(**kwargs)
         self.players.append(player)
-        self.save()
+        if self.manager:
+            self.manager.index_player(self, player)
+        self.mark_dirty(player)
         return player
 
     def update_player(self, player, **kwargs):
@@ -56,8 +139,11 @@ class ChessClub:
         if player not in self.players:
             raise RuntimeError(f"Player {player} not in club {self.name}!")
 
+        old_chess_id = player.chess_id
         for key, value in kwargs.items():
             setattr(player, key, value)
 
-        self.save()
+        if self.manager:
+            self.manager.index_player(self, player, old_chess_id=old_chess_id)
+        self.mark_dirty(player, old_chess_id=old_chess_id)
         return player
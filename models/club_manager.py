@@ -1,32 +1,180 @@
-import json
-from pathlib import Path
+from functools import partial
+
+from storage import JsonStorage
 
 from .club import ChessClub
+from .player_index import PlayerIndex
 
 
 class ClubManager:
-    def __init__(self, data_folder="data/clubs"):
-        datadir = Path(data_folder)
-        self.data_folder = datadir
+    """Manages all the clubs of the storage (JSON files of the data folder by default).
+
+    The manager keeps a global index of every member (chess_id -> (club, player)),
+    so looking a player up does not require walking every club.
+    The clubs keep this index up to date when players are created or updated.
+
+    In lazy mode, startup only reads the club headers (name, member count, member IDs)
+    and the clubs load their player list when first accessed.
+
+    Name searches go through a PlayerIndex (search_index), built on first use (which loads the
+    lazy clubs) and then kept up to date along with the chess_id index.
+    """
+
+    def __init__(self, data_folder="data/clubs", lazy=False, storage=None):
+        self.storage = storage or JsonStorage(clubs_folder=data_folder)
+        self.lazy = lazy
+        # Optional AutosaveWriter: when set, the clubs defer their saves to it
+        self.autosave = None
         self.clubs = []
-        for filepath in datadir.iterdir():
-            if filepath.is_file() and filepath.suffix == ".json":
-                try:
-                    self.clubs.append(ChessClub(filepath))
-                except json.JSONDecodeError:
-                    print(filepath, "is invalid JSON file.")
+        self._players_by_id = {}
+        # chess_id -> club, for the members of lazy clubs which are not loaded yet
+        self._pending_ids = {}
+        self._pending_by_club = {}
+        # key -> signature of the club as last read or written by us
+        self._signatures = {}
+        self._search_index = None
+
+        for header in self.storage.list_clubs(lazy=lazy):
+            self._add_header(header)
+
+    def _add_header(self, header):
+        """Builds a club from a storage header (lazy unless the header holds the players)"""
+        if "players" in header:
+            club = ChessClub(header["key"], name=header["name"], storage=self.storage)
+            club.load(header)
+        else:
+            club = ChessClub(
+                header["key"], name=header["name"], lazy=True, member_count=header["members"], storage=self.storage
+            )
+        self._signatures[header["key"]] = header["signature"]
+        self._add_club(club, pending_ids=header["ids"])
+        return club
+
+    def _add_club(self, club, pending_ids=None):
+        """Registers a club with the manager and indexes its players"""
+        club.manager = self
+        self.clubs.append(club)
+        if not club.is_loaded:
+            self._pending_by_club[club] = pending_ids or []
+            for chess_id in self._pending_by_club[club]:
+                self._pending_ids.setdefault(chess_id, club)
+            return
+
+        for player in club.players:
+            self.index_player(club, player)
+
+    def _remove_club(self, club):
+        self.clubs.remove(club)
+        self._signatures.pop(club.key, None)
+        self._unindex_club(club, club.players if club.is_loaded else [])
+
+    def _unindex_club(self, club, players):
+        for chess_id in self._pending_by_club.pop(club, []):
+            if self._pending_ids.get(chess_id) is club:
+                del self._pending_ids[chess_id]
+        for player in players:
+            entry = self._players_by_id.get(player.chess_id)
+            if entry and entry[1] is player:
+                del self._players_by_id[player.chess_id]
+            if self._search_index is not None:
+                self._search_index.remove(player)
+
+    def club_loaded(self, club, previous=()):
+        """Called by a club once its players are loaded: replaces its previous players in the index"""
+        kept = set(map(id, club.players))
+        self._unindex_club(club, [p for p in previous if id(p) not in kept])
+        for player in club.players:
+            self.index_player(club, player)
+
+    def club_saved(self, club):
+        """Called by a club after writing it: our own writes must not trigger a reload"""
+        self.storage.on_commit(partial(self._update_signature, club.key))
+
+    def _update_signature(self, key):
+        self._signatures[key] = self.storage.club_signature(key)
+
+    def refresh(self):
+        """Reloads the clubs which changed in the storage since we last read or wrote them.
+
+        New clubs are added and deleted clubs are dropped. Returns the number of clubs reloaded.
+        """
+        reloaded = 0
+        clubs_by_key = {club.key: club for club in self.clubs}
+
+        for key, signature in self.storage.club_signatures().items():
+            club = clubs_by_key.pop(key, None)
+            if club is not None and self._signatures.get(key) == signature:
+                continue
+            try:
+                if club is None:
+                    club = ChessClub(key, storage=self.storage)
+                    self._add_club(club)
+                else:
+                    club.load()
+            except ValueError:
+                print(key, "could not be loaded.")
+                continue
+            self._signatures[key] = signature
+            reloaded += 1
+
+        for club in clubs_by_key.values():
+            self._remove_club(club)
+
+        return reloaded
+
+    def index_player(self, club, player, old_chess_id=None):
+        """Adds (or moves) a player in the chess_id index.
+
+        If the player's chess_id changed, old_chess_id is the previous value and its entry is dropped.
+        When two clubs share a chess_id, the first indexed player wins (like the former linear scan).
+        """
+        if old_chess_id is not None and old_chess_id != player.chess_id:
+            entry = self._players_by_id.get(old_chess_id)
+            if entry and entry[1] is player:
+                del self._players_by_id[old_chess_id]
+
+        self._players_by_id.setdefault(player.chess_id, (club, player))
+        if self._search_index is not None:
+            self._search_index.add(player)
+
+    @property
+    def search_index(self):
+        """PlayerIndex: The name / chess ID search index over the members of every club"""
+        if self._search_index is None:
+            # Reading club.players loads the lazy clubs (indexing is skipped until the index exists)
+            self._search_index = PlayerIndex(player for club in self.clubs for player in club.players)
+        return self._search_index
+
+    def search_players(self, query, limit=20, exclude=()):
+        """Ranked search of the members by chess ID or name (see PlayerIndex.search)"""
+        return self.search_index.search(query, limit=limit, exclude=exclude)
+
+    def _lookup(self, chess_id):
+        entry = self._players_by_id.get(chess_id)
+        if entry is None and chess_id in self._pending_ids:
+            # Loading the lazy club indexes its players
+            self._pending_ids[chess_id].load()
+            entry = self._players_by_id.get(chess_id)
+        return entry
 
     def get_player_by_chess_id(self, chess_id):
-        for club in self.clubs:
-            for player in club.players:
-                if player.chess_id == chess_id:
-                    return player
-        return None  # If not found
+        entry = self._lookup(chess_id)
+        return entry[1] if entry else None  # None if not found
+
+    def get_club_by_chess_id(self, chess_id):
+        """Returns the club the player belongs to (or None)"""
+        entry = self._lookup(chess_id)
+        return entry[0] if entry else None
+
+    def get_players_by_chess_ids(self, chess_ids):
+        """Bulk lookup: returns a list of players in the same order as chess_ids (None for unknown IDs)"""
+        index = self._players_by_id
+        if self._pending_ids:
+            return [entry[1] if entry else None for entry in map(self._lookup, chess_ids)]
+        return [entry[1] if entry else None for entry in map(index.get, chess_ids)]
 
     def create(self, name):
-        filepath = self.data_folder / (name.replace(" ", "") + ".json")
-        club = ChessClub(name=name, filepath=filepath)
+        club = ChessClub(self.storage.create_club(name), name=name, storage=self.storage)
+        self._add_club(club)
         club.save()
-
-        self.clubs.append(club)
         return club
@@ -0,0 +1,72 @@
+import time
+from collections import namedtuple
+
+from storage import AutosaveWriter, JsonStorage
+
+from .club_manager import ClubManager
+from .tournament_manager import TournamentManager
+
+RefreshStats = namedtuple("RefreshStats", ["files_reparsed", "elapsed"])
+
+
+class DataSession:
+    """Application-level data: one ClubManager and one TournamentManager shared by the commands.
+
+    Instead of building new managers (and parsing every JSON file) on each navigation,
+    the commands refresh the shared session, which only reloads the files changed on disk.
+    """
+
+    _shared = None
+
+    def __init__(self, clubs_folder="data/clubs", tournaments_folder="data/tournaments", storage=None):
+        """Without a storage backend, the JSON files of the clubs and tournaments folders are used"""
+        # One backend for both managers: their writes share its lock and its group commits
+        storage = storage or JsonStorage(clubs_folder, tournaments_folder)
+        self.club_manager = ClubManager(data_folder=clubs_folder, lazy=True, storage=storage)
+        self.tournament_manager = TournamentManager(
+            club_manager=self.club_manager, data_folder=tournaments_folder, storage=storage
+        )
+        self.storage = storage
+        self.last_refresh = None
+
+        # Background writer for the deferred saves of the clubs and tournaments
+        self.autosave = None
+        if storage.DEFERRED_WRITES:
+            self.autosave = AutosaveWriter(batch=storage.batch)
+            self.autosave.start()
+            self.club_manager.autosave = self.autosave
+            self.tournament_manager.autosave = self.autosave
+
+    @classmethod
+    def configure(cls, **kwargs):
+        """Creates the session of the application with specific arguments (e.g. a storage backend)"""
+        cls._shared = cls(**kwargs)
+        return cls._shared
+
+    @classmethod
+    def shared(cls):
+        """Returns the session of the application (created on first use)"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def refresh(self):
+        """Reloads the files whose mtime or size changed on disk.
+
+        Returns a RefreshStats (number of files reparsed, elapsed seconds).
+        """
+        start = time.perf_counter()
+        reparsed = self.club_manager.refresh() + self.tournament_manager.refresh()
+        self.last_refresh = RefreshStats(reparsed, time.perf_counter() - start)
+        return self.last_refresh
+
+    def flush(self):
+        """Writes every pending save now (e.g. before exiting)"""
+        if self.autosave:
+            self.autosave.flush()
+
+    def close(self):
+        """Flushes the pending saves, stops the writer thread and closes the storage"""
+        if self.autosave:
+            self.autosave.stop()
+        self.storage.close()
@@ -6,6 +6,9 @@ class Match:
         "completed": <bool>,
         "winner": "<id1>|<id2>|null"
     }
+
+    A bye is a match without player2 ("players": ["<id1>", null]): it is created completed,
+    won by player1 (see Match.bye).
     """
 
     def __init__(self, player1, player2, completed=False, winner=None):
@@ -18,6 +21,18 @@ class Match:
         # if result is not None:
         #     self.set_result(result)
         self.winner = winner
+        # Called with the match once a result is set (the tournament uses it to journal results)
+        self.on_result = None
+
+    @classmethod
+    def bye(cls, player):
+        """Returns the bye of a player: a completed match they win, without opponent."""
+        return cls(player1=player, player2=None, completed=True, winner=player)
+
+    @property
+    def is_bye(self):
+        """bool: True for a bye (no opponent)."""
+        return self.player2 is None
     # --- scoring/result ---
 
     def set_result(self, winner_index):
@@ -26,6 +41,7 @@ class Match:
           0 -> player1 wins (+1 point)
           1 -> player2 wins (+1 point)
           2 -> tie (+0.5 each)
+        The points go to the tournament's score table (through on_result), not to the players.
         """
         # Prevent setting result twice
         if getattr(self, "completed", False):
@@ -35,22 +51,21 @@ class Match:
         if winner_index not in (0, 1, 2):
             raise ValueError("Invalid winner_index. Use 0 (p1), 1 (p2), or 2 (tie).")
 
-        # Assign points and track winner
+        # Track the winner: the tournament scores the result (see Tournaments.standings)
         if winner_index == 0:
-            self.player1.points += 1
             self.winner = self.player1
         elif winner_index == 1:
-            self.player2.points += 1
             self.winner = self.player2
-        elif winner_index == 2:
-            self.player1.points += 0.5
-            self.player2.points += 0.5
+        else:
             self.winner = None  # tie
         self.completed = True
 
+        if self.on_result:
+            self.on_result(self)
+
     def serialize(self):
         return {
-            "players": [self.player1.chess_id, self.player2.chess_id],
+            "players": [self.player1.chess_id, None if self.player2 is None else self.player2.chess_id],
             "completed": bool(getattr(self, "completed", False)),
             "winner": None if getattr(self, "winner", None) is None else self.winner.chess_id
         }
@@ -0,0 +1,322 @@
+"""Pairing engines: they pair the players of the next round of a tournament.
+
+Tournaments call pairer.pair(tournament, players) with the players to pair (an even number, sorted
+by standings) and get back the pairs (white, black). player1 of a match has the white pieces.
+The engines read the opponents and colours from tournament.history (see PairingHistory) and the
+score groups from tournament.standings (see Standings). When the tournament has ratings, the players
+are seeded by rating within each score group.
+
+Scheduled systems (round-robin, Scheveningen) do not depend on the results: their whole schedule is
+computed once, and tournaments fetch each round from it (see ScheduledPairer).
+"""
+from abc import ABCMeta, abstractmethod
+from array import array
+from itertools import groupby
+
+from .matching import max_weight_matching
+
+
+class BasePairer(metaclass=ABCMeta):
+    """This is the base class for a pairing engine."""
+
+    @abstractmethod
+    def pair(self, tournament, players):
+        """Returns a list of (white, black) pairs covering the players (sorted by standings)"""
+
+
+class GreedyPairer(BasePairer):
+    """Pairs each player with the next one in the standings who was not met yet.
+
+    If no valid opponent exists (late-round corner case), a rematch is allowed as a last resort.
+    """
+
+    def pair(self, tournament, players):
+        have_played_before = tournament.history.have_played
+        sorted_players = list(players)
+        pairs = []
+
+        current_index = 0
+        while current_index < len(sorted_players):
+            current_player = sorted_players[current_index]
+
+            # Find the first opponent that current_player has not played yet
+            opponent_index = current_index + 1
+            valid_opponent_index = None
+            while opponent_index < len(sorted_players):
+                if not have_played_before(current_player, sorted_players[opponent_index]):
+                    valid_opponent_index = opponent_index
+                    break
+                opponent_index += 1
+
+            # Swap chosen opponent into the immediate next position (if none: fallback to the next player)
+            if valid_opponent_index is not None and valid_opponent_index != current_index + 1:
+                sorted_players[current_index + 1], sorted_players[valid_opponent_index] = (
+                    sorted_players[valid_opponent_index],
+                    sorted_players[current_index + 1],
+                )
+            pairs.append((current_player, sorted_players[current_index + 1]))
+            current_index += 2  # move to the next pair
+
+        return pairs
+
+
+class SwissPairer(BasePairer):
+    """Solves each round as a minimum-cost perfect matching (blossom algorithm).
+
+    The cost of pairing two players adds up:
+    - score_weight * (score difference in half points) ** 2: two small floats are better than a big one
+    - rematch_penalty if they already met
+    - colour_penalty if they are due the same colour (twice as much if both absolutely need it)
+    - the distance between their ranks, so that the players stay close to the standings order
+
+    The first round of a rated tournament (at least one entrant with a rating) is seeded: the top half
+    of the field (by rating) meets the bottom half, #1 against #n/2+1 and so on, with alternating colours.
+
+    Large fields are split into windows of about `window` players, made of whole score groups when
+    possible (see windows), each solved exactly: the matching is O(n^3) in the size of a window. Within a window,
+    only the `candidates` cheapest opponents of each player (and the neighbours in the standings)
+    are considered.
+    """
+
+    def __init__(self, score_weight=1000, rematch_penalty=1000000, colour_penalty=100, window=32, candidates=10):
+        self.score_weight = score_weight
+        self.rematch_penalty = rematch_penalty
+        self.colour_penalty = colour_penalty
+        self.window = window
+        self.candidates = candidates
+
+    @staticmethod
+    def colour_preference(colours):
+        """Returns (preference, absolute): 1 if due white, -1 if due black, 0 without preference"""
+        balance = sum(colours)
+        if len(colours) >= 2 and colours[-1] == colours[-2]:
+            return -colours[-1], True
+        if abs(balance) >= 2:
+            return (-1 if balance > 0 else 1), True
+        if balance:
+            return (-1 if balance > 0 else 1), False
+        if colours:
+            return -colours[-1], False
+        return 0, False
+
+    def cost(self, score_a, score_b, rematch, preference_a, preference_b, rank_distance):
+        """int: The cost of pairing two players (see the class docstring)."""
+        half_points = round(abs(score_a - score_b) * 2)
+        cost = self.score_weight * half_points * half_points + rank_distance
+        if rematch:
+            cost += self.rematch_penalty
+        if preference_a[0] and preference_a[0] == preference_b[0]:
+            cost += self.colour_penalty * (2 if preference_a[1] and preference_b[1] else 1)
+        return cost
+
+    def windows(self, players, standings):
+        """Splits the players (sorted by standings) into windows of an even number of players.
+
+        Whole score groups are added to a window until it holds `window` players; a big score
+        group is cut (at an even size) once the window reaches 1.5 times that size.
+        """
+        windows = []
+        current = []
+        for _, group in groupby(players, key=standings.points):
+            for player in group:
+                current.append(player)
+                if len(current) >= self.window * 3 // 2 and len(current) % 2 == 0:
+                    windows.append(current)
+                    current = []
+            if len(current) >= self.window and len(current) % 2 == 0:
+                windows.append(current)
+                current = []
+        if current:
+            # A small remainder is merged with the previous window, where it has more opponents
+            if windows and len(current) < self.window // 2:
+                windows[-1].extend(current)
+            else:
+                windows.append(current)
+        return windows
+
+    @staticmethod
+    def split(players):
+        """Returns the pairs of the top half of the players against the bottom half (colours alternate)"""
+        half = len(players) // 2
+        return [
+            (top, bottom) if board % 2 == 0 else (bottom, top)
+            for board, (top, bottom) in enumerate(zip(players[:half], players[half:]))
+        ]
+
+    def pair(self, tournament, players):
+        ratings = tournament.ratings
+        if not tournament.rounds and ratings is not None and any(player in ratings for player in players):
+            return self.split(players)
+        history = tournament.history
+        standings = tournament.standings
+        pairs = []
+        for window in self.windows(players, standings):
+            scores = [standings.points(p) for p in window]
+            preferences = [self.colour_preference(history.colours(p)) for p in window]
+            indexes = [history.add_player(p) for p in window]
+            costs = {}
+            for i, player_a in enumerate(window):
+                opponents = history.opponent_bits(player_a)
+                for j in range(i + 1, len(window)):
+                    rematch = opponents >> indexes[j] & 1
+                    costs[i, j] = self.cost(scores[i], scores[j], rematch, preferences[i], preferences[j], j - i)
+
+            mate = self.min_cost_matching(len(window), costs)
+            for i, j in enumerate(mate):
+                if i < j:
+                    pairs.append(self.colours(window[i], window[j], preferences[i], preferences[j]))
+        return pairs
+
+    def min_cost_matching(self, count, costs):
+        """Returns the mate of each player in a minimum-cost perfect matching.
+
+        Minimum cost perfect matching = maximum weight matching of maximum cardinality
+        with weight = (max cost + 1 - cost), doubled so that the dual variables stay integers.
+        The graph first keeps the cheapest edges of each player and the edges between neighbours
+        in the standings (which guarantee that a perfect matching exists). If that sparse graph
+        forces a rematch, the complete graph is solved instead.
+        """
+        highest = max(costs.values())
+        sparse = {(i, i + 1) for i in range(count - 1)}
+        for i in range(count):
+            nearest = sorted((costs[min(i, j), max(i, j)], j) for j in range(count) if j != i)
+            sparse.update((min(i, j), max(i, j)) for _, j in nearest[:self.candidates])
+
+        for pairs in (sparse, costs):
+            edges = [(i, j, 2 * (highest + 1 - costs[i, j])) for i, j in pairs]
+            mate = max_weight_matching(edges, maxcardinality=True)
+            if all(costs[i, j] < self.rematch_penalty for i, j in enumerate(mate) if i < j):
+                break
+        return mate
+
+    @staticmethod
+    def colours(player_a, player_b, preference_a, preference_b):
+        """Returns (white, black): the player (a, the higher ranked) who is most due white gets it"""
+        def strength(preference):
+            return preference[0] * (2 if preference[1] else 1)
+
+        if strength(preference_b) > strength(preference_a):
+            return player_b, player_a
+        return player_a, player_b
+
+
+class ScheduledPairer(BasePairer):
+    """Base class of the systems where every round is known up front.
+
+    The schedule of a field is computed once (schedule_round is O(n) per round) and kept as a flat
+    array of player indexes (in registration order): two entries per board, white then black, and
+    -1 for the missing opponent of a bye. A round is then a slice of the array.
+
+    When the tournament has more rounds than the schedule, the schedule is played again with the
+    colours reversed (e.g. a double round-robin).
+    """
+
+    def __init__(self):
+        # Number of players -> flat schedule (see the class docstring)
+        self._schedules = {}
+
+    @abstractmethod
+    def round_count(self, count):
+        """int: Number of rounds in the schedule of a field of `count` players."""
+
+    @abstractmethod
+    def schedule_round(self, count, round_index):
+        """Returns the (white, black) index pairs of a round (black is -1 for a bye)."""
+
+    def schedule(self, count):
+        """array: The flat schedule of a field of `count` players (computed once)."""
+        if count not in self._schedules:
+            flat = array("i")
+            for round_index in range(self.round_count(count)):
+                for white, black in self.schedule_round(count, round_index):
+                    flat.extend((white, black))
+            self._schedules[count] = flat
+        return self._schedules[count]
+
+    def scheduled_pairs(self, players, round_index):
+        """Returns the (white, black) pairs of a round of the players (in registration order), black None for a bye."""
+        count = len(players)
+        flat = self.schedule(count)
+        rounds = self.round_count(count)
+        size = len(flat) // rounds
+        start = round_index % rounds * size
+        board = flat[start:start + size]
+        pairs = []
+        for white, black in zip(board[::2], board[1::2]):
+            if black < 0:
+                pairs.append((players[white], None))
+            elif round_index // rounds % 2:
+                pairs.append((players[black], players[white]))
+            else:
+                pairs.append((players[white], players[black]))
+        return pairs
+
+    def pair(self, tournament, players):
+        """The games of the next round of the tournament (the schedule ignores the standings)"""
+        pairs = self.scheduled_pairs(tournament.players, len(tournament.rounds))
+        return [(white, black) for white, black in pairs if black is not None]
+
+
+class RoundRobinPairer(ScheduledPairer):
+    """Round-robin following the Berger tables: everyone meets everyone once.
+
+    With an odd number of players, a dummy player is added: their opponent of the round has a bye.
+    In round r, the players i and j (numbered from 0, the last one excluded) meet when
+    i + j = r (mod n - 1); the last player meets the one for whom 2i = r. Colours alternate: no player
+    gets the same colour more than twice in a row.
+    """
+
+    def round_count(self, count):
+        return count - 1 + count % 2
+
+    def schedule_round(self, count, round_index):
+        dummy = count if count % 2 else None
+        size = count + count % 2
+        modulo = size - 1
+        # The player paired with the last one: 2 * middle = round_index (mod size - 1), size - 1 being odd
+        middle = round_index * (modulo + 1) // 2 % modulo
+        last = size - 1
+        pairs = [(middle, last) if round_index % 2 == 0 else (last, middle)]
+        for k in range(1, size // 2):
+            i, j = (middle + k) % modulo, (middle - k) % modulo
+            low, high = min(i, j), max(i, j)
+            pairs.append((low, high) if (low + high) % 2 else (high, low))
+        if dummy is None:
+            return pairs
+        # The opponent of the dummy player has a bye
+        return [
+            (white, black) if dummy not in (white, black) else (black if white == dummy else white, -1)
+            for white, black in pairs
+        ]
+
+
+class ScheveningenPairer(ScheduledPairer):
+    """Scheveningen system: each player of a team meets every player of the other team.
+
+    The first half of the players (in registration order) is the first team, the second half the
+    other team. In round r, board i opposes player i of the first team to player i + r of the other
+    one. Player i of the first team has white against player j of the other team when i + j is even:
+    every player gets as many whites as blacks (one more at most), never three in a row.
+    """
+
+    def round_count(self, count):
+        if count % 2:
+            raise ValueError("A Scheveningen tournament needs two teams of the same size!")
+        return count // 2
+
+    def schedule_round(self, count, round_index):
+        team_size = count // 2
+        pairs = []
+        for board in range(team_size):
+            opponent = (board + round_index) % team_size
+            first, second = board, team_size + opponent
+            pairs.append((first, second) if (board + opponent) % 2 == 0 else (second, first))
+        return pairs
+
+
+# Pairing systems offered on tournament creation
+PAIRING_SYSTEMS = {
+    "swiss": SwissPairer,
+    "round-robin": RoundRobinPairer,
+    "scheveningen": ScheveningenPairer,
+}
@@ -0,0 +1,135 @@
+class PairingHistory:
+    """Opponent history of a tournament: who met whom, and with which colours.
+
+    Each player gets a dense integer index (in order of registration). The opponents of a player
+    are kept as a bitset (an int where bit j is set once the player met the player of index j),
+    so "have these two played?" is a single bit test and "who is still unplayed?" a word-parallel
+    mask operation. The ordered opponents and colours of each player are kept as well (for the
+    reports and tie-breaks), with the round of each game, and the games and byes of each round.
+
+    Players are given as Player instances or chess IDs.
+    """
+
+    def __init__(self, players=(), rounds=()):
+        # chess_id -> dense index, and the reverse list
+        self.index = {}
+        self.chess_ids = []
+        # Per index: bitset of the opponents, ordered opponent indexes, colours (1 white, -1 black) and rounds
+        self._opponent_bits = []
+        self._opponents = []
+        self._colours = []
+        self._rounds = []
+        # Per round: the games as (white index, black index) and the indexes of the players given a bye
+        self._pairs = []
+        self._byes = []
+        # Bitset of every registered player
+        self._everyone = 0
+
+        for player in players:
+            self.add_player(player)
+        for rnd in rounds:
+            self.add_round(rnd.matches)
+
+    def __len__(self):
+        return len(self.chess_ids)
+
+    def add_player(self, player):
+        """Registers a player (if needed) and returns its index."""
+        chess_id = getattr(player, "chess_id", player)
+        if chess_id not in self.index:
+            self.index[chess_id] = len(self.chess_ids)
+            self.chess_ids.append(chess_id)
+            self._opponent_bits.append(0)
+            self._opponents.append([])
+            self._colours.append([])
+            self._rounds.append([])
+            self._everyone |= 1 << self.index[chess_id]
+        return self.index[chess_id]
+
+    @property
+    def round_count(self):
+        """int: The number of rounds recorded."""
+        return len(self._pairs)
+
+    def add_match(self, white, black):
+        """Records a game of the latest round between two players (white is player1 of the match)."""
+        if not self._pairs:
+            self._pairs.append([])
+            self._byes.append([])
+        i = self.add_player(white)
+        j = self.add_player(black)
+        self._pairs[-1].append((i, j))
+        self._rounds[i].append(len(self._pairs) - 1)
+        self._rounds[j].append(len(self._pairs) - 1)
+        self._opponent_bits[i] |= 1 << j
+        self._opponent_bits[j] |= 1 << i
+        self._opponents[i].append(j)
+        self._opponents[j].append(i)
+        self._colours[i].append(1)
+        self._colours[j].append(-1)
+
+    def add_round(self, matches):
+        """Records the matches of a new round (byes have no opponent: they are only listed by round_byes)."""
+        self._pairs.append([])
+        self._byes.append([])
+        for match in matches:
+            if match.player2 is not None:
+                self.add_match(match.player1, match.player2)
+            else:
+                self._byes[-1].append(self.add_player(match.player1))
+
+    def have_played(self, player_a, player_b):
+        """bool: True if the two players already met."""
+        i = self.index.get(getattr(player_a, "chess_id", player_a))
+        j = self.index.get(getattr(player_b, "chess_id", player_b))
+        if i is None or j is None:
+            return False
+        return bool(self._opponent_bits[i] >> j & 1)
+
+    def opponent_bits(self, player):
+        """int: Bitset of the indexes of the opponents met by the player."""
+        return self._opponent_bits[self.index[getattr(player, "chess_id", player)]]
+
+    def unplayed_bits(self, player):
+        """int: Bitset of the indexes of the players the player did not meet yet (themselves excluded)."""
+        i = self.index[getattr(player, "chess_id", player)]
+        return self._everyone & ~self._opponent_bits[i] & ~(1 << i)
+
+    def unplayed(self, player):
+        """list: Chess IDs of the players the player did not meet yet."""
+        return self._chess_ids_of(self.unplayed_bits(player))
+
+    def opponents(self, player):
+        """list: Chess IDs of the opponents of the player, round after round (rematches included)."""
+        return [self.chess_ids[j] for j in self._opponents[self.index[getattr(player, "chess_id", player)]]]
+
+    def colours(self, player):
+        """list: Colours played by the player, round after round (1 for white, -1 for black)."""
+        index = self.index.get(getattr(player, "chess_id", player))
+        return [] if index is None else self._colours[index]
+
+    def games(self, player):
+        """list: (round index, opponent chess ID, colour) of each game of the player, in order."""
+        index = self.index.get(getattr(player, "chess_id", player))
+        if index is None:
+            return []
+        return [
+            (round_index, self.chess_ids[j], colour)
+            for round_index, j, colour in zip(self._rounds[index], self._opponents[index], self._colours[index])
+        ]
+
+    def round_pairs(self, round_index):
+        """list: The games of a round, as (white index, black index)."""
+        return self._pairs[round_index]
+
+    def round_byes(self, round_index):
+        """list: The indexes of the players given a bye in a round."""
+        return self._byes[round_index]
+
+    def _chess_ids_of(self, bits):
+        chess_ids = []
+        while bits:
+            low = bits & -bits
+            chess_ids.append(self.chess_ids[low.bit_length() - 1])
+            bits ^= low
+        return chess_ids
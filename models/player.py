@@ -1,10 +1,24 @@
-from datetime import datetime
+import re
+import sys
+from datetime import date, datetime
 
 
 class Player:
-    """The player class holds all information related to a player"""
+    """The player class holds all information related to a player
+
+    Rosters can hold 100k+ players, so the instances are kept compact: no __dict__ (slots),
+    interned chess IDs and the birthdate stored as an ordinal (its string form is shared
+    between the players born on the same day).
+    """
 
     DATE_FORMAT = "%d-%m-%Y"
+    # The strings DATE_FORMAT accepts (a 4-digit year), parsed without strptime
+    _DATE_PATTERN = re.compile(r"(\d{1,2})-(\d{1,2})-(\d{4})")
+
+    __slots__ = ("name", "email", "_chess_id", "_birth_ordinal")
+
+    # ordinal -> birthday string (DATE_FORMAT), shared by all the instances
+    _birthdays = {}
 
     def __init__(self, name, email, chess_id, birthday):
         if not name:
@@ -14,47 +28,71 @@ class Player:
         self.email = email
         self.chess_id = chess_id
 
-        # The class uses a private attribute for the birthdate (datetime format)
-        self._birthdate = None
-        # And a public one with a getter/setter for the birthday (str)
+        # The birthdate is stored as an ordinal, set from the birthday (str)
         self.birthday = birthday
-        self.points = 0
 
     def __str__(self):
         return f"<{self.name}>"
 
     def __hash__(self):
-        """Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set"""
-        return hash((self.name, self.email, self.chess_id, self.birthdate))
+        """Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set.
+
+        The chess ID identifies a player.
+        """
+        return hash(self._chess_id)
 
     def __eq__(self, other):
         """Required when __hash__ is defined"""
         if type(other) is not type(self):
             raise TypeError("'=' is not supported with type %s" % type(other))
 
-        return (self.name, self.email, self.chess_id, self.birthdate) == (
-            other.name,
-            other.email,
-            other.chess_id,
-            other.birthdate,
-        )
+        return self._chess_id == other._chess_id
+
+    def __reduce__(self):
+        """Pickled from its serialized form: the birthday cache is per process"""
+        return type(self), (self.name, self.email, self._chess_id, self.birthday)
+
+    @property
+    def chess_id(self):
+        return self._chess_id
+
+    @chess_id.setter
+    def chess_id(self, value):
+        """The chess IDs are interned: the index and the tournaments share the same string"""
+        self._chess_id = sys.intern(value)
+
+    @property
+    def birthdate(self):
+        """The birthdate (datetime)"""
+        return datetime.fromordinal(self._birth_ordinal)
+
+    @birthdate.setter
+    def birthdate(self, value):
+        self._birth_ordinal = value.toordinal()
+        if self._birth_ordinal not in self._birthdays:
+            self._birthdays[self._birth_ordinal] = value.strftime(self.DATE_FORMAT)
 
     @property
     def birthday(self):
-        """Property to get the birthday (string) from the birthdate (datetime)"""
-        return self.birthdate.strftime(self.DATE_FORMAT)
+        """Property to get the birthday (string) from the birthdate"""
+        return self._birthdays[self._birth_ordinal]
 
     @birthday.setter
     def birthday(self, value):
-        """Sets the birthdate (datetime) from a string"""
-        self.birthdate = datetime.strptime(value, self.DATE_FORMAT)
+        """Sets the birthdate from a string (DATE_FORMAT)"""
+        match = self._DATE_PATTERN.fullmatch(value) if isinstance(value, str) else None
+        try:
+            birthdate = date(*map(int, reversed(match.groups())))
+        except (AttributeError, ValueError):
+            # Not a valid dd-mm-yyyy date: let strptime raise the usual error (or parse it)
+            birthdate = datetime.strptime(value, self.DATE_FORMAT)
+        self.birthdate = birthdate
 
     def serialize(self):
         """Serialize the instance in a format compatible with JSON"""
 
-        data = {attr: getattr(self, attr) for attr in ("name", "email", "chess_id")}
+        data = {"name": self.name, "email": self.email, "chess_id": self._chess_id}
         # We make sure to use the str representation of the date
         # datetime is not natively serializable in JSON
         data["birthday"] = self.birthday
-        data["points"] = self.points
         return data
@@ -0,0 +1,143 @@
+import unicodedata
+from collections import Counter
+
+
+class PlayerIndex:
+    """Search index over players: chess ID (exact, case-insensitive) and name (prefix, substring, fuzzy).
+
+    Names are normalized (accents removed, case folded, single spaces) and cut into trigrams, each
+    word being padded with two spaces so that its first letters are trigrams as well ("  a", " al").
+    Each trigram maps to the set of the players whose name contains it: a query only verifies the
+    players holding all of its trigrams, and fuzzy matching ranks the players by shared trigrams.
+
+    The index is updated player by player (add refreshes a renamed player, remove drops it).
+    """
+
+    # Minimum share of the trigrams of the query found in a name, for a fuzzy match (a swapped or
+    # wrong letter costs up to three trigrams)
+    FUZZY_THRESHOLD = 0.3
+
+    def __init__(self, players=()):
+        # id(player) -> slot, and per slot: the player (None once removed), normalized name and chess ID
+        self._slots = {}
+        self._players = []
+        self._names = []
+        self._chess_ids = []
+        self._gram_counts = []
+        self._free = []
+        # normalized chess ID -> slots, trigram -> slots
+        self._by_chess_id = {}
+        self._grams = {}
+        for player in players:
+            self.add(player)
+
+    def __len__(self):
+        return len(self._slots)
+
+    @staticmethod
+    def normalize(text):
+        """str: The text without accents, case folded, with single spaces."""
+        decomposed = unicodedata.normalize("NFKD", text)
+        return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+    @staticmethod
+    def trigrams(normalized, padded=True):
+        """set: The trigrams of a normalized text (its words padded with spaces unless padded is False)."""
+        if padded:
+            normalized = "".join(f"  {word}" for word in normalized.split()) + " "
+        return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+    def add(self, player):
+        """Indexes a player (or refreshes the entry of a player whose name or chess ID changed)."""
+        name, chess_id = self.normalize(player.name), player.chess_id.casefold()
+        slot = self._slots.get(id(player))
+        if slot is not None:
+            if self._names[slot] == name and self._chess_ids[slot] == chess_id:
+                return
+            self.remove(player)
+
+        grams = self.trigrams(name)
+        slot = self._free.pop() if self._free else len(self._players)
+        if slot == len(self._players):
+            self._players.append(None)
+            self._names.append(None)
+            self._chess_ids.append(None)
+            self._gram_counts.append(0)
+        self._slots[id(player)] = slot
+        self._players[slot] = player
+        self._names[slot] = name
+        self._chess_ids[slot] = chess_id
+        self._gram_counts[slot] = len(grams)
+        self._by_chess_id.setdefault(chess_id, set()).add(slot)
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(slot)
+
+    def remove(self, player):
+        """Drops a player from the index (if indexed)."""
+        slot = self._slots.pop(id(player), None)
+        if slot is None:
+            return
+        self._discard(self._by_chess_id, self._chess_ids[slot], slot)
+        for gram in self.trigrams(self._names[slot]):
+            self._discard(self._grams, gram, slot)
+        self._players[slot] = self._names[slot] = self._chess_ids[slot] = None
+        self._free.append(slot)
+
+    @staticmethod
+    def _discard(postings, key, slot):
+        slots = postings[key]
+        slots.discard(slot)
+        if not slots:
+            del postings[key]
+
+    def get(self, chess_id):
+        """list: The players with this chess ID (case-insensitive)."""
+        return [self._players[slot] for slot in self._by_chess_id.get(chess_id.strip().casefold(), ())]
+
+    def _candidates(self, query):
+        """Slots of the players whose name may contain the query (all of its trigrams)"""
+        if len(query) < 3:
+            # Word prefixes: "  a" or " al"
+            grams = [("  " + query)[-3:]]
+        else:
+            grams = self.trigrams(query.replace(" ", "  "), padded=False)
+        postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        return set.intersection(*postings) if postings else set()
+
+    def search(self, query, limit=20, exclude=()):
+        """Returns the players matching a query, best first (at most `limit`).
+
+        The exact chess ID comes first, then the names starting with the query, the names with a
+        word starting with it, the names containing it, and finally the names sharing enough
+        trigrams with it (typos). exclude is a collection of chess IDs to leave out.
+        """
+        query = self.normalize(query)
+        if not query:
+            return []
+        excluded = {chess_id.casefold() for chess_id in exclude}
+        scores = {slot: 4.0 for slot in self._by_chess_id.get(query, ())}
+
+        for slot in self._candidates(query):
+            name = self._names[slot]
+            if name.startswith(query):
+                scores[slot] = max(scores.get(slot, 0), 3.0)
+            elif f" {query}" in f" {name}":
+                scores[slot] = max(scores.get(slot, 0), 2.0)
+            elif query in name:
+                scores[slot] = max(scores.get(slot, 0), 1.0)
+
+        matched = sum(self._chess_ids[slot] not in excluded for slot in scores)
+        if matched < limit and len(query) >= 3:
+            grams = self.trigrams(query)
+            shared = Counter(slot for gram in grams for slot in self._grams.get(gram, ()))
+            for slot, common in shared.items():
+                similarity = common / len(grams)
+                if slot not in scores and similarity >= self.FUZZY_THRESHOLD:
+                    # Closer in length ranks first among equally similar names
+                    scores[slot] = similarity - self._gram_counts[slot] / 1000
+
+        ranked = sorted(
+            (slot for slot in scores if self._chess_ids[slot] not in excluded),
+            key=lambda slot: (-scores[slot], self._names[slot], self._chess_ids[slot]),
+        )
+        return [self._players[slot] for slot in ranked[:limit]]
@@ -0,0 +1,174 @@
+from datetime import datetime
+
+import numpy as np
+
+
+class Ratings:
+    """Elo ratings of the players, computed from the games of the completed tournaments.
+
+    The games are applied in chronological batches: one batch per round number of the tournaments
+    ending in the same month (the rating period, as for the monthly rating lists). Within a batch,
+    every expected score is computed from the ratings as they were before the batch, in one
+    vectorized pass over NumPy arrays; the rating changes are then added up per player. A full
+    recomputation replays the whole history this way, and a tournament which completes is applied
+    on its own (see TournamentManager.complete_tournament).
+
+    The K-factor is provisional_k for the first provisional_games games of a player, then k_factor.
+    """
+
+    DATE_FORMAT = "%d-%m-%Y"
+    DEFAULT = 1500.0
+
+    def __init__(self, data=None, k_factor=20, provisional_k=40, provisional_games=30):
+        """Initialize the ratings.
+
+        Args:
+            data (dict): Serialized ratings (see serialize). Defaults to no rated player.
+            k_factor (float): K-factor of the established players.
+            provisional_k (float): K-factor of the players with few games.
+            provisional_games (int): Number of games after which a player is established.
+        """
+        self.k_factor = k_factor
+        self.provisional_k = provisional_k
+        self.provisional_games = provisional_games
+        # Incremented whenever a rating may have changed (the seeded orders cached by the standings check it)
+        self.version = 0
+        self._load(data or {})
+
+    def _load(self, data):
+        players = data.get("players", {})
+        # chess_id -> index in the arrays, and the chess IDs by index
+        self.index = {chess_id: i for i, chess_id in enumerate(players)}
+        self.chess_ids = list(players)
+        self._ratings = np.array([rating for rating, _ in players.values()], dtype=float)
+        self._games = np.array([games for _, games in players.values()], dtype=np.int64)
+        # IDs of the tournaments whose games were applied
+        self.tournaments = set(data.get("tournaments", []))
+        self.version += 1
+
+    def __len__(self):
+        return len(self.chess_ids)
+
+    def __contains__(self, player):
+        return getattr(player, "chess_id", player) in self.index
+
+    def rating(self, player):
+        """float: The rating of a player (given as a Player or a chess ID), DEFAULT if unrated."""
+        i = self.index.get(getattr(player, "chess_id", player))
+        return self.DEFAULT if i is None else float(self._ratings[i])
+
+    def games(self, player):
+        """int: The number of rated games of a player."""
+        i = self.index.get(getattr(player, "chess_id", player))
+        return 0 if i is None else int(self._games[i])
+
+    def serialize(self):
+        """dict: {"players": {chess_id: [rating, games]}, "tournaments": [tournament_id, ...]}"""
+        return {
+            "players": {
+                chess_id: [round(float(rating), 2), int(games)]
+                for chess_id, rating, games in zip(self.chess_ids, self._ratings, self._games)
+            },
+            "tournaments": sorted(self.tournaments),
+        }
+
+    def _local_id(self, chess_id):
+        if chess_id not in self.index:
+            self.index[chess_id] = len(self.chess_ids)
+            self.chess_ids.append(chess_id)
+        return self.index[chess_id]
+
+    @classmethod
+    def end_ordinal(cls, data):
+        """int: The end date of a serialized tournament, as an ordinal (the chronological order)."""
+        return datetime.strptime(data["dates"]["to"], cls.DATE_FORMAT).toordinal()
+
+    @classmethod
+    def period(cls, data):
+        """int: The rating period (month) of a serialized tournament: the month it ends."""
+        end = datetime.strptime(data["dates"]["to"], cls.DATE_FORMAT)
+        return end.year * 12 + end.month - 1
+
+    @staticmethod
+    def tournament_games(data):
+        """Yields (round_index, white, black, score of white) for each completed game of a serialized tournament."""
+        for round_index, rnd in enumerate(data["rounds"]):
+            for match in rnd["matches"] if isinstance(rnd, dict) else rnd:
+                players = match["players"]
+                if not match.get("completed") or len(players) != 2 or None in players:
+                    continue
+                winner = match.get("winner")
+                score = 0.5 if winner is None else (1.0 if winner == players[0] else 0.0)
+                yield round_index, players[0], players[1], score
+
+    def apply_tournaments(self, tournaments):
+        """Applies the games of serialized tournaments, oldest first (those already applied are skipped).
+
+        Returns:
+            set: The chess IDs of the players whose rating changed.
+        """
+        white, black, scores, batches = [], [], [], []
+        applied = []
+        for data in sorted(tournaments, key=self.end_ordinal):
+            if data["tournament_id"] in self.tournaments:
+                continue
+            applied.append(data["tournament_id"])
+            # Round numbers stay below 1000: the batch key orders by period, then by round
+            period = self.period(data) * 1000
+            games = list(self.tournament_games(data))
+            local = {chess_id: self._local_id(chess_id) for chess_id in data["players"]}
+            for _, player1, player2, _ in games:
+                if player1 not in local or player2 not in local:
+                    local.update((chess_id, self._local_id(chess_id)) for chess_id in (player1, player2))
+            white.extend(local[game[1]] for game in games)
+            black.extend(local[game[2]] for game in games)
+            scores.extend(game[3] for game in games)
+            batches.extend(period + game[0] for game in games)
+
+        self.tournaments.update(applied)
+        self.apply_games(
+            np.array(white, dtype=np.int64), np.array(black, dtype=np.int64), np.array(scores), np.array(batches)
+        )
+        return {self.chess_ids[i] for i in set(white) | set(black)}
+
+    def apply_games(self, white, black, scores, batches):
+        """Applies games given as arrays: local IDs of white and black, score of white and batch key.
+
+        The games are applied batch after batch, by increasing key.
+        """
+        missing = len(self.chess_ids) - len(self._ratings)
+        if missing:
+            self._ratings = np.append(self._ratings, np.full(missing, self.DEFAULT))
+            self._games = np.append(self._games, np.zeros(missing, dtype=np.int64))
+        if not len(white):
+            return
+        self.version += 1
+
+        order = np.argsort(batches, kind="stable")
+        white, black, scores, batches = white[order], black[order], scores[order], batches[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(batches)) + 1, [len(batches)]))
+
+        ratings, games = self._ratings, self._games
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            w, b, s = white[start:stop], black[start:stop], scores[start:stop]
+            # Both sides of every game are computed before any rating of the batch changes
+            delta = s - 1 / (1 + 10 ** ((ratings[b] - ratings[w]) / 400))
+            k_white = np.where(games[w] < self.provisional_games, self.provisional_k, self.k_factor)
+            k_black = np.where(games[b] < self.provisional_games, self.provisional_k, self.k_factor)
+            np.add.at(ratings, w, k_white * delta)
+            np.add.at(ratings, b, -k_black * delta)
+            np.add.at(games, w, 1)
+            np.add.at(games, b, 1)
+
+    def recompute(self, tournaments):
+        """Recomputes every rating from scratch, from all the serialized (completed) tournaments.
+
+        Returns:
+            set: The chess IDs of the rated players.
+        """
+        self._load({})
+        return self.apply_tournaments(tournaments)
+
+    def seeded(self, players):
+        """list: The players by rating (highest first), then by name."""
+        return sorted(players, key=lambda p: (-self.rating(p), p.name, p.chess_id))
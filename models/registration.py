@@ -0,0 +1,95 @@
+import csv
+
+
+def read_chess_ids(lines):
+    """Reads chess IDs from a signup export (CSV) or a plain list (one chess ID per line).
+
+    With a header holding a "chess_id" (or "chess id") column, that column is read; otherwise the
+    first cell of each row. Blank lines and lines starting with "#" are skipped.
+
+    Args:
+        lines: An iterable of lines (e.g. an open file).
+
+    Returns:
+        list: The chess IDs, in the order of the file.
+    """
+    column = 0
+    chess_ids = []
+    for number, row in enumerate(csv.reader(line for line in lines if not line.lstrip().startswith("#"))):
+        cells = [cell.strip() for cell in row]
+        if number == 0:
+            names = [cell.lower().replace(" ", "_") for cell in cells]
+            if "chess_id" in names:
+                column = names.index("chess_id")
+                continue
+        if len(cells) > column and cells[column]:
+            chess_ids.append(cells[column])
+    return chess_ids
+
+
+class RegistrationReport:
+    """Outcome of a bulk registration.
+
+    Attributes:
+        registered (list): The players added to the tournament.
+        unknown (list): The chess IDs which are not members of any club.
+        duplicates (list): The chess IDs listed more than once (registered once).
+        already_registered (list): The chess IDs of players who were already registered.
+    """
+
+    def __init__(self):
+        self.registered = []
+        self.unknown = []
+        self.duplicates = []
+        self.already_registered = []
+
+    @property
+    def rejected(self):
+        """int: Number of chess IDs which were not registered."""
+        return len(self.unknown) + len(self.duplicates) + len(self.already_registered)
+
+    def summary(self):
+        """str: One line per category (for the screens and the command line)."""
+        lines = [f"{len(self.registered)} player(s) registered."]
+        for label, chess_ids in (
+            ("Unknown chess IDs", self.unknown),
+            ("Listed more than once", self.duplicates),
+            ("Already registered", self.already_registered),
+        ):
+            if chess_ids:
+                lines.append(f"{label} ({len(chess_ids)}): {', '.join(chess_ids)}")
+        return "\n".join(lines)
+
+
+def register_chess_ids(tournament, club_manager, chess_ids):
+    """Registers players in a tournament from their chess IDs, in a single operation.
+
+    The IDs are resolved in one pass against the chess_id index of the club manager; the
+    unknown, duplicate and already registered IDs are reported and skipped. The players are
+    then added at once (one change persisted, see Tournaments.register_players).
+
+    Returns:
+        RegistrationReport: What was registered or skipped.
+    """
+    report = RegistrationReport()
+    registered = {player.chess_id for player in tournament.players}
+    seen = set()
+    unique = []
+    for chess_id in chess_ids:
+        if chess_id in seen:
+            if chess_id not in report.duplicates:
+                report.duplicates.append(chess_id)
+        elif chess_id in registered:
+            report.already_registered.append(chess_id)
+        else:
+            unique.append(chess_id)
+        seen.add(chess_id)
+
+    for chess_id, player in zip(unique, club_manager.get_players_by_chess_ids(unique)):
+        if player is None:
+            report.unknown.append(chess_id)
+        else:
+            report.registered.append(player)
+
+    tournament.register_players(report.registered)
+    return report
@@ -0,0 +1,97 @@
+import csv
+import json
+
+# Result notations (from White's side) -> winner index of Match.set_result
+RESULTS = {"1-0": 0, "0-1": 1, "1/2-1/2": 2, "1/2": 2, "0.5-0.5": 2, "=": 2, "draw": 2}
+
+
+class ResultImportError(ValueError):
+    """A result file which cannot be applied: errors lists every problem found (one per row)"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid result(s): " + "; ".join(errors))
+        self.errors = errors
+
+
+def read_results(path):
+    """Reads the results of a round from a CSV or JSON file (by extension).
+
+    CSV: one `white,black,result` row per board (chess IDs, then 1-0, 0-1 or 1/2-1/2), with an
+    optional header row. JSON: a list of {"white": ..., "black": ..., "result": ...} objects.
+
+    Returns:
+        list: (white, black, result) tuples, in the order of the file.
+
+    Raises:
+        ResultImportError: If the JSON file is malformed.
+    """
+    with open(path, newline="") as fp:
+        if str(path).lower().endswith(".json"):
+            try:
+                data = json.load(fp)
+            except ValueError as e:
+                raise ResultImportError([f"invalid JSON: {e}"])
+            if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+                raise ResultImportError(['expected a list of {"white", "black", "result"} objects'])
+            return [(row.get("white"), row.get("black"), row.get("result")) for row in data]
+
+        rows = []
+        for row in csv.reader(line for line in fp if not line.lstrip().startswith("#")):
+            cells = [cell.strip() for cell in row] + ["", "", ""]
+            if not any(cells) or (not rows and cells[0].lower() == "white"):
+                continue
+            rows.append(tuple(cells[:3]))
+        return rows
+
+
+def import_results(tournament, rows):
+    """Applies the results of the current round in one pass: all or nothing, persisted once.
+
+    Each row names a board by its chess_id pair (White first) and gives its result. The rows are
+    all checked against the matches of the current round before anything is recorded.
+
+    Args:
+        tournament (Tournaments): The tournament.
+        rows: Iterable of (white chess ID, black chess ID, result) (see read_results and RESULTS).
+
+    Returns:
+        int: The number of results recorded.
+
+    Raises:
+        ResultImportError: If any row is invalid (unknown pair, bye, completed or repeated board,
+            unknown result notation). No result is recorded then.
+    """
+    if not tournament.rounds:
+        raise ResultImportError(["the tournament has no round yet"])
+    round_index = len(tournament.rounds) - 1
+    boards = {}
+    for board, match in enumerate(tournament.rounds[round_index].matches):
+        if not match.is_bye:
+            boards[(match.player1.chess_id, match.player2.chess_id)] = board
+
+    errors = []
+    results = []
+    seen = set()
+    for number, (white, black, result) in enumerate(rows, 1):
+        board = boards.get((white, black))
+        winner_index = RESULTS.get(str(result).strip().lower())
+        if board is None:
+            if (black, white) in boards:
+                problem = "has the colours swapped"
+            else:
+                problem = f"is not paired in round {round_index + 1}"
+            errors.append(f"row {number}: {white} - {black} {problem}")
+        elif board in seen:
+            errors.append(f"row {number}: board {board + 1} is listed twice")
+        elif tournament.rounds[round_index].matches[board].completed:
+            errors.append(f"row {number}: board {board + 1} already has a result")
+        elif winner_index is None:
+            errors.append(f"row {number}: invalid result {result!r} (1-0, 0-1 or 1/2-1/2)")
+        else:
+            seen.add(board)
+            results.append((board, winner_index))
+
+    if errors:
+        raise ResultImportError(errors)
+    tournament.set_results(round_index, results)
+    return len(results)
@@ -17,7 +17,11 @@ class Round:
 
     def is_complete(self):
         """bool: True if all matches are marked completed."""
-        return all(match.completed is not None for match in self.matches)
+        return all(match.completed for match in self.matches)
+
+    def open_boards(self):
+        """list: Board numbers (from 1) of the matches without a result yet."""
+        return [board for board, match in enumerate(self.matches, 1) if not match.completed]
 
     def serialize(self):
         """dict: JSON-serializable representation of the round."""
@@ -0,0 +1,179 @@
+"""Monte Carlo simulation of the outcome of a tournament.
+
+The remaining rounds of a tournament are played out many times: each round is paired by the
+tournament itself (generate_next_round, with its pairing engine) and the results are drawn from
+the ratings of the players. The simulations are split into chunks, each with its own seeded RNG,
+played by a pool of worker processes: the aggregated result only depends on the seed.
+"""
+import os
+import pickle
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .matches import Match
+from .player import Player
+from .ratings import Ratings
+from .round import Round
+from .tournaments import Tournaments
+
+
+class SimulationResult:
+    """Distributions aggregated over the simulations of a tournament.
+
+    Attributes:
+        players (list): The players of the tournament.
+        simulations (int): Number of simulations.
+        positions (numpy.ndarray): positions[i, k] = number of simulations where players[i] finished at rank k + 1.
+        winner_rounds (Counter): round number -> number of simulations where a single player first
+            led after that round (None: still no sole leader after the last round).
+    """
+
+    def __init__(self, players, positions, winner_rounds):
+        self.players = players
+        self.positions = positions
+        self.winner_rounds = winner_rounds
+        self.simulations = int(positions[0].sum()) if len(players) else 0
+
+    def finish_probability(self, top=3):
+        """dict: chess_id -> probability of finishing in the first `top` places."""
+        counts = self.positions[:, :top].sum(axis=1)
+        return {player.chess_id: float(count) / self.simulations for player, count in zip(self.players, counts)}
+
+    def clear_winner_probability(self, rounds):
+        """float: Probability that a single player leads after `rounds` rounds (or earlier)."""
+        decided = sum(count for number, count in self.winner_rounds.items() if number is not None and number <= rounds)
+        return decided / self.simulations
+
+    def expected_rounds(self):
+        """float: Mean number of rounds until a single player leads (None if it never happened)."""
+        decided = [(number, count) for number, count in self.winner_rounds.items() if number is not None]
+        total = sum(count for _, count in decided)
+        return sum(number * count for number, count in decided) / total if total else None
+
+
+def detach(tournament, number_of_rounds=None):
+    """Returns a copy of a tournament which can be played on its own (and pickled).
+
+    The copy has no observer (nothing is saved) and its own rounds and matches. Its ratings only
+    hold the players of the tournament.
+    """
+    data = tournament.serialize()
+    data["number_of_rounds"] = number_of_rounds or tournament.number_of_rounds
+    data.pop("rounds")
+    copy = Tournaments(pairer=tournament.pairer, **data)
+    copy.players = list(tournament.players)
+    copy.rounds = [
+        Round([Match(m.player1, m.player2, completed=m.completed, winner=m.winner) for m in rnd.matches])
+        for rnd in tournament.rounds
+    ]
+    copy.watch_matches()
+    if tournament.ratings is not None:
+        copy.ratings = Ratings({
+            "players": {p.chess_id: [tournament.ratings.rating(p), tournament.ratings.games(p)] for p in copy.players}
+        })
+    return copy
+
+
+def synthetic_tournament(player_count, number_of_rounds, ratings=None):
+    """Returns a tournament of player_count made-up players (e.g. to choose the number of rounds).
+
+    ratings is an optional list of ratings (one per player): unrated players are all equal.
+    """
+    players = [
+        Player(name=f"Player {i + 1}", email="N/A", chess_id=f"SIM{i + 1:05d}", birthday="01-01-2000")
+        for i in range(player_count)
+    ]
+    tournament = Tournaments(
+        "Simulation", "N/A", {"from": "01-01-2000", "to": "01-01-2000"},
+        number_of_rounds=number_of_rounds, players=players,
+    )
+    if ratings is not None:
+        tournament.ratings = Ratings({"players": {p.chess_id: [r, 0] for p, r in zip(players, ratings)}})
+    return tournament
+
+
+def play_result(match, ratings, rng, draw_rate):
+    """Sets a random result, drawn from the expected score of player1 (Elo) and the draw rate."""
+    rating1 = ratings.rating(match.player1) if ratings is not None else Ratings.DEFAULT
+    rating2 = ratings.rating(match.player2) if ratings is not None else Ratings.DEFAULT
+    expected = 1 / (1 + 10 ** ((rating2 - rating1) / 400))
+    # Draws are rarer when the players are far apart: the expected score is kept
+    draw = draw_rate * 2 * min(expected, 1 - expected)
+    roll = rng.random()
+    if roll < expected - draw / 2:
+        match.set_result(0)
+    elif roll < expected + draw / 2:
+        match.set_result(2)
+    else:
+        match.set_result(1)
+
+
+def _sole_leader(tournament):
+    scores = tournament.standings.scores()
+    return bool(scores) and len(tournament.standings.group(scores[0])) == 1
+
+
+def _simulate_chunk(state, count, seed, draw_rate):
+    """Plays `count` simulations of the pickled tournament: returns (positions, winner_rounds)"""
+    rng = random.Random(seed)
+    first = pickle.loads(state)
+    index = {player.chess_id: i for i, player in enumerate(first.players)}
+    positions = np.zeros((len(index), len(index)), dtype=np.int64)
+    winner_rounds = Counter()
+
+    for _ in range(count):
+        tournament = pickle.loads(state)
+        ratings = tournament.ratings
+        decided = None
+        if tournament.rounds:
+            for match in tournament.rounds[-1].matches:
+                if not match.completed:
+                    play_result(match, ratings, rng, draw_rate)
+            if _sole_leader(tournament):
+                decided = len(tournament.rounds)
+        while (rnd := tournament.generate_next_round()) is not None:
+            for match in rnd.matches:
+                if not match.completed:
+                    play_result(match, ratings, rng, draw_rate)
+            if decided is None and _sole_leader(tournament):
+                decided = len(tournament.rounds)
+        winner_rounds[decided] += 1
+        for rank, player in enumerate(tournament.tiebreaks.ranking()):
+            positions[index[player.chess_id], rank] += 1
+    return positions, winner_rounds
+
+
+def simulate(tournament, simulations=10000, workers=None, seed=0, number_of_rounds=None, draw_rate=0.3):
+    """Plays the remaining rounds of a tournament `simulations` times.
+
+    Args:
+        tournament (Tournaments): The tournament (left untouched).
+        simulations (int): Number of simulations.
+        workers (int): Number of worker processes. Defaults to the number of CPUs (1: no pool).
+        seed (int): Seed of the RNGs: the same seed always gives the same result.
+        number_of_rounds (int): Rounds to play in total. Defaults to the tournament's number of rounds.
+        draw_rate (float): Probability of a draw between players of equal strength.
+
+    Returns:
+        SimulationResult: The distributions of the final ranks and of the rounds until a clear winner.
+    """
+    workers = workers or os.cpu_count() or 1
+    state = pickle.dumps(detach(tournament, number_of_rounds))
+    # A few chunks per worker balance the load; each chunk has its own seed, whatever the number of workers
+    chunk_count = min(simulations, 64)
+    sizes = [simulations // chunk_count + (i < simulations % chunk_count) for i in range(chunk_count)]
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(chunk_count)]
+    jobs = [(state, size, chunk_seed, draw_rate) for size, chunk_seed in zip(sizes, seeds)]
+
+    if workers == 1:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*jobs)))
+
+    positions = sum(chunk[0] for chunk in chunks)
+    winner_rounds = sum((chunk[1] for chunk in chunks), Counter())
+    return SimulationResult(list(tournament.players), positions, winner_rounds)
@@ -0,0 +1,125 @@
+from array import array
+from bisect import bisect_left
+
+
+class Standings:
+    """Standings of a tournament: its own score table, kept in score groups.
+
+    The scores belong to the tournament (not to the roster players): an array of half points indexed
+    by a tournament-local player ID, so a player can be scored in several tournaments at once.
+    Each score group is a list of players sorted by name (with the parallel list of their sort keys,
+    which is bisected), so a result only moves two players between groups: the ranking queries
+    (top N, rank of a player, players on a given score) never re-sort the whole field.
+
+    With ratings, the groups are seeded (by rating, then name): the seeded order of a group is
+    sorted on first use and cached until the group or the ratings change.
+    """
+
+    def __init__(self, players=()):
+        # chess_id -> tournament-local player ID, and the score of each ID in half points
+        self.index = {}
+        self._half_points = array("i")
+        # half points -> players on that score, sorted by (name, chess_id), and their keys in the same order
+        self._groups = {}
+        self._keys = {}
+        # half points -> the group seeded by rating, and the (ratings, version) the groups were seeded with
+        self._seeded = {}
+        self._seeded_with = None
+        for player in players:
+            self.add_player(player)
+
+    @staticmethod
+    def _key(player):
+        return player.name, player.chess_id
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, player):
+        return player.chess_id in self.index
+
+    def add_player(self, player, points=0):
+        """Adds a player to the standings (with a starting score)."""
+        if player.chess_id in self.index:
+            return
+        half_points = round(points * 2)
+        self.index[player.chess_id] = len(self._half_points)
+        self._half_points.append(half_points)
+        self._insert(half_points, player)
+
+    def _insert(self, half_points, player):
+        self._seeded.pop(half_points, None)
+        key = self._key(player)
+        keys = self._keys.setdefault(half_points, [])
+        position = bisect_left(keys, key)
+        keys.insert(position, key)
+        self._groups.setdefault(half_points, []).insert(position, player)
+
+    def add_points(self, player, points):
+        """Adds points (a multiple of 0.5) to the score of a player, moving them to their new group."""
+        local_id = self.index[player.chess_id]
+        old = self._half_points[local_id]
+        new = old + round(points * 2)
+        if new == old:
+            return
+        group, keys = self._groups[old], self._keys[old]
+        position = bisect_left(keys, self._key(player))
+        if position == len(group) or group[position].chess_id != player.chess_id:
+            # The player was renamed since they joined the group
+            position = next(i for i, other in enumerate(group) if other.chess_id == player.chess_id)
+        del group[position]
+        del keys[position]
+        self._seeded.pop(old, None)
+        if not group:
+            del self._groups[old]
+            del self._keys[old]
+        self._half_points[local_id] = new
+        self._insert(new, player)
+
+    def points(self, player):
+        """float: The score of a player."""
+        return self._half_points[self.index[player.chess_id]] / 2
+
+    def scores(self):
+        """list: The distinct scores, from the highest."""
+        return [half_points / 2 for half_points in sorted(self._groups, reverse=True)]
+
+    def group(self, points):
+        """list: The players on a given score (e.g. group(3.5)), sorted by name."""
+        return list(self._groups.get(round(points * 2), []))
+
+    def _seeded_group(self, half_points, ratings):
+        """list: A score group seeded by the ratings (cached)."""
+        if self._seeded_with is None or self._seeded_with[0] is not ratings or self._seeded_with[1] != ratings.version:
+            self._seeded.clear()
+            self._seeded_with = (ratings, ratings.version)
+        if half_points not in self._seeded:
+            self._seeded[half_points] = ratings.seeded(self._groups[half_points])
+        return self._seeded[half_points]
+
+    def groups(self, ascending=False, ratings=None):
+        """Yields (score, players) for each score group, from the highest score (the lowest if ascending).
+
+        The players of a group are sorted by name, or seeded by rating if ratings are given.
+        """
+        for half_points in sorted(self._groups, reverse=not ascending):
+            group = self._groups[half_points] if ratings is None else self._seeded_group(half_points, ratings)
+            yield half_points / 2, list(group)
+
+    def sorted_players(self, ratings=None):
+        """list: All the players by score (desc) then name (or rating, if ratings are given)."""
+        return [player for _, group in self.groups(ratings=ratings) for player in group]
+
+    def top(self, count):
+        """list: The first `count` players of the standings."""
+        players = []
+        for half_points in sorted(self._groups, reverse=True):
+            players.extend(self._groups[half_points][:count - len(players)])
+            if len(players) >= count:
+                break
+        return players
+
+    def rank(self, player):
+        """int: Rank of a player (players on the same score share the same rank)."""
+        half_points = self._half_points[self.index[player.chess_id]]
+        return 1 + sum(len(group) for score, group in self._groups.items() if score > half_points)
@@ -0,0 +1,155 @@
+import numpy as np
+
+
+class TieBreaks:
+    """Tie-breaks of a tournament, computed on NumPy arrays.
+
+    The rounds are kept as two matrices (one row per round, one column per tournament-local
+    player ID): the opponent of each player and the points they scored. The local IDs, the games
+    and the byes of each round are the tournament's PairingHistory ones (the matches are only read
+    for their results). A new result only updates two cells; the tie-breaks are then computed for
+    the whole field in one vectorized pass (and cached until the next change):
+
+    - buchholz: sum of the scores of the opponents
+    - median_buchholz: Buchholz without the best and the worst opponent (3 games or more)
+    - sonneborn_berger: sum of the scores of the opponents, weighted by the points scored against them
+    - progressive: sum of the running scores after each round
+    - direct_encounter: points scored against the opponents on the same score
+
+    A bye counts in the score of its player, not in the tie-breaks (no opponent).
+    """
+
+    NAMES = ("buchholz", "median_buchholz", "sonneborn_berger", "progressive", "direct_encounter")
+
+    def __init__(self, history, players=(), rounds=()):
+        """Build the tie-breaks of the rounds recorded by a pairing history.
+
+        Args:
+            history (PairingHistory): The pairing history of the tournament, with these rounds recorded.
+            players: The players of the tournament.
+            rounds: The rounds of the tournament (for their results).
+        """
+        self.history = history
+        # chess_id -> tournament-local player ID (the dense index of the history), and the players by ID
+        self.index = history.index
+        self.players = []
+        # (round, player) matrices: opponent ID (-1 if none), points scored and completed game flag
+        self._opponents = np.full((0, 0), -1, dtype=np.int32)
+        self._points = np.zeros((0, 0))
+        self._completed = np.zeros((0, 0), dtype=bool)
+        # Points scored without a game (byes)
+        self._extra = np.zeros(0)
+        self._cache = None
+
+        for player in players:
+            self.add_player(player)
+        for rnd in rounds:
+            self.add_round(rnd.matches)
+
+    def add_player(self, player):
+        """Registers a player (if needed) and returns their local ID."""
+        local_id = self.history.add_player(player)
+        if local_id == len(self.players):
+            self.players.append(player)
+            self._cache = None
+        return local_id
+
+    def _add_columns(self):
+        """Adds the columns of the players registered since the matrices were last extended"""
+        missing = len(self.players) - self._extra.shape[0]
+        if missing:
+            rows = self._opponents.shape[0]
+            self._opponents = np.hstack([self._opponents, np.full((rows, missing), -1, dtype=np.int32)])
+            self._points = np.hstack([self._points, np.zeros((rows, missing))])
+            self._completed = np.hstack([self._completed, np.zeros((rows, missing), dtype=bool)])
+            self._extra = np.append(self._extra, np.zeros(missing))
+
+    def add_round(self, matches):
+        """Adds the next round recorded by the history (the results of its completed matches included)."""
+        for match in matches:
+            self.add_player(match.player1)
+            if match.player2 is not None:
+                self.add_player(match.player2)
+        self._add_columns()
+        count = len(self.players)
+        self._opponents = np.vstack([self._opponents, np.full((1, count), -1, dtype=np.int32)])
+        self._points = np.vstack([self._points, np.zeros((1, count))])
+        self._completed = np.vstack([self._completed, np.zeros((1, count), dtype=bool)])
+        round_index = self._opponents.shape[0] - 1
+
+        pairs = np.array(self.history.round_pairs(round_index), dtype=np.int32).reshape(-1, 2)
+        self._opponents[round_index, pairs[:, 0]] = pairs[:, 1]
+        self._opponents[round_index, pairs[:, 1]] = pairs[:, 0]
+        np.add.at(self._extra, self.history.round_byes(round_index), 1)
+        for match in matches:
+            if match.completed and match.player2 is not None:
+                self.set_result(round_index, match)
+        self._cache = None
+
+    def set_result(self, round_index, match):
+        """Records the result of a match of a round."""
+        i = self.index[match.player1.chess_id]
+        j = self.index[match.player2.chess_id]
+        if match.winner is None:
+            points = (0.5, 0.5)
+        elif match.winner.chess_id == match.player1.chess_id:
+            points = (1.0, 0.0)
+        else:
+            points = (0.0, 1.0)
+        self._points[round_index, [i, j]] = points
+        self._completed[round_index, [i, j]] = True
+        self._cache = None
+
+    def results(self, player):
+        """list: The points scored by a player in each round (None while not played, or without a game)."""
+        self._add_columns()
+        local_id = self.index[player.chess_id]
+        return [
+            float(points) if completed else None
+            for points, completed in zip(self._points[:, local_id], self._completed[:, local_id])
+        ]
+
+    def compute(self):
+        """dict: name -> array of the tie-break values (indexed by local ID), plus the "score"."""
+        if self._cache is not None:
+            return self._cache
+
+        self._add_columns()
+        completed = self._completed
+        points = np.where(completed, self._points, 0.0)
+        score = points.sum(axis=0) + self._extra
+        opponents = np.clip(self._opponents, 0, None)
+        opponent_scores = np.where(completed, score[opponents], 0.0)
+
+        buchholz = opponent_scores.sum(axis=0)
+        games = completed.sum(axis=0)
+        cut = games >= 3
+        best = np.where(completed, opponent_scores, -np.inf).max(axis=0, initial=-np.inf)
+        worst = np.where(completed, opponent_scores, np.inf).min(axis=0, initial=np.inf)
+        median_buchholz = buchholz - np.where(cut, best, 0.0) - np.where(cut, worst, 0.0)
+        same_score = completed & (score[opponents] == score[np.newaxis, :])
+
+        self._cache = {
+            "score": score,
+            "buchholz": buchholz,
+            "median_buchholz": median_buchholz,
+            "sonneborn_berger": (points * opponent_scores).sum(axis=0),
+            "progressive": np.cumsum(points, axis=0).sum(axis=0),
+            "direct_encounter": np.where(same_score, points, 0.0).sum(axis=0),
+        }
+        return self._cache
+
+    def values(self, player):
+        """dict: The score and the tie-breaks of a player."""
+        local_id = self.index[player.chess_id]
+        return {name: float(values[local_id]) for name, values in self.compute().items()}
+
+    def ranking(self, order=NAMES):
+        """list: The players by score, then by the tie-breaks in the given order, then by name."""
+        values = self.compute()
+        names = np.empty(len(self.players))
+        by_name = sorted(range(len(self.players)), key=lambda i: (self.players[i].name, self.players[i].chess_id))
+        names[by_name] = np.arange(len(self.players))
+        # np.lexsort sorts by the last key first
+        keys = [names] + [-values[name] for name in reversed(order)] + [-values["score"]]
+        return [self.players[i] for i in np.lexsort(keys)]
@@ -1,6 +1,10 @@
-import json
-from pathlib import Path
+from functools import partial
+
+from storage import JsonStorage, new_tournament_id
+from .ratings import Ratings
+from .registration import register_chess_ids
 from .tournaments import Tournaments
+from .tournament_summary import TournamentSummary
 from .player import Player
 from .matches import Match
 from .round import Round  # or whatever the filename/class is
@@ -8,45 +12,120 @@ from .round import Round  # or whatever the filename/class is
 
 class TournamentManager:
     """Manages tournaments, including creation, loading, saving, and completion."""
-    def __init__(self, club_manager, data_folder="data/tournaments"):
+    def __init__(self, club_manager, data_folder="data/tournaments", storage=None):
         """Initialize the manager.
 
         Args:
             club_manager: Club manager instance for player lookups.
-            data_folder (str): Path to store tournament JSON files.
+            data_folder (str): Path to store tournament JSON files (when no storage is provided).
+            storage: Storage backend. Defaults to the JSON files of data_folder.
         """
         self.club_manager = club_manager
-        self.data_folder = Path(data_folder)
-        self.in_progress_file = self.data_folder / "in-progress.json"
-        self.completed_file = self.data_folder / "completed.json"
+        self.storage = storage or JsonStorage(tournaments_folder=data_folder)
 
-        # In-memory lists
+        # In-memory lists (completed tournaments are summaries until opened)
         self.in_progress = []
         self.completed = []
+        # tournament_id -> Tournaments, for the completed tournaments which were opened
+        self._opened = {}
+        # Signature of the tournaments (and tournament_id -> signature of each in-progress one) as last
+        # read or written by us
+        self._signature = None
+        self._tournament_signatures = {}
+        # Optional AutosaveWriter: when set, tournament saves are deferred to it
+        self.autosave = None
+        # Elo ratings of the players (updated when a tournament completes), used by the pairers for seeding
+        self.ratings = None
 
         self._load_tournaments()
 
+    def refresh(self):
+        """Reload the tournaments which changed in the storage since we last read or wrote them.
+
+        Only the changed tournaments are read again, and the ones already in memory are updated in
+        place: the screens holding them keep editing the live object. Tournaments created elsewhere
+        are added; the ones completed or deleted elsewhere leave the in-progress list.
+
+        Returns:
+            int: The number of tournaments reloaded (added ones included).
+        """
+        if self.storage.tournaments_signature() == self._signature:
+            return 0
+        self._signature = self.storage.tournaments_signature()
+
+        signatures = self.storage.tournament_signatures()
+        loaded = {tournament.tournament_id: tournament for tournament in self.in_progress}
+        in_progress = []
+        reloaded = 0
+        for tournament_id, signature in signatures.items():
+            tournament = loaded.get(tournament_id)
+            if tournament is None or self._tournament_signatures.get(tournament_id) != signature:
+                fresh = self._load_single_tournament(self.storage.load_tournament(tournament_id))
+                if tournament is None:
+                    tournament = fresh
+                else:
+                    self._reload_into(tournament, fresh)
+                reloaded += 1
+            in_progress.append(tournament)
+        self.in_progress = in_progress
+        self._tournament_signatures = signatures
+
+        completed = self.storage.completed_summaries()
+        if [summary["tournament_id"] for summary in completed] != [s.tournament_id for s in self.completed]:
+            # A tournament completed elsewhere changed the ratings too
+            self.completed = [TournamentSummary(**summary) for summary in completed]
+            listed = {summary.tournament_id for summary in self.completed}
+            self._opened = {tid: tournament for tid, tournament in self._opened.items() if tid in listed}
+            self.ratings = Ratings(self.storage.load_ratings())
+            for tournament in self.in_progress + list(self._opened.values()):
+                tournament.ratings = self.ratings
+        return reloaded
+
+    @staticmethod
+    def _reload_into(tournament, fresh):
+        """Moves the state of a freshly loaded copy into the tournament object held by the screens"""
+        vars(tournament).update(vars(fresh))
+        tournament.watch_matches()
+
     def _load_tournaments(self):
-        """Load tournaments from JSON files into memory."""
-        if self.in_progress_file.exists():
-            with open(self.in_progress_file, "r") as f:
-                data = json.load(f)
-                self.in_progress = [self._load_single_tournament(t) for t in data]
+        """Load tournaments from the storage into memory."""
+        self._signature = self.storage.tournaments_signature()
+        self._tournament_signatures = self.storage.tournament_signatures()
+        self.ratings = Ratings(self.storage.load_ratings())
+        in_progress, completed = self.storage.load_tournaments()
+        self.in_progress = [self._load_single_tournament(t) for t in in_progress]
+        self.completed = [TournamentSummary(**summary) for summary in completed]
+        if any(summary.tournament_id not in self.ratings.tournaments for summary in self.completed):
+            # Tournaments completed before the ratings existed: replay them all, in chronological order
+            self.recompute_ratings()
 
-        if self.completed_file.exists():
-            with open(self.completed_file, "r") as f:
-                data = json.load(f)
-                self.completed = [self._load_single_tournament(t) for t in data]
+    def open_tournament(self, summary):
+        """Build the full tournament of a completed tournament summary (loaded once, then cached).
+
+        Args:
+            summary (TournamentSummary): Entry of self.completed.
+
+        Returns:
+            Tournaments: The completed tournament.
+        """
+        if summary.tournament_id not in self._opened:
+            data = self.storage.load_tournament(summary.tournament_id)
+            self._opened[summary.tournament_id] = self._load_single_tournament(data)
+        return self._opened[summary.tournament_id]
+
+    def _completed_tournaments(self):
+        """list: The completed tournaments as given to the storage (opened ones as full objects)."""
+        return [self._opened.get(summary.tournament_id, summary) for summary in self.completed]
 
     def _load_single_tournament(self, data):
         """Create a Tournaments object from JSON data."""
         tournament = Tournaments(**data)
 
         # Resolve players (with placeholders)
+        resolved = self.club_manager.get_players_by_chess_ids(tournament.players)
         tournament.players = [
-            self.club_manager.get_player_by_chess_id(cid)
-            or Player(name="Unaffiliated Player", email="N/A", chess_id=cid, birthday="01-01-1900")
-            for cid in tournament.players
+            player or Player(name="Unaffiliated Player", email="N/A", chess_id=cid, birthday="01-01-1900")
+            for cid, player in zip(tournament.players, resolved)
         ]
         id_map = {p.chess_id: p for p in tournament.players}
 
@@ -61,6 +140,9 @@ class TournamentManager:
             for mdata in match_items:
                 id1, id2 = mdata["players"]
                 p1 = id_map[id1]
+                if id2 is None:
+                    matches.append(Match.bye(p1))
+                    continue
                 p2 = id_map[id2]
                 win_player = id_map.get(mdata.get("winner")) if mdata.get("winner") else None
 
@@ -79,18 +161,76 @@ class TournamentManager:
             rounds_obj.append(Round(matches=matches))
 
         tournament.rounds = rounds_obj
+        tournament.ratings = self.ratings
+        # From now on, changes are journaled (the results above are only replayed)
+        tournament.watch_matches()
+        tournament.observer = self
         return tournament
 
+    def _update_signature(self, tournament_id=None):
+        """Called once our writes are durable: they must not trigger a reload.
+
+        tournament_id is the only tournament written (None: any of them).
+        """
+        self._signature = self.storage.tournaments_signature()
+        if tournament_id is None:
+            self._tournament_signatures = self.storage.tournament_signatures()
+        else:
+            self._tournament_signatures[tournament_id] = self.storage.tournament_signature(tournament_id)
+
+    def record_event(self, tournament, event):
+        """Persist a single change of a tournament right away (called by the tournament itself).
+
+        With the JSON storage the change is appended to the tournament's journal, which is
+        folded into the tournament's file when it gets long (or on the next save). With an
+        autosave writer, the tournament's file is also saved once the burst of changes is over.
+        """
+        with self.storage.lock:
+            needs_save = self.storage.record_event(tournament.tournament_id, event)
+            self.storage.on_commit(partial(self._update_signature, tournament.tournament_id))
+
+        if self.autosave and self.storage.DEFERRED_WRITES:
+            self.autosave.schedule(("tournament", tournament.tournament_id), partial(self.save_tournament, tournament))
+        elif needs_save:
+            self.save_tournament(tournament)
+
     def save(self):
-        """Save all tournaments to JSON files."""
-        with open(self.in_progress_file, "w") as f:
-            json.dump([t.serialize() for t in self.in_progress], f, indent=4)
+        """Save the tournaments which changed (this also folds their journals)."""
+        with self.storage.lock:
+            dirty = [t for t in self.in_progress + list(self._opened.values()) if t.dirty]
+            for tournament in dirty:
+                tournament.dirty = False
+            self.storage.save_tournaments(self.in_progress, self._completed_tournaments(), changed=dirty)
+            self.storage.on_commit(self._update_signature)
+
+    def save_tournament(self, tournament):
+        """Save a single tournament (backends with row updates do not rewrite the others)."""
+        with self.storage.lock:
+            tournament.dirty = False
+            self.storage.save_tournaments(self.in_progress, self._completed_tournaments(), changed=[tournament])
+            self.storage.on_commit(partial(self._update_signature, tournament.tournament_id))
+
+    def save_result(self, tournament, match):
+        """Save the result of a single match (a single row update on backends which support it)."""
+        for round_index, rnd in enumerate(tournament.rounds):
+            if match in rnd.matches:
+                match_index = rnd.matches.index(match)
+                break
+        else:
+            raise ValueError("Match not found in tournament!")
+
+        with self.storage.lock:
+            self.storage.save_match(
+                tournament, round_index, match_index, self.in_progress, self._completed_tournaments()
+            )
+            self.storage.on_commit(partial(self._update_signature, tournament.tournament_id))
 
-        with open(self.completed_file, "w") as f:
-            json.dump([t.serialize() for t in self.completed], f, indent=4)
+    def create(self, name, venue, dates, number_of_rounds, pairing_system="swiss"):
+        """Create a new tournament and save it.
 
-    def create(self, name, venue, dates, number_of_rounds):
-        """Create a new tournament and save it."""
+        pairing_system is "swiss" (paired round by round) or a scheduled system: "round-robin" or
+        "scheveningen" (see models.pairing).
+        """
         tournament = Tournaments(
             name=name,
             venue=venue,
@@ -98,14 +238,44 @@ class TournamentManager:
             rounds=[],
             number_of_rounds=number_of_rounds,
             current_round=1,
-            players=[]
+            players=[],
+            tournament_id=new_tournament_id(name),
+            pairing_system=pairing_system,
         )
+        tournament.observer = self
+        tournament.ratings = self.ratings
         self.in_progress.append(tournament)
-        self.save()
+        self.save_tournament(tournament)
         return tournament
 
+    def register_players(self, tournament, chess_ids):
+        """Register players from their chess IDs in a single operation (see models.registration).
+
+        Returns:
+            RegistrationReport: The registered players and the skipped chess IDs.
+        """
+        return register_chess_ids(tournament, self.club_manager, chess_ids)
+
     def complete_tournament(self, tournament):
-        """Mark a tournament as completed and save."""
-        self.in_progress.remove(tournament)
-        self.completed.append(tournament)
-        self.save()
+        """Mark a tournament as completed and save (its games are applied to the ratings in the same batch)."""
+        with self.storage.batch():
+            self.in_progress.remove(tournament)
+            self.completed.append(TournamentSummary.from_tournament(tournament))
+            self._opened[tournament.tournament_id] = tournament
+            tournament.dirty = False
+            self.storage.complete_tournament(tournament, self.in_progress, self._completed_tournaments())
+            changed = self.ratings.apply_tournaments([tournament.serialize()])
+            self.storage.write_ratings(self.ratings.serialize(), changed=changed)
+            self.storage.on_commit(self._update_signature)
+
+    def recompute_ratings(self):
+        """Recompute the ratings from the games of every completed tournament, and save them.
+
+        Returns:
+            int: The number of rated players.
+        """
+        with self.storage.batch():
+            tournaments = (self.storage.load_tournament(summary.tournament_id) for summary in self.completed)
+            rated = self.ratings.recompute(tournaments)
+            self.storage.write_ratings(self.ratings.serialize())
+        return len(rated)
@@ -0,0 +1,42 @@
+from storage import summarize_tournament
+
+
+class TournamentSummary:
+    """Lightweight entry of a completed tournament.
+
+    Completed tournaments are only listed by their summary: the full Tournaments object
+    (players, rounds and matches) is built when the tournament is opened.
+    """
+
+    def __init__(self, tournament_id, name, venue, dates, player_count=0, winner=None, **kwargs):
+        """Initialize a summary.
+
+        Args:
+            tournament_id (str): Stable ID of the tournament in the storage.
+            name (str): Tournament name.
+            venue (str): Tournament venue.
+            dates (dict): Dict with 'from' and 'to' dates (dd-mm-yyyy).
+            player_count (int): Number of registered players.
+            winner (str): Chess ID of the top scorer (None if no result was recorded).
+        """
+        self.tournament_id = tournament_id
+        self.name = name
+        self.venue = venue
+        self.dates = dates
+        self.player_count = player_count
+        self.winner = winner
+
+    @classmethod
+    def from_tournament(cls, tournament):
+        """TournamentSummary: Summary of a loaded tournament."""
+        return cls(**summarize_tournament(tournament.serialize()))
+
+    @property
+    def start_date(self):
+        """str: Start date in dd-mm-yyyy format."""
+        return self.dates['from']
+
+    @property
+    def end_date(self):
+        """str: End date in dd-mm-yyyy format."""
+        return self.dates['to']
@@ -1,5 +1,11 @@
 from datetime import datetime
+from functools import partial
+
 from .matches import Match
+from .pairing import PAIRING_SYSTEMS, ScheduledPairer
+from .pairing_history import PairingHistory
+from .standings import Standings
+from .tiebreaks import TieBreaks
 from .round import Round
 
 
@@ -8,7 +14,8 @@ class Tournaments:
     DATE_FORMAT = "%d-%m-%Y"
 
     def __init__(self, name, venue, dates, number_of_rounds=0,
-                 current_round=0, completed=False, players=None, rounds=None, **kwargs):
+                 current_round=0, completed=False, players=None, rounds=None, tournament_id=None,
+                 pairer=None, pairing_system="swiss", **kwargs):
         """Initialize a tournament.
 
         Args:
@@ -20,7 +27,11 @@ class Tournaments:
             completed (bool): True if tournament finished.
             players (list): List of Player objects or chess IDs.
             rounds (list): List of Round objects.
+            tournament_id (str): Stable ID of the tournament in the storage.
+            pairer (BasePairer): Pairing engine. Defaults to the engine of the pairing system.
+            pairing_system (str): "swiss", "round-robin" or "scheveningen" (see models.pairing.PAIRING_SYSTEMS).
         """
+        self.tournament_id = tournament_id
         self.name = name
         self.venue = venue
         # Validate date formats
@@ -36,6 +47,21 @@ class Tournaments:
         self.completed = completed  # bool
         self.players = players or []  # List of chess IDs
         self.rounds = rounds or []
+        if pairing_system not in PAIRING_SYSTEMS:
+            raise ValueError(f"Unknown pairing system: {pairing_system}")
+        self.pairing_system = pairing_system
+        self.pairer = pairer or PAIRING_SYSTEMS[pairing_system]()
+        # Ratings of the players (see models.ratings), used for seeding: set by the TournamentManager
+        self.ratings = None
+        # Built from the rounds on first use, then kept up to date (see the history and standings properties)
+        self._history = None
+        self._standings = None
+        self._tiebreaks = None
+        self._byes = None
+        # Notified of every change (registration, new round, result): see TournamentManager.record_event
+        self.observer = None
+        # True when the tournament changed since it was last saved
+        self.dirty = False
 
     # === DATE HELPERS ===
     @property
@@ -57,87 +83,213 @@ class Tournaments:
     def serialize(self):
         """dict: JSON-serializable tournament data."""
         return {
+            "tournament_id": self.tournament_id,
             "name": self.name,
             "venue": self.venue,
             "dates": self.dates,  # already {"from":..., "to":...}
             "number_of_rounds": self.number_of_rounds,
             "current_round": self.current_round,
             "completed": self.completed,
+            "pairing_system": self.pairing_system,
             "players": [p.chess_id for p in self.players],  # <-- IDs
             "rounds": [r.serialize() for r in self.rounds]  # <-- list[list[match]]
         }
 
+    @property
+    def history(self):
+        """PairingHistory: Who met whom (and with which colours) in the tournament."""
+        if self._history is None:
+            self._history = PairingHistory(self.players, self.rounds)
+        return self._history
+
+    @property
+    def standings(self):
+        """Standings: The players in score groups, updated as the results are set."""
+        if self._standings is None:
+            self._standings = Standings(self.players)
+            for rnd in self.rounds:
+                for match in rnd.matches:
+                    if match.completed:
+                        self._add_result(match)
+        return self._standings
+
+    @property
+    def tiebreaks(self):
+        """TieBreaks: Buchholz, Sonneborn-Berger... of the players, updated as the results are set."""
+        if self._tiebreaks is None:
+            self._tiebreaks = TieBreaks(self.history, self.players, self.rounds)
+        return self._tiebreaks
+
+    @property
+    def byes(self):
+        """set: Chess IDs of the players who already had a bye."""
+        if self._byes is None:
+            self._byes = {m.player1.chess_id for rnd in self.rounds for m in rnd.matches if m.is_bye}
+        return self._byes
+
+    def _bye_player(self):
+        """Player: The lowest-ranked player who had no bye yet (the lowest-ranked one if all had a bye).
+
+        The score groups are walked from the lowest score: only the bottom of the standings is read.
+        """
+        for _, group in self.standings.groups(ascending=True, ratings=self.ratings):
+            for player in reversed(group):
+                if player.chess_id not in self.byes:
+                    return player
+        _, group = next(self.standings.groups(ascending=True, ratings=self.ratings))
+        return group[-1]
+
+    def _add_result(self, match):
+        if match.winner is None:
+            self._standings.add_points(match.player1, 0.5)
+            self._standings.add_points(match.player2, 0.5)
+        else:
+            self._standings.add_points(match.winner, 1)
+
+    # === CHANGE EVENTS ===
+    def _notify(self, event):
+        self.dirty = True
+        if self.observer:
+            self.observer.record_event(self, event)
+
+    def _score_result(self, round_index, match):
+        if self._standings is not None:
+            self._add_result(match)
+        if self._tiebreaks is not None:
+            self._tiebreaks.set_result(round_index, match)
+
+    def _match_result(self, round_index, board, match):
+        self._score_result(round_index, match)
+        winner = None if match.winner is None else match.winner.chess_id
+        self._notify({"op": "result", "round": round_index, "board": board, "winner": winner})
+
+    def set_results(self, round_index, results):
+        """Records several results of a round at once: all or nothing, a single change persisted.
+
+        Args:
+            round_index (int): Index of the round in self.rounds.
+            results: Iterable of (board, winner_index) pairs: board is the index of the match in the
+                round, winner_index as in Match.set_result (0: player1, 1: player2, 2: tie).
+
+        Raises:
+            ValueError: If a board does not exist, is a bye, is already completed or listed twice, or
+                a winner_index is invalid. No result is recorded then.
+        """
+        matches = self.rounds[round_index].matches
+        results = list(results)
+        boards = set()
+        for board, winner_index in results:
+            if not 0 <= board < len(matches):
+                raise ValueError(f"Board {board + 1} does not exist in round {round_index + 1}")
+            if board in boards:
+                raise ValueError(f"Board {board + 1} is listed twice")
+            if matches[board].is_bye or matches[board].completed:
+                raise ValueError(f"Board {board + 1} is already completed")
+            if winner_index not in (0, 1, 2):
+                raise ValueError(f"Invalid result for board {board + 1}")
+            boards.add(board)
+
+        winners = []
+        for board, winner_index in results:
+            match = matches[board]
+            # The results are journaled together below, not one by one
+            match.on_result = None
+            match.set_result(winner_index)
+            match.on_result = partial(self._match_result, round_index, board)
+            self._score_result(round_index, match)
+            winners.append([board, None if match.winner is None else match.winner.chess_id])
+        if winners:
+            self._notify({"op": "results", "round": round_index, "winners": winners})
+
+    def watch_matches(self, first_round=0):
+        """Makes the matches of every round report their results (call it once the rounds are loaded)."""
+        for round_index in range(first_round, len(self.rounds)):
+            for board, match in enumerate(self.rounds[round_index].matches):
+                match.on_result = partial(self._match_result, round_index, board)
+
+    def register_player(self, player):
+        """Add a player to the tournament."""
+        self.players.append(player)
+        if self._history is not None:
+            self._history.add_player(player)
+        if self._standings is not None:
+            self._standings.add_player(player)
+        if self._tiebreaks is not None:
+            self._tiebreaks.add_player(player)
+        self._notify({"op": "register", "chess_id": player.chess_id})
+
+    def register_players(self, players):
+        """Add several players to the tournament at once (a single change is persisted)."""
+        players = list(players)
+        if not players:
+            return
+        self.players.extend(players)
+        for structure in (self._history, self._standings, self._tiebreaks):
+            if structure is not None:
+                for player in players:
+                    structure.add_player(player)
+        self._notify({"op": "register", "chess_ids": [player.chess_id for player in players]})
+
     def get_sorted_players_by_points(self):
-        """list: Players sorted by points (desc) then name."""
-        return sorted(self.players, key=lambda p: (-p.points, p.name))
+        """list: Players sorted by points (desc) then by rating (when rated, see self.ratings) or name."""
+        return self.standings.sorted_players(self.ratings)
+
+    def _pair_next_round(self):
+        """Returns the matches of the next round, paired by the pairing engine from the standings"""
+        sorted_players = self.get_sorted_players_by_points()
+
+        # Odd number of players: the lowest-ranked player without a bye yet gets one (a match won without opponent)
+        bye = None
+        if len(sorted_players) % 2 == 1:
+            bye = Match.bye(self._bye_player())
+            sorted_players.remove(bye.player1)
+
+        new_matches = [
+            Match(player1=white, player2=black) for white, black in self.pairer.pair(self, sorted_players)
+        ]
+        return new_matches + [bye] if bye is not None else new_matches
 
     def generate_next_round(self):
-        """Generate and add the next round, pairing players by current standings.
+        """Generate and add the next round, paired by the pairing engine (see models.pairing).
 
-        Avoids repeat pairings from previous rounds when possible by scanning ahead
-        and swapping opponents. If no valid opponent exists (late-round corner case),
-        a rematch is allowed as a last resort.
+        The default engine pairs players by current standings, avoiding repeat pairings
+        and colour conflicts when possible. Scheduled systems (round-robin, Scheveningen)
+        read the round from their precomputed schedule.
 
         Returns:
             Round | None: The newly created round, or None if max rounds reached.
         """
-        # Stop if we already reached the maximum number of rounds
+        # Stop if we already reached the maximum number of rounds (finished once the last results are in)
         if self.current_round >= self.number_of_rounds:
-            self.completed = True
+            if not self.completed and (not self.rounds or self.rounds[-1].is_complete()):
+                self.completed = True
+                self._notify({"op": "finished"})
             return None
 
-        sorted_players = self.get_sorted_players_by_points()
-        new_matches = []
-
-        # Build a lookup of all previous pairings as sets of two player IDs
-        previous_pairings = set()
-        for previous_round in self.rounds:
-            for previous_match in previous_round.matches:
-                player_a_id = getattr(previous_match.player1, "chess_id", previous_match.player1)
-                player_b_id = getattr(previous_match.player2, "chess_id", previous_match.player2)
-                previous_pairings.add(frozenset({player_a_id, player_b_id}))
-
-        def have_played_before(player_a, player_b) -> bool:
-            return frozenset({player_a.chess_id, player_b.chess_id}) in previous_pairings
-
-        # Handle bye if odd number of players: give the lowest-ranked a bye (1 point)
-        bye_player = None
-        if len(sorted_players) % 2 == 1:
-            bye_player = sorted_players.pop()  # lowest-ranked after sorting
-            bye_player.points += 1
-
-        # Pair players, avoiding repeats when possible
-        current_index = 0
-        while current_index < len(sorted_players):
-            current_player = sorted_players[current_index]
-
-            # Find the first opponent that current_player has not played yet
-            opponent_index = current_index + 1
-            valid_opponent_index = None
-            while opponent_index < len(sorted_players):
-                potential_opponent = sorted_players[opponent_index]
-                if not have_played_before(current_player, potential_opponent):
-                    valid_opponent_index = opponent_index
-                    break
-                opponent_index += 1
-
-            if valid_opponent_index is None:
-                # No valid opponent found, fallback to immediate next player
-                opponent_player = sorted_players[current_index + 1]
-            else:
-                # Swap chosen opponent into the immediate next position
-                if valid_opponent_index != current_index + 1:
-                    sorted_players[current_index + 1], sorted_players[valid_opponent_index] = (
-                        sorted_players[valid_opponent_index],
-                        sorted_players[current_index + 1],
-                    )
-                opponent_player = sorted_players[current_index + 1]
-
-            new_matches.append(Match(player1=current_player, player2=opponent_player))
-            current_index += 2  # move to the next pair
+        if isinstance(self.pairer, ScheduledPairer):
+            # Every round is known up front: it is read from the schedule, whatever the standings
+            pairs = self.pairer.scheduled_pairs(self.players, len(self.rounds))
+            new_matches = [Match(white, black) if black is not None else Match.bye(white) for white, black in pairs]
+        else:
+            new_matches = self._pair_next_round()
+        for match in new_matches:
+            if match.is_bye:
+                self.byes.add(match.player1.chess_id)
+                if self._standings is not None:
+                    self._add_result(match)
 
         # Create and add the new round
         next_round = Round(matches=new_matches)
         self.rounds.append(next_round)
+        if self._history is not None:
+            self._history.add_round(new_matches)
+        if self._tiebreaks is not None:
+            self._tiebreaks.add_round(new_matches)
         self.current_round = len(self.rounds)
+        self.watch_matches(first_round=len(self.rounds) - 1)
+        self._notify({
+            "op": "round",
+            "round": self.current_round,
+            "pairs": [m.serialize()["players"] for m in new_matches],
+        })
         return next_round
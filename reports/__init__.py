@@ -0,0 +1,42 @@
+import os
+
+from .sections import SECTIONS, Section, report_header, tournament_report
+from .writers import EXTENSIONS, WRITERS, BaseWriter, CsvWriter, HtmlWriter, JsonWriter, TextWriter
+
+
+def format_for(path, default="text"):
+    """str: The output format matching the extension of a file path (default if unknown)."""
+    return EXTENSIONS.get(os.path.splitext(str(path))[1].lower(), default)
+
+
+def write_report(tournament, fp, fmt="text", sections=SECTIONS):
+    """Streams the report of a tournament to a file object.
+
+    Args:
+        tournament (Tournaments): The tournament.
+        fp: The (text) file object to write to, e.g. sys.stdout or open(path, "w", newline="").
+        fmt (str): The output format (a key of WRITERS: text, csv, html or json).
+        sections: The sections to include (see reports.sections.tournament_report).
+    """
+    writer = WRITERS[fmt](fp)
+    writer.begin(report_header(tournament))
+    for section in tournament_report(tournament, sections):
+        writer.section(section)
+    writer.end()
+
+
+__all__ = [
+    "BaseWriter",
+    "CsvWriter",
+    "HtmlWriter",
+    "JsonWriter",
+    "TextWriter",
+    "Section",
+    "EXTENSIONS",
+    "SECTIONS",
+    "WRITERS",
+    "format_for",
+    "report_header",
+    "tournament_report",
+    "write_report",
+]
@@ -0,0 +1,136 @@
+"""The content of a tournament report, as a stream of sections.
+
+Each section has columns and an iterator of rows, produced on demand: the writers (see
+reports.writers) output the rows as they come, so the whole document is never built in memory.
+"""
+
+SECTIONS = ("standings", "crosstable", "rounds")
+
+
+class Section:
+    """A table of the report.
+
+    Attributes:
+        name (str): Machine name ("standings", "crosstable", "round-1"...).
+        title (str): Human-readable title.
+        columns (list): Column headers.
+        widths (list): Column widths, for the plain text output.
+        rows: Iterator of the rows (lists of str, int, float or None), consumed once.
+    """
+
+    def __init__(self, name, title, columns, widths, rows):
+        self.name = name
+        self.title = title
+        self.columns = columns
+        self.widths = widths
+        self.rows = rows
+
+
+def report_header(tournament):
+    """dict: The general information of a tournament."""
+    return {
+        "name": tournament.name,
+        "venue": tournament.venue,
+        "from": tournament.start_date,
+        "to": tournament.end_date,
+        "pairing_system": tournament.pairing_system,
+        "rounds_played": len(tournament.rounds),
+        "number_of_rounds": tournament.number_of_rounds,
+        "players": len(tournament.players),
+        "completed": tournament.completed,
+    }
+
+
+def result_symbol(points):
+    """str: The result of a game from the points a player scored: 1, 0, = (draw) or - (None: not played yet)."""
+    if points is None:
+        return "-"
+    if points == 0.5:
+        return "="
+    return "1" if points else "0"
+
+
+def match_result(match):
+    """str: The result of a match from White's side (1-0, 0-1, 1/2-1/2, or - while not played)."""
+    if not match.completed:
+        return "-"
+    if match.winner is None:
+        return "1/2-1/2"
+    return "1-0" if match.winner.chess_id == match.player1.chess_id else "0-1"
+
+
+def _standings_rows(tournament, ranking):
+    tiebreaks = tournament.tiebreaks
+    for rank, player in enumerate(ranking, 1):
+        values = tiebreaks.values(player)
+        yield [rank, player.chess_id, player.name, values["score"], values["buchholz"],
+               values["median_buchholz"], values["sonneborn_berger"]]
+
+
+def _crosstable_rows(tournament, ranking):
+    """One row per player: a compact cell per round (opponent rank, colour, result), e.g. 12w1.
+
+    The games and colours come from the pairing history, the results from the tie-break matrices.
+    """
+    ranks = {player.chess_id: rank for rank, player in enumerate(ranking, 1)}
+    history = tournament.history
+    tiebreaks = tournament.tiebreaks
+    scores = tiebreaks.compute()["score"]
+    # local ID -> rounds of their byes (a few per round at most)
+    byes = {}
+    for round_index in range(history.round_count):
+        for local_id in history.round_byes(round_index):
+            byes.setdefault(local_id, []).append(round_index)
+
+    for player in ranking:
+        local_id = history.index[player.chess_id]
+        results = tiebreaks.results(player)
+        cells = [""] * history.round_count
+        for round_index in byes.get(local_id, ()):
+            cells[round_index] = "bye"
+        for round_index, opponent, colour in history.games(player):
+            side = "w" if colour == 1 else "b"
+            cells[round_index] = f"{ranks[opponent]}{side}{result_symbol(results[round_index])}"
+        yield [ranks[player.chess_id], player.name, float(scores[local_id])] + cells
+
+
+def _round_rows(rnd):
+    for board, match in enumerate(rnd.matches, 1):
+        if match.is_bye:
+            yield [board, match.player1.name, "bye", "1"]
+        else:
+            yield [board, match.player1.name, match.player2.name, match_result(match)]
+
+
+def tournament_report(tournament, sections=SECTIONS):
+    """Yields the sections of the report of a tournament, in the order of SECTIONS.
+
+    Args:
+        tournament (Tournaments): The tournament.
+        sections: The sections to include: "standings", "crosstable" (one compact cell per round)
+            and "rounds" (the pairings and results, one section per round).
+    """
+    ranking = tournament.tiebreaks.ranking() if {"standings", "crosstable"} & set(sections) else []
+    if "standings" in sections:
+        yield Section(
+            "standings", "Standings",
+            ["Rank", "Chess ID", "Name", "Points", "Buchholz", "Median Buchholz", "Sonneborn-Berger"],
+            [5, 10, 28, 7, 9, 16, 16],
+            _standings_rows(tournament, ranking),
+        )
+    if "crosstable" in sections:
+        rounds = range(1, len(tournament.rounds) + 1)
+        yield Section(
+            "crosstable", "Crosstable",
+            ["Rank", "Name", "Points"] + [f"R{number}" for number in rounds],
+            [5, 28, 7] + [7] * len(rounds),
+            _crosstable_rows(tournament, ranking),
+        )
+    if "rounds" in sections:
+        for number, rnd in enumerate(tournament.rounds, 1):
+            yield Section(
+                f"round-{number}", f"Round {number} of {tournament.number_of_rounds}",
+                ["Board", "White", "Black", "Result"],
+                [6, 28, 28, 8],
+                _round_rows(rnd),
+            )
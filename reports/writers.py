@@ -0,0 +1,118 @@
+"""Output formats of the reports: each writer streams the sections of a report to a file object."""
+import csv
+import html
+import json
+from abc import ABC, abstractmethod
+
+
+def format_value(value):
+    """str: A cell as text (floats without useless decimals, None as an empty cell)."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+class BaseWriter(ABC):
+    """Writes a report to a (text) file object: begin(header), section(section) for each section, end()."""
+
+    def __init__(self, fp):
+        self.fp = fp
+
+    @abstractmethod
+    def begin(self, header):
+        """Writes the start of the report (header: see reports.sections.report_header)"""
+
+    @abstractmethod
+    def section(self, section):
+        """Writes a section, consuming its rows one by one"""
+
+    def end(self):
+        """Writes the end of the report"""
+
+
+class TextWriter(BaseWriter):
+    """Plain text, in fixed-width columns (see Section.widths)"""
+
+    def begin(self, header):
+        self.fp.write(f"{header['name']} ({header['venue']}), {header['from']} to {header['to']}\n")
+        self.fp.write(f"{header['players']} players, round {header['rounds_played']} of "
+                      f"{header['number_of_rounds']} ({header['pairing_system']})\n")
+
+    def section(self, section):
+        widths = section.widths
+        self.fp.write(f"\n{section.title}\n")
+        self.fp.write(self._line(section.columns, widths))
+        self.fp.write(self._line(["-" * (width - 1) for width in widths], widths))
+        for row in section.rows:
+            self.fp.write(self._line(row, widths))
+
+    @staticmethod
+    def _line(cells, widths):
+        return "".join(format_value(cell).ljust(width) for cell, width in zip(cells, widths)).rstrip() + "\n"
+
+
+class CsvWriter(BaseWriter):
+    """CSV: each section is its title, its column headers and its rows, followed by an empty line"""
+
+    def __init__(self, fp):
+        super().__init__(fp)
+        self.writer = csv.writer(fp)
+
+    def begin(self, header):
+        self.writer.writerows([list(header), [format_value(value) for value in header.values()], []])
+
+    def section(self, section):
+        self.writer.writerow([section.title])
+        self.writer.writerow(section.columns)
+        self.writer.writerows([format_value(cell) for cell in row] for row in section.rows)
+        self.writer.writerow([])
+
+
+class HtmlWriter(BaseWriter):
+    """A standalone HTML page, one table per section"""
+
+    def begin(self, header):
+        title = html.escape(header["name"])
+        self.fp.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n</head>\n'
+                      f"<body>\n<h1>{title}</h1>\n")
+        self.fp.write(f"<p>{html.escape(header['venue'])}, {header['from']} to {header['to']}: "
+                      f"{header['players']} players, round {header['rounds_played']} of {header['number_of_rounds']} "
+                      f"({html.escape(header['pairing_system'])})</p>\n")
+
+    def section(self, section):
+        self.fp.write(f'<h2>{html.escape(section.title)}</h2>\n<table id="{section.name}">\n<thead><tr>')
+        self.fp.write("".join(f"<th>{html.escape(column)}</th>" for column in section.columns))
+        self.fp.write("</tr></thead>\n<tbody>\n")
+        for row in section.rows:
+            self.fp.write("<tr>" + "".join(f"<td>{html.escape(format_value(cell))}</td>" for cell in row) + "</tr>\n")
+        self.fp.write("</tbody>\n</table>\n")
+
+    def end(self):
+        self.fp.write("</body>\n</html>\n")
+
+
+class JsonWriter(BaseWriter):
+    """JSON: {"tournament": header, "sections": [{"name", "title", "columns", "rows"}, ...]}, one row per line"""
+
+    def begin(self, header):
+        self.fp.write('{"tournament": ' + json.dumps(header) + ', "sections": [')
+        self.sections = 0
+
+    def section(self, section):
+        meta = {"name": section.name, "title": section.title, "columns": section.columns}
+        self.fp.write(("," if self.sections else "") + "\n" + json.dumps(meta)[:-1] + ', "rows": [')
+        for count, row in enumerate(section.rows):
+            self.fp.write(("," if count else "") + "\n" + json.dumps(row))
+        self.fp.write("\n]}")
+        self.sections += 1
+
+    def end(self):
+        self.fp.write("\n]}\n")
+
+
+# Output format -> writer class
+WRITERS = {"text": TextWriter, "csv": CsvWriter, "html": HtmlWriter, "json": JsonWriter}
+# File extension -> output format
+EXTENSIONS = {".txt": "text", ".csv": "csv", ".html": "html", ".htm": "html", ".json": "json"}
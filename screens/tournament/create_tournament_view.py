@@ -1,10 +1,17 @@
+import math
 from datetime import datetime
 from commands import NoopCmd
+from models.pairing import PAIRING_SYSTEMS
+from models.simulation import simulate, synthetic_tournament
 from screens.base_screen import BaseScreen
 
 
 class CreateTournamentView(BaseScreen):
     """Screen for creating a new tournament."""
+
+    # Simulations of the estimate of the number of rounds
+    SIMULATIONS = 500
+
     def __init__(self, club_manager, tournament_manager):
         """Initialize the view.
 
@@ -41,6 +48,35 @@ class CreateTournamentView(BaseScreen):
             except ValueError:
                 print("❌ Please enter a positive whole number.")
 
+    def _suggest_rounds(self):
+        """Optionally simulate a field of the expected size to help choosing the number of rounds."""
+        count = input("Expected number of players (leave empty to skip the estimate): ").strip()
+        if not count.isdigit() or int(count) < 2:
+            return
+        count = int(count)
+        max_rounds = min(count - 1, math.ceil(math.log2(count)) + 3)
+        print("Simulating....")
+        result = simulate(synthetic_tournament(count, max_rounds), simulations=self.SIMULATIONS)
+
+        print(f"Chances of a single leader ({count} players of equal strength):")
+        for rounds in range(1, max_rounds + 1):
+            print(f"  after {rounds} round(s): {result.clear_winner_probability(rounds):.0%}")
+        expected = result.expected_rounds()
+        if expected is not None:
+            print(f"On average, a single player leads after {expected:.1f} rounds.")
+
+    def _get_pairing_system(self):
+        """Prompt for the pairing system (Swiss by default)."""
+        systems = list(PAIRING_SYSTEMS)
+        print("Pairing systems:")
+        for i, system in enumerate(systems, 1):
+            print(f"{i}. {system}")
+        while True:
+            choice = input("Choose the pairing system [1]: ").strip() or "1"
+            if choice.isdigit() and 1 <= int(choice) <= len(systems):
+                return systems[int(choice) - 1]
+            print(f"❌ Please pick a number between 1 and {len(systems)}.")
+
     def get_command(self):
         """Collect tournament info and create it via the manager."""
         today = datetime.today().date()
@@ -64,13 +100,21 @@ class CreateTournamentView(BaseScreen):
                 print("❌ End date must be on or after the start date. Please try again from the beginning.\n")
                 continue
 
+            pairing_system = self._get_pairing_system()
+            if pairing_system == "swiss":
+                self._suggest_rounds()
+            elif pairing_system == "round-robin":
+                print("A round-robin takes players - 1 rounds (players if odd), twice that for a double round-robin.")
+            else:
+                print("Register the first team, then the second one: a Scheveningen takes one round per team member.")
             number_of_rounds = self._get_positive_int("Enter number of rounds: ")
 
             dates = {"from": start_date_str, "to": end_date_str}
-            self.tm.create(name=name, venue=venue, dates=dates, number_of_rounds=number_of_rounds)
+            self.tm.create(name=name, venue=venue, dates=dates, number_of_rounds=number_of_rounds,
+                           pairing_system=pairing_system)
 
             print(f"✅ Tournament '{name}' created at {venue} ({start_date_str} →"
-                  f" {end_date_str}), {number_of_rounds} rounds.")
+                  f" {end_date_str}), {number_of_rounds} rounds ({pairing_system}).")
             print("To add more info, open the created tournament from the main menu.")
             print("Tournament created, now returning to main menu...")
             return NoopCmd("main-menu", club_manager=self.cm, tournament_manager=self.tm)
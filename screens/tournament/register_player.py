@@ -1,24 +1,35 @@
 from screens.base_screen import BaseScreen
 from commands import NoopCmd
+from models import read_chess_ids
 
 
 class RegisterPlayer(BaseScreen):
-    """Screen for registering players into a tournament."""
+    """Screen for registering players into a tournament.
+
+    The searches go through the search index of the club manager (ranked, typo tolerant), queried
+    on demand: the members are only listed club by club, so opening the screen loads no lazy club.
+    """
+
+    # Maximum number of search results listed
+    RESULTS = 20
+
     def __init__(self, tournament, clubs, club_manager, tournament_manager):
-        """Initialize the screen and list available players."""
+        """Initialize the screen (the players already registered are left out of every listing)."""
         self.tournament = tournament
         self.clubs = clubs
         self.cm = club_manager
         self.tm = tournament_manager
-        self.available_players = []
-        for c in clubs:
-            for p in c.players:
-                if p not in self.tournament.players:
-                    self.available_players.append(p)
+        # Chess IDs of the registered players: a member is available unless their chess ID is in it
+        self.registered = {p.chess_id for p in tournament.players}
 
     def display(self):
-        """Show available players."""
-        self.display_available_players(self.available_players)
+        """Show the registration count and the clubs to pick players from."""
+        members = sum(club.member_count for club in self.clubs)
+        print(f"\n👥 {len(self.registered)} players registered, {members} members in {len(self.clubs)} clubs.")
+
+    def available_players(self, club):
+        """list: The members of a club who are not registered yet (this loads the club if lazy)."""
+        return [player for player in club.players if player.chess_id not in self.registered]
 
     def display_available_players(self, players):
         """List given players with index numbers."""
@@ -50,20 +61,16 @@ class RegisterPlayer(BaseScreen):
                     print("❌ Please enter a valid number or 'q'.")
 
     def register_player(self, player):
-        """Add a player to the tournament and remove from available list."""
-        self.tournament.players.append(player)
-        self.available_players.remove(player)
+        """Add a player to the tournament (which makes them unavailable)."""
+        self.tournament.register_player(player)
+        self.registered.add(player.chess_id)
         print(f"✅ {player.name} has been registered.")
         input("[Enter] to continue...")
 
     def search_by_chessID(self):
         """Find and register a player by Chess ID."""
-        if not self.available_players:
-            print("No available players to search.")
-            input("[Enter] to return...")
-            return
-        chess_id = self.input_string("Enter Chess ID").strip().lower()
-        chess_id_matches = [p for p in self.available_players if p.chess_id.lower() == chess_id]
+        chess_id = self.input_string("Enter Chess ID")
+        chess_id_matches = [p for p in self.cm.search_index.get(chess_id) if p.chess_id not in self.registered]
 
         if not chess_id_matches:
             print("❌ No player found with that Chess ID.")
@@ -77,13 +84,8 @@ class RegisterPlayer(BaseScreen):
 
     def search_by_name(self):
         """Find and register a player by name keyword."""
-        if not self.available_players:
-            print("No available players to search.")
-            input("[Enter] to return...")
-            return
-
-        keyword = self.input_string("Enter player name keyword").strip().lower()
-        name_matches = [p for p in self.available_players if keyword in p.name.lower()]
+        keyword = self.input_string("Enter player name keyword")
+        name_matches = self.cm.search_players(keyword, limit=self.RESULTS, exclude=self.registered)
 
         if not name_matches:
             print("❌ No players matched that name.")
@@ -93,17 +95,60 @@ class RegisterPlayer(BaseScreen):
         print("Name matches found...")
         player = self.choose_player(name_matches)
         if player:
-            self.tournament.players.append(player)
-            self.available_players.remove(player)
-            print(f"✅ {player.name} has been registered.")
-            input("[Enter] to continue...")
+            self.register_player(player)
+
+    def register_chess_ids(self, chess_ids):
+        """Register players from a list of chess IDs at once and show the report."""
+        report = self.tm.register_players(self.tournament, chess_ids)
+        self.registered.update(player.chess_id for player in report.registered)
+        print(report.summary())
+        input("[Enter] to continue...")
+
+    def register_from_file(self):
+        """Register the players listed in a file (signup CSV export or one Chess ID per line)."""
+        path = self.input_string("Path of the file")
+        try:
+            with open(path, newline="") as fp:
+                chess_ids = read_chess_ids(fp)
+        except OSError as e:
+            print(f"❌ Could not read the file: {e}")
+            input("[Enter] to return...")
+            return
+        self.register_chess_ids(chess_ids)
+
+    def choose_club(self):
+        """Prompt to select a club: returns it, or None if the choice is invalid."""
+        for i, club in enumerate(self.clubs, 1):
+            print(f"{i}. {club.name} ({club.member_count} members)")
+        choice = self.input_string("Club number")
+        if not choice.isdigit() or not 1 <= int(choice) <= len(self.clubs):
+            print("❌ Invalid club number.")
+            input("[Enter] to return...")
+            return None
+        return self.clubs[int(choice) - 1]
+
+    def add_from_club(self):
+        """Pick a player among the unregistered members of a club."""
+        club = self.choose_club()
+        if club:
+            player = self.choose_player(self.available_players(club))
+            if player:
+                self.register_player(player)
+
+    def register_club(self):
+        """Register every member of a club."""
+        club = self.choose_club()
+        if club:
+            self.register_chess_ids([p.chess_id for p in club.players])
 
     def get_command(self):
         """Prompt for registration actions and return the next command."""
         while True:
-            print("[1] Add a player")
+            print("[1] Add a player from a club")
             print("[2] Search by ChessID")
             print("[3] Search by player name")
+            print("[4] Register from a file (CSV or Chess ID list)")
+            print("[5] Register a whole club")
             print("[0] To return to previous screen")
 
             choice = self.input_string("Input: ")
@@ -114,13 +159,15 @@ class RegisterPlayer(BaseScreen):
                                club_manager=self.cm,
                                tournament_manager=self.tm)
             elif choice == "1":
-                player = self.choose_player(self.available_players)
-                if player:
-                    self.register_player(player)
+                self.add_from_club()
             elif choice == "2":
                 self.search_by_chessID()
             elif choice == "3":
                 self.search_by_name()
+            elif choice == "4":
+                self.register_from_file()
+            elif choice == "5":
+                self.register_club()
 
             else:
                 print("❌ Invalid input. Please try again.\n")
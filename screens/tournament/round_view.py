@@ -1,13 +1,16 @@
 from screens.base_screen import BaseScreen
 from commands import NoopCmd
+from models import ResultImportError, import_results, read_results
 
 
 class RoundView(BaseScreen):
     """Screen for viewing matches in the current tournament round."""
-    def __init__(self, tournament, clubs):
+    def __init__(self, tournament, clubs, club_manager, tournament_manager):
         """Initialize the round view."""
         self.tournament = tournament
         self.clubs = clubs
+        self.club_manager = club_manager
+        self.tournament_manager = tournament_manager
 
     def display(self):
         """Display all matches in the current round."""
@@ -25,6 +28,9 @@ class RoundView(BaseScreen):
 
         print(f"Round {cr} of {nr}")
         for i, match in enumerate(rounds[cr - 1].matches, 1):
+            if match.is_bye:
+                print(f"{i}. {match.player1.name} - Bye (1 point)")
+                continue
             if match.completed:
                 if match.winner is None:
                     winner_txt = "Tie"
@@ -36,6 +42,28 @@ class RoundView(BaseScreen):
             print(f"{i}. {match.player1.name} vs {match.player2.name} "
                   f"- Completed: {match.completed} - Winner: {winner_txt}")
 
+    def back(self):
+        """Command returning to the tournament screen."""
+        return NoopCmd("tournament-view",
+                       tournament=self.tournament,
+                       clubs=self.clubs,
+                       club_manager=self.club_manager,
+                       tournament_manager=self.tournament_manager)
+
+    def import_results(self):
+        """Record the results of the whole round from a CSV or JSON file (all or nothing)."""
+        path = self.input_string("Path of the results file (CSV: white,black,result / JSON)")
+        try:
+            recorded = import_results(self.tournament, read_results(path))
+        except OSError as e:
+            print(f"❌ Could not read the file: {e}")
+        except ResultImportError as e:
+            print("❌ No result recorded:")
+            for error in e.errors:
+                print(f"  - {error}")
+        else:
+            print(f"✅ {recorded} result(s) recorded.")
+
     def get_command(self):
         """Prompt for match result entry and return the next command."""
         first_loop = True
@@ -45,13 +73,14 @@ class RoundView(BaseScreen):
             # self.display()
             print("_____________________________________________________________________________")
             print("Pick the number of the match you would like to enter results for")
+            print('Enter "i" to import the results of the round from a file')
             print('Enter "b" to go back to tournament screen')
 
             cr_idx = self.tournament.current_round - 1
             rounds = self.tournament.rounds
             if not (0 <= cr_idx < len(rounds)):
                 print("No matches for the current round.")
-                return NoopCmd("tournament-view", tournament=self.tournament)
+                return self.back()
 
             current_round_matches = rounds[cr_idx].matches
 
@@ -59,12 +88,20 @@ class RoundView(BaseScreen):
             try:
                 choice = input("Input: ").strip()
                 if choice.lower() == "b":
-                    return NoopCmd("tournament-view", tournament=self.tournament, clubs=self.clubs)
+                    return self.back()
+                if choice.lower() == "i":
+                    self.import_results()
+                    first_loop = False
+                    continue
 
                 index = int(choice) - 1
                 if 0 <= index < len(current_round_matches):
                     match = current_round_matches[index]
 
+                    if match.is_bye:
+                        print("This is a bye: there is no result to enter.")
+                        first_loop = False
+                        continue
                     if getattr(match, "completed", False):
                         print("This match has already been completed! Please pick one that's not completed yet.")
                         first_loop = False
@@ -1,6 +1,10 @@
 # screens/tournament_view.py
+import sys
+
 from screens.base_screen import BaseScreen
 from commands import NoopCmd, ExitCmd
+from models.simulation import simulate
+from reports import format_for, write_report
 
 
 class TournamentView(BaseScreen):
@@ -17,7 +21,8 @@ class TournamentView(BaseScreen):
         print(f"\n🏆 TOURNAMENT: {self.tournament.name}")
         print(f"📍 Venue: {self.tournament.venue}")
         print(f"📅 Dates: {self.tournament.start_date} to {self.tournament.end_date}")
-        print(f"🔁 Rounds: {self.tournament.current_round}/{self.tournament.number_of_rounds}")
+        print(f"🔁 Rounds: {self.tournament.current_round}/{self.tournament.number_of_rounds}"
+              f" ({self.tournament.pairing_system})")
         # print("Test: " + str(self.tournament.rounds))
         print("\n👥 Players:")
 
@@ -32,34 +37,50 @@ class TournamentView(BaseScreen):
         print("5. Create a new tournament")
         print("6. To view clubs list")
         print("7. To go back to main menu")
+        print("8. Simulate the remaining rounds")
 
     def display(self):
         """Display the tournament view."""
         self.display_tournament()
 
     def generate_tournament_report(self):
-        """Print a tournament summary report."""
+        """Print the tournament report (standings, crosstable, rounds), optionally saved to a file."""
         print("-Begin Report-")
-        print(f"\n🏆 TOURNAMENT: {self.tournament.name}")
-        print(f"📅 Dates: {self.tournament.start_date} to {self.tournament.end_date}")
+        write_report(self.tournament, sys.stdout)
+        print("\n-End Report-")
 
-        print("\n👥 Players (by points):")
-        for i, p in enumerate(self.tournament.get_sorted_players_by_points(), 1):
-            # points could be 0.5 increments
-            pts = int(p.points) if p.points.is_integer() else p.points
-            print(f"  {i}. {p.name} — {pts} pts")
+        path = self.input_string("Save the report to a file (.txt, .csv, .html or .json; empty to skip)")
+        if not path:
+            return
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as fp:
+                write_report(self.tournament, fp, format_for(path))
+        except OSError as e:
+            print(f"❌ Could not write the report: {e}")
+            return
+        print(f"✅ Report saved to {path}")
 
-        print("\n🧭 Rounds & Matches:")
-        for i, rnd in enumerate(self.tournament.rounds, 1):
-            print(f"  Round {i} of {self.tournament.number_of_rounds}")
-            for m in rnd.matches:
-                if getattr(m, "completed", False):
-                    wtxt = "Tie" if getattr(m, "winner", None) is None else m.winner.name
-                else:
-                    wtxt = "—"
-                print(f"    - {m.player1.name} vs {m.player2.name} | Completed: {m.completed} | Winner: {wtxt}")
+    def simulate_outcome(self):
+        """Print the chances of each player to finish in the top 3 (Monte Carlo simulation)."""
+        if len(self.tournament.players) < 2:
+            print("❌ At least two players are needed to simulate the tournament.")
+            return
+        simulations = self.input_string("Number of simulations", default="1000")
+        if not simulations.isdigit() or int(simulations) <= 0:
+            print("❌ Please enter a positive whole number.")
+            return
+        print("Simulating....")
+        result = simulate(self.tournament, simulations=int(simulations))
+        chances = result.finish_probability(top=3)
 
-        print("\n-End Report-")
+        print("\n🎲 Chances to finish in the top 3:")
+        for p in sorted(self.tournament.players, key=lambda p: -chances[p.chess_id]):
+            print(f"  {p.name} — {chances[p.chess_id]:.1%}")
+        expected = result.expected_rounds()
+        if expected is not None:
+            print(f"A single player leads after {expected:.1f} rounds on average "
+                  f"({result.clear_winner_probability(self.tournament.number_of_rounds):.0%} of the simulations"
+                  f" by round {self.tournament.number_of_rounds}).")
 
     def get_command(self):
         """Prompt for user action and return the corresponding command."""
@@ -72,10 +93,30 @@ class TournamentView(BaseScreen):
                                club_manager=self.club_manager,
                                tournament_manager=self.tournament_manager)
             elif value == "2":
-                return NoopCmd("enter-results", tournament=self.tournament, clubs=self.clubs)
+                return NoopCmd("enter-results",
+                               tournament=self.tournament,
+                               clubs=self.clubs,
+                               club_manager=self.club_manager,
+                               tournament_manager=self.tournament_manager)
             elif value == "3":
                 print("Generating new round....")
-                self.tournament.generate_next_round()
+                try:
+                    next_round = self.tournament.generate_next_round()
+                except ValueError as e:
+                    print(f"❌ {e}")
+                    continue
+                if next_round is None:
+                    last_round = self.tournament.rounds[-1] if self.tournament.rounds else None
+                    if last_round is not None and not last_round.is_complete():
+                        boards = ", ".join(map(str, last_round.open_boards()))
+                        print(f"❌ Round {len(self.tournament.rounds)} has unfinished games (boards {boards}). "
+                              "Enter their results first.")
+                        continue
+                    # Every round was played: archive the tournament (and rate its games)
+                    if self.tournament in self.tournament_manager.in_progress:
+                        self.tournament_manager.complete_tournament(self.tournament)
+                    print(f"✅ {self.tournament.name} is completed.")
+                    continue
                 self.display_tournament()
                 print("New round generated!")
                 # return NoopCmd("next-round", tournament=self.tournament)
@@ -95,6 +136,8 @@ class TournamentView(BaseScreen):
                 return NoopCmd("main-menu",
                                club_manager=self.club_manager,
                                tournament_manager=self.tournament_manager)
+            elif value == "8":
+                self.simulate_outcome()
             elif value.upper() == "X":
                 print("X. Exit the program")
                 return ExitCmd()
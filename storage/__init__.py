@@ -0,0 +1,13 @@
+from .autosave import AutosaveWriter
+from .base import BaseStorage, new_tournament_id, summarize_tournament
+from .json_storage import JsonStorage
+from .sqlite_storage import SqliteStorage
+
+__all__ = [
+    "AutosaveWriter",
+    "BaseStorage",
+    "JsonStorage",
+    "SqliteStorage",
+    "new_tournament_id",
+    "summarize_tournament",
+]
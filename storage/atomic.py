@@ -0,0 +1,123 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def fsync_directory(folder):
+    """Makes a rename in the folder durable (not supported, nor needed, on Windows)"""
+    if os.name == "nt":
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_file(path):
+    """Makes the content of a file durable"""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_temp(path, data, sync=True):
+    """Writes the data to a temporary file next to path (same file system) and returns its path"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            if sync:
+                os.fsync(fp.fileno())
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp
+
+
+def atomic_write(path, data):
+    """Replaces the file with the data (bytes): either the old or the new content survives a crash.
+
+    The data is written to a temporary file, fsynced, renamed over the file and the directory is fsynced.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _write_temp(path, data)
+    os.replace(tmp, path)
+    fsync_directory(path.parent)
+
+
+class WriteBatch:
+    """Group commit of file writes: many files made durable together.
+
+    The writes and removals are kept in memory (read() and exists() see them) until commit(),
+    which writes every temporary file, then fsyncs each of them (the kernel writes them back
+    together, and each fsync only waits for the batch's own data), renames them over their
+    targets, fsyncs each directory once and finally applies the removals and the callbacks.
+    Each file is still replaced atomically; a crash before the renames leaves all of them unchanged.
+    """
+
+    def __init__(self):
+        self._files = {}
+        self._removed = set()
+        self._callbacks = []
+
+    def __len__(self):
+        return len(self._files) + len(self._removed)
+
+    def write(self, path, data):
+        path = Path(path)
+        self._removed.discard(path)
+        self._files[path] = data
+
+    def remove(self, path):
+        path = Path(path)
+        self._files.pop(path, None)
+        self._removed.add(path)
+
+    def read(self, path):
+        """Returns the pending content of a file, or None if the batch does not change it"""
+        path = Path(path)
+        if path in self._removed:
+            raise FileNotFoundError(path)
+        return self._files.get(path)
+
+    def exists(self, path):
+        path = Path(path)
+        if path in self._removed:
+            return False
+        return path in self._files or path.exists()
+
+    def on_commit(self, callback):
+        """Calls the callback once the batch is durable (e.g. to drop a journal folded into a file)"""
+        self._callbacks.append(callback)
+
+    def commit(self):
+        temps = []
+        try:
+            for path, data in self._files.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temps.append((_write_temp(path, data, sync=False), path))
+            # Every file is durable before the first rename
+            for tmp, _ in temps:
+                fsync_file(tmp)
+        except BaseException:
+            for tmp, _ in temps:
+                os.unlink(tmp)
+            raise
+
+        for tmp, path in temps:
+            os.replace(tmp, path)
+        for path in self._removed:
+            path.unlink(missing_ok=True)
+        for folder in {path.parent for path in list(self._files) + list(self._removed)}:
+            fsync_directory(folder)
+
+        for callback in self._callbacks:
+            callback()
+        self._files.clear()
+        self._removed.clear()
+        self._callbacks.clear()
@@ -0,0 +1,103 @@
+import threading
+import time
+from contextlib import nullcontext
+
+
+class AutosaveWriter(threading.Thread):
+    """Background thread writing the dirty models.
+
+    Each save is identified by a key (one per file: a club, a tournament...). Scheduling a key
+    which is already pending only pushes its deadline back, so a burst of changes results in a
+    single save, issued once the key has been quiet for `delay` seconds (or after `max_delay`).
+
+    With a batch context manager (e.g. JsonStorage.batch), the saves which are due together
+    are group-committed: their files are fsynced together, with one directory fsync per folder.
+    """
+
+    def __init__(self, delay=1.0, max_delay=5.0, batch=None):
+        super().__init__(name="autosave", daemon=True)
+        self.delay = delay
+        self.max_delay = max_delay
+        self.batch = batch
+        self._pending = {}  # key -> [deadline, first request time, save callable]
+        self._condition = threading.Condition()
+        # Held while saves are issued: flush() waits for the saves in progress
+        self._writing = threading.Lock()
+        self._stopping = False
+        # Counters
+        self.requested = 0
+        self.issued = 0
+        self.failed = 0
+
+    @property
+    def coalesced(self):
+        """Number of save requests merged into another save"""
+        return self.requested - self.issued - self.failed - len(self._pending)
+
+    def schedule(self, key, save):
+        """Requests a save: save() will be called by the writer thread"""
+        with self._condition:
+            now = time.monotonic()
+            self.requested += 1
+            if key in self._pending:
+                entry = self._pending[key]
+                entry[0] = min(now + self.delay, entry[1] + self.max_delay)
+                entry[2] = save
+            else:
+                self._pending[key] = [now + self.delay, now, save]
+            self._condition.notify()
+
+    def _pop(self, due_only=True):
+        """Removes and returns the saves which are due (all of them if due_only is False)"""
+        now = time.monotonic()
+        keys = [key for key, entry in self._pending.items() if not due_only or entry[0] <= now]
+        return [self._pending.pop(key)[2] for key in keys]
+
+    def _issue(self, saves):
+        if not saves:
+            return
+        try:
+            with self.batch() if self.batch else nullcontext():
+                for save in saves:
+                    save()
+            self.issued += len(saves)
+        except Exception as exc:  # the thread must survive a failed save
+            self.failed += len(saves)
+            print("Autosave failed:", exc)
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    if self._pending:
+                        timeout = min(entry[0] for entry in self._pending.values()) - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._condition.wait(timeout)
+                    else:
+                        self._condition.wait()
+                if self._stopping:
+                    return
+            with self._writing:
+                with self._condition:
+                    saves = self._pop()
+                self._issue(saves)
+
+    def flush(self):
+        """Issues every pending save now, in the calling thread"""
+        with self._writing:
+            with self._condition:
+                saves = self._pop(due_only=False)
+            self._issue(saves)
+
+    def stop(self):
+        """Flushes the pending saves and stops the thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+        self.flush()
+
+    def __str__(self):
+        return f"<Autosave: {self.issued} saves issued, {self.coalesced} coalesced, {self.failed} failed>"
@@ -0,0 +1,190 @@
+import re
+import threading
+import uuid
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+
+
+def new_tournament_id(name):
+    """Returns a stable, unique tournament ID: a slug of the name and a random suffix"""
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")[:40]
+    return f"{slug or 'tournament'}-{uuid.uuid4().hex[:6]}"
+
+
+def summarize_tournament(data):
+    """Returns the summary of a serialized tournament, as listed for the completed tournaments:
+    tournament_id, name, venue, dates, player_count and winner (chess_id of the top scorer, or None)
+    """
+    points = {}
+    for rnd in data["rounds"]:
+        for match in rnd["matches"] if isinstance(rnd, dict) else rnd:
+            if not match.get("completed"):
+                continue
+            if match.get("winner") is None:
+                for chess_id in match["players"]:
+                    points[chess_id] = points.get(chess_id, 0) + 0.5
+            else:
+                points[match["winner"]] = points.get(match["winner"], 0) + 1
+
+    return {
+        "tournament_id": data["tournament_id"],
+        "name": data["name"],
+        "venue": data["venue"],
+        "dates": data["dates"],
+        "player_count": len(data["players"]),
+        "winner": max(points, key=points.get) if points else None,
+    }
+
+
+class BaseStorage(metaclass=ABCMeta):
+    """This is the base class for a storage backend.
+
+    Backends read and write plain dicts (the serialized form of the models):
+    - a club is identified by a key (a file path, a row ID...) and holds a name and player dicts
+    - a tournament dict is the output of Tournaments.serialize(), identified by its "tournament_id"
+
+    The save_* methods take model instances and serialize them before calling the write_* methods.
+    """
+
+    # Whether saves may be deferred to the autosave writer thread
+    DEFERRED_WRITES = True
+
+    def __init__(self):
+        # Held while writing: the autosave writer thread saves concurrently with the application
+        self.lock = threading.RLock()
+
+    # === CLUBS ===
+    @abstractmethod
+    def list_clubs(self, lazy=False):
+        """Returns one header dict per club: key, name, members, ids (member chess_ids) and signature.
+
+        Unless lazy is True, the headers also hold the player dicts ("players").
+        """
+
+    @abstractmethod
+    def load_club(self, key):
+        """Returns the club data: {"name": ..., "players": [...]}"""
+
+    @abstractmethod
+    def create_club(self, name):
+        """Allocates a key for a new club (the club is written by write_club)"""
+
+    @abstractmethod
+    def write_club(self, key, name, players):
+        """Writes a whole club"""
+
+    @abstractmethod
+    def club_signatures(self):
+        """Returns {key: signature} for every club: a signature changes whenever the club is written"""
+
+    def club_signature(self, key):
+        return self.club_signatures().get(key)
+
+    # === TOURNAMENTS ===
+    @abstractmethod
+    def load_tournaments(self):
+        """Returns (in_progress, completed): the in-progress tournament dicts and the summaries of the
+        completed ones (see summarize_tournament), which are loaded with load_tournament when needed
+        """
+
+    @abstractmethod
+    def load_tournament(self, tournament_id):
+        """Returns a tournament dict"""
+
+    @abstractmethod
+    def write_tournaments(self, in_progress, completed, changed=None):
+        """Writes the tournaments.
+
+        changed is the set of tournament IDs which were modified (None means all of them): the other
+        tournaments are only {"tournament_id": ...} dicts, given for their order and status.
+        """
+
+    def record_event(self, tournament_id, event):
+        """Persists a single change of a tournament (see storage.journal.apply_event for the events).
+
+        Returns True when the caller should save (compact) the tournaments. Backends which can
+        neither journal nor update single rows always ask for a save.
+        """
+        return True
+
+    @abstractmethod
+    def tournaments_signature(self):
+        """Returns a value which changes whenever the tournaments are written"""
+
+    @abstractmethod
+    def tournament_signatures(self):
+        """Returns {tournament_id: signature} for the in-progress tournaments (in their order): a
+        signature changes whenever the tournament is written
+        """
+
+    def tournament_signature(self, tournament_id):
+        return self.tournament_signatures().get(tournament_id)
+
+    @abstractmethod
+    def completed_summaries(self):
+        """Returns the summaries of the completed tournaments (see summarize_tournament)"""
+
+    # === RATINGS ===
+    @abstractmethod
+    def load_ratings(self):
+        """Returns the ratings: {"players": {chess_id: [rating, games]}, "tournaments": [tournament_id, ...]}"""
+
+    @abstractmethod
+    def write_ratings(self, data, changed=None):
+        """Writes the ratings (see load_ratings).
+
+        changed is the set of chess IDs whose rating changed (None means all of them).
+        """
+
+    def close(self):
+        """Releases the resources held by the backend"""
+
+    @contextmanager
+    def batch(self):
+        """Groups the writes of the block: backends with group commit make them durable together"""
+        with self.lock:
+            yield
+
+    def on_commit(self, callback):
+        """Calls the callback once the pending writes are durable (right away outside of a batch)"""
+        callback()
+
+    # === MODEL HELPERS ===
+    # Backends able to update single rows override save_player and save_match.
+    def save_club(self, club):
+        with self.lock:
+            self.write_club(club.key, club.name, [p.serialize() for p in club.players])
+
+    def save_player(self, club, player, old_chess_id=None):
+        """Saves a new or updated player (the default implementation rewrites the club)"""
+        self.save_club(club)
+
+    def save_tournaments(self, in_progress, completed, changed=None):
+        """Saves the changed tournaments (all of them if changed is None).
+
+        Only the changed tournaments are serialized: the others (including the summaries of the
+        completed tournaments which were not loaded) are passed as {"tournament_id": ...} so the
+        backend can keep track of their order and status.
+        """
+        if changed is None:
+            self.write_tournaments([t.serialize() for t in in_progress], [t.serialize() for t in completed])
+            return
+
+        changed_ids = {t.tournament_id for t in changed}
+
+        def serialize(tournament):
+            if tournament.tournament_id in changed_ids:
+                return tournament.serialize()
+            return {"tournament_id": tournament.tournament_id}
+
+        self.write_tournaments(
+            [serialize(t) for t in in_progress], [serialize(t) for t in completed], changed=changed_ids
+        )
+
+    def complete_tournament(self, tournament, in_progress, completed):
+        """Saves a tournament which moved to the completed list (the default implementation rewrites it)"""
+        self.save_tournaments(in_progress, completed, changed=[tournament])
+
+    def save_match(self, tournament, round_index, match_index, in_progress, completed):
+        """Saves a single match result (the default implementation rewrites the tournaments)"""
+        self.save_tournaments(in_progress, completed, changed=[tournament])
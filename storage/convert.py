@@ -0,0 +1,63 @@
+"""
+One-shot conversion between the JSON data folder and a SQLite database.
+
+    python -m storage.convert import --data data --db data/chess.db
+    python -m storage.convert export --db data/chess.db --data exported
+"""
+import argparse
+from pathlib import Path
+
+from .json_storage import JsonStorage
+from .sqlite_storage import SqliteStorage
+
+
+def copy_storage(source, target):
+    """Copies every club and tournament, and the ratings, from source to target (which must be empty).
+
+    Returns the number of clubs and tournaments copied.
+    """
+    if target.list_clubs(lazy=True) or any(target.load_tournaments()):
+        raise RuntimeError("The target storage is not empty!")
+
+    clubs = source.list_clubs()
+    for header in clubs:
+        key = target.create_club(header["name"])
+        target.write_club(key, header["name"], header["players"])
+
+    in_progress, summaries = source.load_tournaments()
+    completed = [source.load_tournament(summary["tournament_id"]) for summary in summaries]
+    with target.batch():
+        target.write_tournaments(in_progress, completed)
+        # The ratings include the list of the tournaments already rated
+        target.write_ratings(source.load_ratings())
+    return len(clubs), len(in_progress) + len(completed)
+
+
+def json_storage(data_folder):
+    data_folder = Path(data_folder)
+    for folder in ("clubs", "tournaments"):
+        (data_folder / folder).mkdir(parents=True, exist_ok=True)
+    return JsonStorage(clubs_folder=data_folder / "clubs", tournaments_folder=data_folder / "tournaments")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the data between the JSON files and SQLite.")
+    parser.add_argument(
+        "direction", choices=("import", "export"), help="import: JSON to SQLite, export: SQLite to JSON"
+    )
+    parser.add_argument("--data", default="data", help="JSON data folder (with clubs/ and tournaments/)")
+    parser.add_argument("--db", default="data/chess.db", help="SQLite database file")
+    args = parser.parse_args()
+
+    json_data = json_storage(args.data)
+    database = SqliteStorage(args.db)
+    if args.direction == "import":
+        clubs, tournaments = copy_storage(json_data, database)
+    else:
+        clubs, tournaments = copy_storage(database, json_data)
+    database.close()
+    print(f"{clubs} club(s) and {tournaments} tournament(s) copied.")
+
+
+if __name__ == "__main__":
+    main()
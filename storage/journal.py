@@ -0,0 +1,105 @@
+import json
+import os
+from pathlib import Path
+
+
+def apply_event(data, event):
+    """Applies a journal event to a serialized tournament (dict).
+
+    Events are idempotent, so replaying a journal already folded into the snapshot
+    (e.g. after a crash during compaction) does not change the tournament.
+    """
+    op = event["op"]
+    if op == "result":
+        match = data["rounds"][event["round"]]["matches"][event["board"]]
+        match["completed"] = True
+        match["winner"] = event["winner"]
+    elif op == "results":
+        # Bulk result import: [board, winner] pairs of one round
+        matches = data["rounds"][event["round"]]["matches"]
+        for board, winner in event["winners"]:
+            matches[board]["completed"] = True
+            matches[board]["winner"] = winner
+    elif op == "register":
+        # A single player (chess_id) or a bulk registration (chess_ids)
+        registered = set(data["players"])
+        for chess_id in event.get("chess_ids", [event.get("chess_id")]):
+            if chess_id not in registered:
+                registered.add(chess_id)
+                data["players"].append(chess_id)
+    elif op == "round":
+        if len(data["rounds"]) == event["round"] - 1:
+            # A pair without second player is a bye: won by its player
+            data["rounds"].append({
+                "matches": [
+                    {"players": pair, "completed": pair[1] is None, "winner": pair[0] if pair[1] is None else None}
+                    for pair in event["pairs"]
+                ]
+            })
+            data["current_round"] = event["round"]
+    elif op == "finished":
+        data["completed"] = True
+    else:
+        raise ValueError(f"Unknown journal event: {op}")
+    return data
+
+
+class Journal:
+    """Append-only journal of tournament changes: one JSON-lines file per tournament.
+
+    Appending a record costs O(1) I/O (one line, flushed and fsynced) whatever the size of the tournament.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self._lengths = {}
+
+    def path(self, tournament_id):
+        return self.folder / f"{tournament_id}.jsonl"
+
+    def append(self, tournament_id, event):
+        """Appends an event and returns the number of records in the journal"""
+        if tournament_id not in self._lengths:
+            # First append in this process: a record torn by a crash must not prefix the new one
+            self.read(tournament_id)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.path(tournament_id), "a") as fp:
+            fp.write(json.dumps(event, separators=(",", ":")) + "\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+        self._lengths[tournament_id] = self._lengths.get(tournament_id, 0) + 1
+        return self._lengths[tournament_id]
+
+    def read(self, tournament_id):
+        """Returns the events of a tournament.
+
+        A record torn by a crash (unterminated or unreadable line) ends the journal: the file is
+        truncated back to the last complete record, so that the next appends are replayed.
+        """
+        events = []
+        complete = size = 0
+        try:
+            with open(self.path(tournament_id), "rb") as fp:
+                for line in fp:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        break
+                    complete += len(line)
+                size = fp.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            pass
+        if size > complete:
+            with open(self.path(tournament_id), "r+b") as fp:
+                fp.truncate(complete)
+                fp.flush()
+                os.fsync(fp.fileno())
+        self._lengths[tournament_id] = len(events)
+        return events
+
+    def clear(self, tournament_id):
+        """Removes a tournament's journal (once its events are folded into the snapshot)"""
+        self.path(tournament_id).unlink(missing_ok=True)
+        self._lengths[tournament_id] = 0
@@ -0,0 +1,358 @@
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+
+from .atomic import WriteBatch, atomic_write
+from .base import BaseStorage, new_tournament_id, summarize_tournament
+from .journal import Journal, apply_event
+
+
+class JsonStorage(BaseStorage):
+    """Storage backend using the JSON files of the data folder.
+
+    - one file per club in the clubs folder (the key of a club is its file path)
+    - one file (shard) per tournament in the tournaments folder: in-progress/<tournament_id>.json
+      or, once archived, completed/<tournament_id>.json.gz, listed (in order) by index.json
+      (which also holds the summary of each completed tournament)
+    - a journal per tournament (tournaments/journal/<tournament_id>.jsonl): changes are appended
+      there and replayed on load, until the tournament's shard is written again
+
+    The ratings of the players (and the completed tournaments they include) are kept in
+    tournaments/ratings.json.
+
+    The former layout (in-progress.json and completed.json arrays) is migrated on first load.
+
+    A small catalog file (one header per club) lets list_clubs(lazy=True) skip parsing
+    the club files which did not change (same mtime and size) since the catalog was written.
+
+    Every file is replaced atomically (see storage.atomic). Inside a batch() block the writes
+    are group-committed: they are all made durable before any of them replaces its file.
+    """
+
+    CATALOG_NAME = ".catalog"
+    STATUSES = ("in-progress", "completed")
+    # Number of journal records of a tournament after which a new snapshot is advised
+    COMPACT_EVERY = 200
+
+    def __init__(self, clubs_folder="data/clubs", tournaments_folder="data/tournaments"):
+        super().__init__()
+        self.clubs_folder = Path(clubs_folder)
+        self.tournaments_folder = Path(tournaments_folder)
+        self.catalog_path = self.clubs_folder / self.CATALOG_NAME
+        self.index_file = self.tournaments_folder / "index.json"
+        self.legacy_files = (
+            self.tournaments_folder / "in-progress.json",
+            self.tournaments_folder / "completed.json",
+        )
+        self.journal = Journal(self.tournaments_folder / "journal")
+        self.ratings_file = self.tournaments_folder / "ratings.json"
+        self._batch = None
+
+    # === FILES ===
+    @contextmanager
+    def batch(self):
+        """Group commit: the files written in the block are made durable together when it exits"""
+        with self.lock:
+            if self._batch is not None:
+                yield
+                return
+            self._batch = WriteBatch()
+            try:
+                yield
+                self._batch.commit()
+            finally:
+                self._batch = None
+
+    def on_commit(self, callback):
+        if self._batch is not None:
+            self._batch.on_commit(callback)
+        else:
+            callback()
+
+    def _read_file(self, path):
+        data = self._batch.read(path) if self._batch is not None else None
+        if data is None:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        return gzip.decompress(data) if path.suffix == ".gz" else data
+
+    def _write_file(self, path, data):
+        if path.suffix == ".gz":
+            data = gzip.compress(data, mtime=0)
+        if self._batch is not None:
+            self._batch.write(path, data)
+        else:
+            atomic_write(path, data)
+
+    def _remove_file(self, path):
+        if self._batch is not None:
+            self._batch.remove(path)
+        else:
+            path.unlink(missing_ok=True)
+
+    def _exists(self, path):
+        return self._batch.exists(path) if self._batch is not None else path.exists()
+
+    def _read_json(self, path):
+        return json.loads(self._read_file(path))
+
+    def _write_json(self, path, data, **kwargs):
+        self._write_file(path, json.dumps(data, **kwargs).encode())
+
+    # === CLUBS ===
+    @staticmethod
+    def _signature(path):
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _club_files(self):
+        return [
+            filepath for filepath in self.clubs_folder.iterdir()
+            if filepath.is_file() and filepath.suffix == ".json"
+        ]
+
+    def _read_catalog(self):
+        try:
+            return self._read_json(self.catalog_path).get("clubs", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _write_catalog(self, entries):
+        self._write_json(self.catalog_path, {"clubs": entries}, separators=(",", ":"))
+
+    def list_clubs(self, lazy=False):
+        """Reads the catalog and reparses only the new or modified club files (all of them unless lazy)"""
+        catalog = self._read_catalog()
+        entries = {}
+        headers = []
+
+        for filepath in self._club_files():
+            signature = self._signature(filepath)
+            entry = catalog.get(filepath.name)
+            header = {"key": filepath, "signature": signature}
+            if lazy and entry and (entry["mtime"], entry["size"]) == signature:
+                header.update(name=entry["name"], members=entry["members"], ids=entry["ids"])
+            else:
+                try:
+                    data = self.load_club(filepath)
+                except json.JSONDecodeError:
+                    print(filepath, "is invalid JSON file.")
+                    continue
+                header.update(
+                    name=data["name"],
+                    members=len(data["players"]),
+                    ids=[p["chess_id"] for p in data["players"]],
+                    players=data["players"],
+                )
+                entry = {
+                    "name": header["name"],
+                    "members": header["members"],
+                    "mtime": signature[0],
+                    "size": signature[1],
+                    "ids": header["ids"],
+                }
+            entries[filepath.name] = entry
+            headers.append(header)
+
+        if entries != catalog:
+            self._write_catalog(entries)
+        return headers
+
+    def load_club(self, key):
+        return self._read_json(Path(key))
+
+    def create_club(self, name):
+        return self.clubs_folder / (name.replace(" ", "") + ".json")
+
+    def write_club(self, key, name, players):
+        self._write_json(Path(key), {"name": name, "players": players})
+
+    def club_signatures(self):
+        return {filepath: self._signature(filepath) for filepath in self._club_files()}
+
+    def club_signature(self, key):
+        return self._signature(Path(key))
+
+    # === TOURNAMENTS ===
+    def _shard(self, tournament_id, status):
+        """In-progress tournaments are plain JSON, completed ones are archived as gzipped JSON"""
+        suffix = ".json.gz" if status == "completed" else ".json"
+        return self.tournaments_folder / status / f"{tournament_id}{suffix}"
+
+    def _read_shard(self, tournament_id, status):
+        data = self._read_json(self._shard(tournament_id, status))
+        for event in self.journal.read(tournament_id):
+            apply_event(data, event)
+        return data
+
+    def _write_shard(self, data, status):
+        """Writes a tournament's shard (which folds its journal) and returns its index entry"""
+        shard = self._shard(data["tournament_id"], status)
+        if status == "completed":
+            self._write_json(shard, data, separators=(",", ":"))
+        else:
+            self._write_json(shard, data, indent=4)
+        # The journal is dropped once the shard is durable
+        self.on_commit(partial(self.journal.clear, data["tournament_id"]))
+        return self._index_entry(data, status)
+
+    def _read_index(self):
+        """Returns the index: {"in-progress": [entry, ...], "completed": [summary, ...]}"""
+        if not self._exists(self.index_file):
+            if any(path.exists() for path in self.legacy_files):
+                self.migrate_legacy_tournaments()
+            else:
+                return {status: [] for status in self.STATUSES}
+        index = self._read_json(self.index_file)
+
+        # Completed tournaments stored before the archive format: compress them and list their summary
+        plain = [entry for entry in index["completed"] if "player_count" not in entry]
+        if plain:
+            with self.batch():
+                for entry in plain:
+                    path = self._shard(entry["tournament_id"], "completed").with_suffix("")
+                    entry.update(self._write_shard(self._read_json(path), "completed"))
+                    self._remove_file(path)
+                self._write_index(index)
+        return index
+
+    @staticmethod
+    def _index_entry(data, status):
+        if status == "completed":
+            return summarize_tournament(data)
+        return {"tournament_id": data["tournament_id"], "name": data["name"]}
+
+    def _write_index(self, index):
+        self._write_json(self.index_file, index, indent=4)
+
+    def load_tournament(self, tournament_id):
+        """Reads a single tournament shard (in progress or archived) and replays its journal"""
+        status = "in-progress" if self._exists(self._shard(tournament_id, "in-progress")) else "completed"
+        return self._read_shard(tournament_id, status)
+
+    def load_tournaments(self):
+        """Reads the in-progress shards: the completed tournaments are only listed by the index"""
+        index = self._read_index()
+        in_progress = [self._read_shard(entry["tournament_id"], "in-progress") for entry in index["in-progress"]]
+        return in_progress, index["completed"]
+
+    def write_tournaments(self, in_progress, completed, changed=None):
+        """Writes the shards of the changed tournaments (all of them if changed is None) and the index"""
+        with self.batch():
+            old_index = self._read_index()
+            index = {}
+            for status, tournaments in zip(self.STATUSES, (in_progress, completed)):
+                index[status] = []
+                for data in tournaments:
+                    tid = data["tournament_id"]
+                    if changed is None or tid in changed:
+                        index[status].append(self._write_shard(data, status))
+                    elif self._find_entry(old_index, tid) in old_index[status]:
+                        index[status].append(self._find_entry(old_index, tid))
+                    else:
+                        # The tournament changed status without being rewritten: move its shard
+                        index[status].append(self._write_shard(self.load_tournament(tid), status))
+                        self._remove_file(self._shard(tid, self._other(status)))
+
+            # Remove the shards of the tournaments which were deleted
+            listed = {entry["tournament_id"] for status in self.STATUSES for entry in index[status]}
+            for status in self.STATUSES:
+                for entry in old_index[status]:
+                    if entry["tournament_id"] not in listed:
+                        self._remove_file(self._shard(entry["tournament_id"], status))
+
+            if index != old_index:
+                self._write_index(index)
+
+    def _other(self, status):
+        return self.STATUSES[1 - self.STATUSES.index(status)]
+
+    @staticmethod
+    def _find_entry(index, tournament_id):
+        for status in index:
+            for entry in index[status]:
+                if entry["tournament_id"] == tournament_id:
+                    return entry
+        raise KeyError(f"Tournament {tournament_id} is not in the index!")
+
+    def complete_tournament(self, tournament, in_progress, completed):
+        """Archives the tournament: compressed shard in the completed folder and summary in the index"""
+        with self.batch():
+            index = self._read_index()
+            index["in-progress"].remove(self._find_entry(index, tournament.tournament_id))
+            index["completed"].append(self._write_shard(tournament.serialize(), "completed"))
+            self._remove_file(self._shard(tournament.tournament_id, "in-progress"))
+            self._write_index(index)
+
+    def record_event(self, tournament_id, event):
+        """Appends the event to the tournament's journal: asks for a snapshot once the journal is long"""
+        return self.journal.append(tournament_id, event) >= self.COMPACT_EVERY
+
+    def tournaments_signature(self):
+        paths = [self.index_file]
+        for status in self.STATUSES:
+            paths.extend((self.tournaments_folder / status).glob("*.json*"))
+        return frozenset((str(path), self._signature(path)) for path in paths if path.exists())
+
+    def tournament_signatures(self):
+        return {
+            entry["tournament_id"]: self.tournament_signature(entry["tournament_id"])
+            for entry in self._read_index()["in-progress"]
+        }
+
+    def tournament_signature(self, tournament_id):
+        """The shard and the journal of the tournament: a journaled change does not touch the shard"""
+        paths = (self._shard(tournament_id, "in-progress"), self.journal.path(tournament_id))
+        return tuple(self._signature(path) if path.exists() else None for path in paths)
+
+    def completed_summaries(self):
+        return self._read_index()["completed"]
+
+    # === RATINGS ===
+    def load_ratings(self):
+        if not self._exists(self.ratings_file):
+            return {"players": {}, "tournaments": []}
+        return self._read_json(self.ratings_file)
+
+    def write_ratings(self, data, changed=None):
+        """Rewrites the ratings file (it holds a single small entry per player)"""
+        self._write_json(self.ratings_file, data, separators=(",", ":"))
+
+    def migrate_legacy_tournaments(self, keep_backup=True):
+        """Converts in-progress.json and completed.json (one array each) to one shard per tournament.
+
+        Returns the number of tournaments migrated. The legacy files are renamed to *.bak (or removed).
+        """
+        lists = []
+        for path in self.legacy_files:
+            data = []
+            if path.exists():
+                with open(path) as f:
+                    data = json.load(f)
+            for tournament in data:
+                if not tournament.get("tournament_id"):
+                    tournament["tournament_id"] = new_tournament_id(tournament["name"])
+                for event in self.journal.read(tournament["tournament_id"]):
+                    apply_event(tournament, event)
+            lists.append(data)
+
+        def retire_legacy_files():
+            for path in self.legacy_files:
+                if path.exists():
+                    if keep_backup:
+                        os.replace(path, path.with_suffix(".json.bak"))
+                    else:
+                        path.unlink()
+
+        with self.batch():
+            index = {status: [] for status in self.STATUSES}
+            for status, tournaments in zip(self.STATUSES, lists):
+                for data in tournaments:
+                    index[status].append(self._write_shard(data, status))
+            self._write_index(index)
+            # The legacy files are kept until the shards and the index are durable
+            self.on_commit(retire_legacy_files)
+        return sum(len(tournaments) for tournaments in lists)
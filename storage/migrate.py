@@ -0,0 +1,27 @@
+"""
+Converts the former tournament layout (in-progress.json and completed.json, one array each)
+to one file per tournament plus an index.
+
+    python -m storage.migrate --tournaments data/tournaments
+"""
+import argparse
+
+from .json_storage import JsonStorage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard the tournament files (one file per tournament).")
+    parser.add_argument("--tournaments", default="data/tournaments", help="tournaments folder")
+    parser.add_argument("--no-backup", action="store_true", help="delete the former files instead of *.bak")
+    args = parser.parse_args()
+
+    storage = JsonStorage(tournaments_folder=args.tournaments)
+    if storage.index_file.exists():
+        print(f"{storage.index_file} already exists: nothing to migrate.")
+        return
+    count = storage.migrate_legacy_tournaments(keep_backup=not args.no_backup)
+    print(f"{count} tournament(s) migrated to {args.tournaments}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+import json
+import sqlite3
+from itertools import groupby
+
+from .base import BaseStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    club_id INTEGER NOT NULL REFERENCES clubs (id) ON DELETE CASCADE,
+    chess_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT,
+    birthday TEXT NOT NULL,
+    UNIQUE (club_id, chess_id)
+);
+CREATE INDEX IF NOT EXISTS players_chess_id ON players (chess_id);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    venue TEXT,
+    date_from TEXT NOT NULL,
+    date_to TEXT NOT NULL,
+    number_of_rounds INTEGER,
+    current_round INTEGER,
+    completed INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS registrations (
+    tournament_id TEXT NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chess_id TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, position)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_id TEXT NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    PRIMARY KEY (tournament_id, number)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    board INTEGER NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT,
+    completed INTEGER NOT NULL,
+    winner TEXT,
+    extra TEXT,
+    PRIMARY KEY (tournament_id, round, board),
+    FOREIGN KEY (tournament_id, round) REFERENCES rounds (tournament_id, number) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    chess_id TEXT PRIMARY KEY,
+    rating REAL NOT NULL,
+    games INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rated_tournaments (
+    tournament_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+TOURNAMENT_COLUMNS = ("name", "venue", "number_of_rounds", "current_round", "completed")
+MATCH_KEYS = ("players", "completed", "winner")
+
+
+def _extra(data, known):
+    """JSON text holding the keys which have no dedicated column (None if there are none)"""
+    extra = {key: value for key, value in data.items() if key not in known}
+    return json.dumps(extra) if extra else None
+
+
+class SqliteStorage(BaseStorage):
+    """Storage backend using a SQLite database (WAL mode).
+
+    Players, clubs, tournaments, rounds and matches each have their own table, so
+    updating a player or a match result writes a single row instead of a whole file.
+    """
+
+    # Row updates are cheap and immediate (and the connection belongs to the main thread)
+    DEFERRED_WRITES = False
+
+    def __init__(self, path="data/chess.db"):
+        super().__init__()
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _bump(self, key):
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES (?, 1) ON CONFLICT (key) DO UPDATE SET value = value + 1",
+            (key,),
+        )
+
+    def _bump_tournament(self, tournament_id):
+        """A write to a tournament changes both its own version and the version of all the tournaments"""
+        self._bump(f"tournament:{tournament_id}")
+        self._bump("tournaments")
+
+    # === CLUBS ===
+    def _players_by_club(self, columns):
+        rows = self.connection.execute(f"SELECT club_id, {columns} FROM players ORDER BY club_id, id")
+        return {club_id: [row[1:] for row in group] for club_id, group in groupby(rows, key=lambda r: r[0])}
+
+    def list_clubs(self, lazy=False):
+        clubs = self.connection.execute("SELECT id, name, version FROM clubs ORDER BY id").fetchall()
+        if lazy:
+            members = {
+                club_id: [{"chess_id": row[0]} for row in rows]
+                for club_id, rows in self._players_by_club("chess_id").items()
+            }
+        else:
+            members = {
+                club_id: [dict(zip(("chess_id", "name", "email", "birthday"), row)) for row in rows]
+                for club_id, rows in self._players_by_club("chess_id, name, email, birthday").items()
+            }
+
+        headers = []
+        for club_id, name, version in clubs:
+            players = members.get(club_id, [])
+            header = {
+                "key": club_id,
+                "name": name,
+                "signature": version,
+                "members": len(players),
+                "ids": [p["chess_id"] for p in players],
+            }
+            if not lazy:
+                header["players"] = players
+            headers.append(header)
+        return headers
+
+    def load_club(self, key):
+        (name,) = self.connection.execute("SELECT name FROM clubs WHERE id = ?", (key,)).fetchone()
+        rows = self.connection.execute(
+            "SELECT chess_id, name, email, birthday FROM players WHERE club_id = ? ORDER BY id", (key,)
+        )
+        return {
+            "name": name,
+            "players": [dict(zip(("chess_id", "name", "email", "birthday"), row)) for row in rows],
+        }
+
+    def create_club(self, name):
+        with self.connection:
+            return self.connection.execute("INSERT INTO clubs (name) VALUES (?)", (name,)).lastrowid
+
+    def write_club(self, key, name, players):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO clubs (id, name) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name, version = version + 1",
+                (key, name),
+            )
+            self.connection.execute("DELETE FROM players WHERE club_id = ?", (key,))
+            self.connection.executemany(
+                "INSERT INTO players (club_id, chess_id, name, email, birthday) VALUES (?, ?, ?, ?, ?)",
+                [(key, p["chess_id"], p["name"], p["email"], p["birthday"]) for p in players],
+            )
+
+    def save_player(self, club, player, old_chess_id=None):
+        """Updates (or inserts) the player's row only"""
+        data = player.serialize()
+        values = (data["chess_id"], data["name"], data["email"], data["birthday"])
+        with self.connection:
+            updated = self.connection.execute(
+                "UPDATE players SET chess_id = ?, name = ?, email = ?, birthday = ? "
+                "WHERE club_id = ? AND chess_id = ?",
+                values + (club.key, old_chess_id or data["chess_id"]),
+            ).rowcount
+            if not updated:
+                self.connection.execute(
+                    "INSERT INTO players (chess_id, name, email, birthday, club_id) VALUES (?, ?, ?, ?, ?)",
+                    values + (club.key,),
+                )
+            self.connection.execute("UPDATE clubs SET version = version + 1 WHERE id = ?", (club.key,))
+
+    def club_signatures(self):
+        return dict(self.connection.execute("SELECT id, version FROM clubs"))
+
+    def club_signature(self, key):
+        row = self.connection.execute("SELECT version FROM clubs WHERE id = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # === TOURNAMENTS ===
+    def _grouped(self, query, params=()):
+        rows = self.connection.execute(query, params)
+        return {key: [row[1:] for row in group] for key, group in groupby(rows, key=lambda r: r[0])}
+
+    def _load(self, condition, params=()):
+        """Returns the tournament dicts matching a condition on the tournaments table"""
+        selected = f"SELECT id FROM tournaments WHERE {condition}"
+        registrations = self._grouped(
+            f"SELECT tournament_id, chess_id FROM registrations WHERE tournament_id IN ({selected}) "
+            "ORDER BY tournament_id, position",
+            params,
+        )
+        rounds = self._grouped(
+            f"SELECT tournament_id, number FROM rounds WHERE tournament_id IN ({selected}) "
+            "ORDER BY tournament_id, number",
+            params,
+        )
+        matches = self._grouped(
+            "SELECT tournament_id, round, player1, player2, completed, winner, extra FROM matches "
+            f"WHERE tournament_id IN ({selected}) ORDER BY tournament_id, round, board",
+            params,
+        )
+
+        tournaments = []
+        rows = self.connection.execute(
+            "SELECT id, name, venue, date_from, date_to, number_of_rounds, current_round, completed, extra "
+            f"FROM tournaments WHERE {condition} ORDER BY position",
+            params,
+        )
+        for tid, name, venue, date_from, date_to, number_of_rounds, current_round, completed, extra in rows:
+            round_matches = {number: [] for (number,) in rounds.get(tid, [])}
+            for number, player1, player2, match_completed, winner, match_extra in matches.get(tid, []):
+                match = {"players": [player1, player2], "completed": bool(match_completed), "winner": winner}
+                match.update(json.loads(match_extra) if match_extra else {})
+                round_matches[number].append(match)
+
+            tournament = {
+                "tournament_id": tid,
+                "name": name,
+                "venue": venue,
+                "dates": {"from": date_from, "to": date_to},
+                "number_of_rounds": number_of_rounds,
+                "current_round": current_round,
+                "completed": bool(completed),
+                "players": [chess_id for (chess_id,) in registrations.get(tid, [])],
+                "rounds": [{"matches": round_matches[number]} for number in sorted(round_matches)],
+            }
+            tournament.update(json.loads(extra) if extra else {})
+            tournaments.append(tournament)
+        return tournaments
+
+    def completed_summaries(self):
+        """Summaries of the completed tournaments, computed by SQLite without loading the tournaments"""
+        completed = "SELECT id FROM tournaments WHERE status = 'completed'"
+        player_counts = dict(self.connection.execute(
+            f"SELECT tournament_id, COUNT(*) FROM registrations WHERE tournament_id IN ({completed}) "
+            "GROUP BY tournament_id"
+        ))
+        scores = self._grouped(
+            "SELECT tournament_id, chess_id, SUM(points) AS total FROM ("
+            "  SELECT tournament_id, winner AS chess_id, 1.0 AS points FROM matches "
+            "  WHERE completed AND winner IS NOT NULL"
+            "  UNION ALL SELECT tournament_id, player1, 0.5 FROM matches WHERE completed AND winner IS NULL"
+            "  UNION ALL SELECT tournament_id, player2, 0.5 FROM matches WHERE completed AND winner IS NULL"
+            f") WHERE tournament_id IN ({completed}) AND chess_id IS NOT NULL "
+            "GROUP BY tournament_id, chess_id ORDER BY tournament_id, total DESC"
+        )
+        rows = self.connection.execute(
+            "SELECT id, name, venue, date_from, date_to FROM tournaments WHERE status = 'completed' ORDER BY position"
+        )
+        return [
+            {
+                "tournament_id": tid,
+                "name": name,
+                "venue": venue,
+                "dates": {"from": date_from, "to": date_to},
+                "player_count": player_counts.get(tid, 0),
+                "winner": scores[tid][0][0] if tid in scores else None,
+            }
+            for tid, name, venue, date_from, date_to in rows
+        ]
+
+    def load_tournaments(self):
+        return self._load("status = 'in-progress'"), self.completed_summaries()
+
+    def load_tournament(self, tournament_id):
+        (tournament,) = self._load("id = ?", (tournament_id,))
+        return tournament
+
+    def _write_tournament(self, data, status, position):
+        tid = data["tournament_id"]
+        known = set(TOURNAMENT_COLUMNS) | {"tournament_id", "dates", "players", "rounds"}
+        self.connection.execute(
+            "INSERT INTO tournaments (id, status, position, name, venue, date_from, date_to, number_of_rounds, "
+            "current_round, completed, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET status = excluded.status, position = excluded.position, "
+            "name = excluded.name, venue = excluded.venue, date_from = excluded.date_from, "
+            "date_to = excluded.date_to, number_of_rounds = excluded.number_of_rounds, "
+            "current_round = excluded.current_round, completed = excluded.completed, extra = excluded.extra",
+            (tid, status, position, data["name"], data["venue"], data["dates"]["from"], data["dates"]["to"],
+             data["number_of_rounds"], data["current_round"], int(bool(data["completed"])), _extra(data, known)),
+        )
+        for table in ("registrations", "rounds"):
+            self.connection.execute(f"DELETE FROM {table} WHERE tournament_id = ?", (tid,))
+        self.connection.executemany(
+            "INSERT INTO registrations (tournament_id, position, chess_id) VALUES (?, ?, ?)",
+            [(tid, position, chess_id) for position, chess_id in enumerate(data["players"])],
+        )
+        self.connection.executemany(
+            "INSERT INTO rounds (tournament_id, number) VALUES (?, ?)",
+            [(tid, number) for number in range(len(data["rounds"]))],
+        )
+        self.connection.executemany(
+            "INSERT INTO matches (tournament_id, round, board, player1, player2, completed, winner, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (tid, number, board, m["players"][0], m["players"][1], int(bool(m["completed"])), m["winner"],
+                 _extra(m, MATCH_KEYS))
+                for number, rnd in enumerate(data["rounds"])
+                for board, m in enumerate(rnd["matches"] if isinstance(rnd, dict) else rnd)
+            ],
+        )
+
+    def write_tournaments(self, in_progress, completed, changed=None):
+        """Writes the changed tournaments (all of them if changed is None) and the position of the others"""
+        listed = [("in-progress", t) for t in in_progress] + [("completed", t) for t in completed]
+        with self.connection:
+            for position, (status, data) in enumerate(listed):
+                if changed is None or data["tournament_id"] in changed:
+                    self._write_tournament(data, status, position)
+                    self._bump(f"tournament:{data['tournament_id']}")
+                else:
+                    self.connection.execute(
+                        "UPDATE tournaments SET status = ?, position = ? WHERE id = ?",
+                        (status, position, data["tournament_id"]),
+                    )
+            ids = [data["tournament_id"] for _, data in listed]
+            self.connection.execute(
+                f"DELETE FROM tournaments WHERE id NOT IN ({', '.join('?' * len(ids))})", ids
+            )
+            self._bump("tournaments")
+
+    def save_match(self, tournament, round_index, match_index, in_progress, completed):
+        """Updates the match's row only"""
+        data = tournament.rounds[round_index].matches[match_index].serialize()
+        with self.connection:
+            self.connection.execute(
+                "UPDATE matches SET completed = ?, winner = ?, extra = ? "
+                "WHERE tournament_id = ? AND round = ? AND board = ?",
+                (int(bool(data["completed"])), data["winner"], _extra(data, MATCH_KEYS),
+                 tournament.tournament_id, round_index, match_index),
+            )
+            self._bump_tournament(tournament.tournament_id)
+
+    def record_event(self, tournament_id, event):
+        """Applies the change to the affected rows right away: no snapshot is ever needed"""
+        op = event["op"]
+        with self.connection:
+            if op == "result":
+                self.connection.execute(
+                    "UPDATE matches SET completed = 1, winner = ? WHERE tournament_id = ? AND round = ? AND board = ?",
+                    (event["winner"], tournament_id, event["round"], event["board"]),
+                )
+            elif op == "results":
+                self.connection.executemany(
+                    "UPDATE matches SET completed = 1, winner = ? WHERE tournament_id = ? AND round = ? AND board = ?",
+                    [(winner, tournament_id, event["round"], board) for board, winner in event["winners"]],
+                )
+            elif op == "register":
+                # A single player (chess_id) or a bulk registration (chess_ids)
+                (position,) = self.connection.execute(
+                    "SELECT COUNT(*) FROM registrations WHERE tournament_id = ?", (tournament_id,)
+                ).fetchone()
+                self.connection.executemany(
+                    "INSERT INTO registrations (tournament_id, position, chess_id) VALUES (?, ?, ?)",
+                    [
+                        (tournament_id, position + offset, chess_id)
+                        for offset, chess_id in enumerate(event.get("chess_ids", [event.get("chess_id")]))
+                    ],
+                )
+            elif op == "round":
+                number = event["round"] - 1
+                self.connection.execute(
+                    "INSERT INTO rounds (tournament_id, number) VALUES (?, ?)", (tournament_id, number)
+                )
+                # A pair without second player is a bye: won by its player
+                self.connection.executemany(
+                    "INSERT INTO matches (tournament_id, round, board, player1, player2, completed, winner) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (tournament_id, number, board, p1, p2, int(p2 is None), p1 if p2 is None else None)
+                        for board, (p1, p2) in enumerate(event["pairs"])
+                    ],
+                )
+                self.connection.execute(
+                    "UPDATE tournaments SET current_round = ? WHERE id = ?", (event["round"], tournament_id)
+                )
+            elif op == "finished":
+                self.connection.execute("UPDATE tournaments SET completed = 1 WHERE id = ?", (tournament_id,))
+            else:
+                raise ValueError(f"Unknown journal event: {op}")
+            self._bump_tournament(tournament_id)
+        return False
+
+    def complete_tournament(self, tournament, in_progress, completed):
+        """Only updates the status (and position) of the tournaments"""
+        self.save_tournaments(in_progress, completed, changed=[])
+
+    def tournaments_signature(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'tournaments'").fetchone()
+        return row[0] if row else 0
+
+    def tournament_signatures(self):
+        return dict(self.connection.execute(
+            "SELECT id, COALESCE(value, 0) FROM tournaments LEFT JOIN meta ON meta.key = 'tournament:' || id "
+            "WHERE status = 'in-progress' ORDER BY position"
+        ))
+
+    # === RATINGS ===
+    def load_ratings(self):
+        players = self.connection.execute("SELECT chess_id, rating, games FROM ratings ORDER BY rowid")
+        return {
+            "players": {chess_id: [rating, games] for chess_id, rating, games in players},
+            "tournaments": [row[0] for row in self.connection.execute("SELECT tournament_id FROM rated_tournaments")],
+        }
+
+    def write_ratings(self, data, changed=None):
+        """Upserts the rows of the changed players only"""
+        players = data["players"]
+        with self.connection:
+            if changed is None:
+                self.connection.execute("DELETE FROM ratings")
+                self.connection.execute("DELETE FROM rated_tournaments")
+                changed = players
+            self.connection.executemany(
+                "INSERT INTO ratings (chess_id, rating, games) VALUES (?, ?, ?) "
+                "ON CONFLICT (chess_id) DO UPDATE SET rating = excluded.rating, games = excluded.games",
+                [(chess_id, *players[chess_id]) for chess_id in changed],
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO rated_tournaments (tournament_id) VALUES (?)",
+                [(tid,) for tid in data["tournaments"]],
+            )
@@ -0,0 +1,41 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from storage.journal import Journal
+
+
+class TornTailTest(unittest.TestCase):
+    """A record torn by a crash must not hide the events appended after it"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = Journal(self.folder.name).path("t1")
+
+    def crash(self):
+        """One complete record, then a torn one (as left by a crash during a write)"""
+        journal = Journal(self.folder.name)
+        journal.append("t1", {"op": "register", "chess_id": "AB12345"})
+        with open(self.path, "a") as fp:
+            fp.write('{"op":"result","round":0,"bo')
+
+    def test_append_after_torn_tail(self):
+        self.crash()
+        # A new process appends without reading the journal first
+        journal = Journal(self.folder.name)
+        journal.append("t1", {"op": "register", "chess_id": "CD12345"})
+        journal.append("t1", {"op": "register", "chess_id": "EF12345"})
+
+        events = Journal(self.folder.name).read("t1")
+        self.assertEqual([event["chess_id"] for event in events], ["AB12345", "CD12345", "EF12345"])
+
+    def test_read_truncates_torn_tail(self):
+        self.crash()
+        events = Journal(self.folder.name).read("t1")
+        self.assertEqual(len(events), 1)
+        self.assertTrue(Path(self.path).read_bytes().endswith(b"}\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from models.matching import max_weight_matching
+
+
+def brute_force(count, weights, maxcardinality):
+    """(cardinality or 0, weight) of the best matching, trying every matching of the vertices"""
+    def best(free):
+        if len(free) < 2:
+            return 0, 0
+        first, rest = free[0], free[1:]
+        candidates = [best(rest)]
+        for other in rest:
+            if (first, other) in weights:
+                size, weight = best([v for v in rest if v != other])
+                candidates.append((size + 1, weight + weights[first, other]))
+        if maxcardinality:
+            return max(candidates)
+        return max(candidates, key=lambda candidate: candidate[1])
+
+    size, weight = best(list(range(count)))
+    return (size if maxcardinality else 0), weight
+
+
+class MaxWeightMatchingTest(unittest.TestCase):
+    """The blossom algorithm reaches the optimum found by brute force"""
+
+    def check(self, rng, maxcardinality):
+        count = rng.randint(2, 8)
+        weights = {
+            (i, j): rng.randint(1, 20)
+            for i in range(count) for j in range(i + 1, count) if rng.random() < 0.6
+        }
+        if not weights:
+            return
+        edges = [(i, j, weight) for (i, j), weight in weights.items()]
+        mate = max_weight_matching(edges, maxcardinality=maxcardinality)
+
+        pairs = [(i, j) for i, j in enumerate(mate) if i < j]
+        self.assertTrue(all(mate[j] == i for i, j in pairs))
+        self.assertTrue(all(pair in weights for pair in pairs))
+        result = (len(pairs) if maxcardinality else 0), sum(weights[pair] for pair in pairs)
+        self.assertEqual(result, brute_force(count, weights, maxcardinality), edges)
+
+    def test_max_weight(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            self.check(rng, maxcardinality=False)
+
+    def test_max_cardinality(self):
+        rng = random.Random(2)
+        for _ in range(300):
+            self.check(rng, maxcardinality=True)
+
+    def test_no_edges(self):
+        self.assertEqual(max_weight_matching([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
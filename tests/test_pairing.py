@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from models import Player, Ratings, SwissPairer
+from models.tournaments import Tournaments
+
+
+def make_players(count):
+    return [
+        Player(name=f"Player {i:03d}", email=f"p{i}@example.com", chess_id=f"AB{i:05d}", birthday="01-01-1990")
+        for i in range(count)
+    ]
+
+
+def play(players, rounds, rng, ratings=None):
+    """Plays a Swiss tournament with random results"""
+    tournament = Tournaments(
+        "Test", "Hall", {"from": "01-01-2030", "to": "02-01-2030"},
+        number_of_rounds=rounds + 1, players=players, pairer=SwissPairer(),
+    )
+    tournament.ratings = ratings
+    for _ in range(rounds):
+        for match in tournament.generate_next_round().matches:
+            if not match.completed:
+                match.set_result(rng.choice((0, 1, 2)))
+    return tournament
+
+
+class SwissPairerTest(unittest.TestCase):
+    """Every player is paired once per round, without rematches and with at most one bye"""
+
+    def check(self, tournament):
+        met = set()
+        byes = []
+        for rnd in tournament.rounds:
+            paired = []
+            round_byes = [match.player1.chess_id for match in rnd.matches if match.is_bye]
+            self.assertLessEqual(len(round_byes), 1)
+            byes.extend(round_byes)
+            for match in rnd.matches:
+                paired.append(match.player1.chess_id)
+                if match.is_bye:
+                    continue
+                paired.append(match.player2.chess_id)
+                pair = frozenset((match.player1.chess_id, match.player2.chess_id))
+                self.assertNotIn(pair, met, "rematch")
+                met.add(pair)
+            self.assertEqual(sorted(paired), sorted(p.chess_id for p in tournament.players))
+        # Fewer rounds than players: nobody gets a second bye
+        self.assertEqual(len(byes), len(set(byes)))
+
+    def test_even_field(self):
+        for seed in range(5):
+            self.check(play(make_players(16), 7, random.Random(seed)))
+
+    def test_odd_field(self):
+        for seed in range(5):
+            self.check(play(make_players(15), 7, random.Random(seed)))
+
+    def test_rated_field(self):
+        rng = random.Random(3)
+        players = make_players(21)
+        ratings = Ratings({"players": {p.chess_id: [rng.gauss(1600, 200), 0] for p in players}})
+        self.check(play(players, 7, rng, ratings))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from models import Ratings
+
+
+def tournament(tournament_id, end, games):
+    """A serialized tournament of a single round: games are (white, black, winner or None)"""
+    players = sorted({chess_id for white, black, _ in games for chess_id in (white, black)})
+    return {
+        "tournament_id": tournament_id,
+        "dates": {"from": end, "to": end},
+        "players": players,
+        "rounds": [{"matches": [
+            {"players": [white, black], "completed": True, "winner": winner} for white, black, winner in games
+        ]}],
+    }
+
+
+class EloTest(unittest.TestCase):
+    """The rating points won by one player of a game are lost by the other (same K-factor)"""
+
+    def test_single_game(self):
+        for winner in ("AB00001", "AB00002", None):
+            ratings = Ratings({"players": {"AB00001": [1700.0, 50], "AB00002": [1500.0, 50]}})
+            ratings.apply_tournaments([tournament("t1", "01-01-2030", [("AB00001", "AB00002", winner)])])
+            delta = ratings.rating("AB00001") - 1700, ratings.rating("AB00002") - 1500
+            self.assertAlmostEqual(sum(delta), 0)
+            self.assertNotEqual(delta[0], 0)
+
+    def test_batched_games(self):
+        """A batch (many games, some players in several of them) conserves the total rating"""
+        rng = np.random.default_rng(5)
+        chess_ids = [f"AB{i:05d}" for i in range(40)]
+        ratings = Ratings({"players": {chess_id: [float(rng.normal(1600, 200)), 50] for chess_id in chess_ids}})
+        total = sum(ratings.rating(chess_id) for chess_id in chess_ids)
+
+        games = []
+        for _ in range(3):
+            order = rng.permutation(len(chess_ids))
+            for i in range(0, len(order), 2):
+                winner = rng.choice([chess_ids[order[i]], chess_ids[order[i + 1]], None])
+                games.append((chess_ids[order[i]], chess_ids[order[i + 1]], winner))
+        ratings.apply_tournaments([tournament("t1", "01-01-2030", games)])
+
+        self.assertAlmostEqual(sum(ratings.rating(chess_id) for chess_id in chess_ids), total, places=6)
+        self.assertEqual(sum(ratings.games(chess_id) for chess_id in chess_ids), 50 * 40 + 2 * len(games))
+
+    def test_tournament_applied_once(self):
+        ratings = Ratings()
+        data = tournament("t1", "01-01-2030", [("AB00001", "AB00002", "AB00001")])
+        ratings.apply_tournaments([data])
+        rating = ratings.rating("AB00001")
+        ratings.apply_tournaments([data])
+        self.assertEqual(ratings.rating("AB00001"), rating)
+        self.assertGreater(rating, Ratings.DEFAULT)
+
+
+if __name__ == "__main__":
+    unittest.main()
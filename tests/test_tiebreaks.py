@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from tests.test_pairing import make_players, play
+
+
+def naive_tiebreaks(tournament):
+    """chess_id -> (score, Buchholz, Sonneborn-Berger), scanning every match (byes only count in the scores)"""
+    games = {player.chess_id: [] for player in tournament.players}
+    scores = dict.fromkeys(games, 0.0)
+    for rnd in tournament.rounds:
+        for match in rnd.matches:
+            if match.is_bye:
+                scores[match.player1.chess_id] += 1
+                continue
+            if not match.completed:
+                continue
+            white, black = match.player1.chess_id, match.player2.chess_id
+            points = 0.5 if match.winner is None else float(match.winner.chess_id == white)
+            games[white].append((black, points))
+            games[black].append((white, 1 - points))
+            scores[white] += points
+            scores[black] += 1 - points
+    return {
+        chess_id: (
+            scores[chess_id],
+            sum(scores[opponent] for opponent, _ in played),
+            sum(points * scores[opponent] for opponent, points in played),
+        )
+        for chess_id, played in games.items()
+    }
+
+
+class TieBreaksTest(unittest.TestCase):
+    """Buchholz and Sonneborn-Berger match the naive computation"""
+
+    def check(self, tournament):
+        expected = naive_tiebreaks(tournament)
+        for player in tournament.players:
+            values = tournament.tiebreaks.values(player)
+            self.assertEqual(
+                (values["score"], values["buchholz"], values["sonneborn_berger"]), expected[player.chess_id]
+            )
+
+    def test_built_from_the_rounds(self):
+        for count in (8, 13):
+            self.check(play(make_players(count), 5, random.Random(count)))
+
+    def test_updated_as_the_results_come(self):
+        rng = random.Random(4)
+        tournament = play(make_players(11), 1, rng)
+        tournament.number_of_rounds = 6
+        # Built now: the next rounds and results are applied incrementally
+        tournament.tiebreaks.compute()
+        for _ in range(4):
+            matches = [match for match in tournament.generate_next_round().matches if not match.completed]
+            for match in matches[:-1]:
+                match.set_result(rng.choice((0, 1, 2)))
+            self.check(tournament)
+            matches[-1].set_result(rng.choice((0, 1, 2)))
+        self.check(tournament)
+
+
+if __name__ == "__main__":
+    unittest.main()